@@ -4,16 +4,25 @@
     "author": " Javier Antó Garcia, JAG",
     "license": "AGPL-3",
     "website": "https://github.com/javierobcn/jag_library",
-    "version": "18.0.0.0.1",
+    "version": "18.0.0.0.2",
     "category": "Services/Library",
     "depends": ["base", "web", "product", "stock"],
     "data": [
         "security/library_security.xml",
         "security/ir.model.access.csv",
+        "data/ir_cron.xml",
         "views/res_partner.xml",
         "views/book_genre_views.xml",
         "views/product_template.xml",
         "views/jag_library_menu.xml",
+        "wizard/library_book_import_views.xml",
+        "wizard/library_isbn_scan_views.xml",
+        "data/ir_actions_server.xml",
+        "wizard/library_book_dedup_views.xml",
+        "views/library_dashboard_views.xml",
+        "views/library_book_export_views.xml",
+        "views/library_circulation_views.xml",
+        "wizard/library_book_sort_views.xml",
     ],
     "application": True,
 }
@@ -0,0 +1,119 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+import base64
+import hashlib
+import json
+
+from werkzeug.exceptions import BadRequest
+
+from odoo import api, http
+from odoo.http import request
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+EXPORT_BATCH_SIZE = 1000
+
+
+class LibraryCatalogueController(http.Controller):
+    """Read-only JSON API over the book catalogue.
+
+    ``/library/api/books`` returns pages of books with an opaque ``next``
+    cursor to pass back for the following page, and honours
+    ``If-None-Match``. ``/library/api/books.ndjson`` streams the whole
+    catalogue, one JSON document per line.
+
+    The catalogue is public: the books are read as superuser, so record
+    rules, including the multi-company ones, do not apply and the books
+    and stock of all the companies are listed. Only the fields of
+    ``_get_library_catalogue_data`` are exposed.
+    """
+
+    @staticmethod
+    def _encode_cursor(key):
+        return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor):
+        try:
+            sequence, book_id = json.loads(base64.urlsafe_b64decode(cursor))
+            return int(sequence), int(book_id)
+        except (ValueError, TypeError) as error:
+            raise BadRequest("Invalid cursor") from error
+
+    @staticmethod
+    def _get_domain(genre_id):
+        if not genre_id:
+            return []
+        try:
+            return [("genre_ids", "child_of", int(genre_id))]
+        except ValueError as error:
+            raise BadRequest("Invalid genre") from error
+
+    @http.route(
+        "/library/api/books",
+        type="http",
+        auth="public",
+        methods=["GET"],
+        readonly=True,
+    )
+    def books(self, cursor=None, limit=DEFAULT_PAGE_SIZE, genre_id=None, **kwargs):
+        try:
+            limit = min(max(int(limit), 1), MAX_PAGE_SIZE)
+        except ValueError as error:
+            raise BadRequest("Invalid limit") from error
+        after = self._decode_cursor(cursor) if cursor else None
+        Book = request.env["product.template"].sudo()
+        books, next_key = Book._get_library_catalogue_page(
+            after=after, limit=limit, domain=self._get_domain(genre_id)
+        )
+        # The page is identified by its books and the version of their data,
+        # so that a matching If-None-Match skips building the page
+        version = books._get_library_catalogue_version()
+        etag = hashlib.sha1(f"{version}{next_key}".encode()).hexdigest()
+        headers = [("ETag", f'"{etag}"'), ("Cache-Control", "no-cache")]
+        if request.httprequest.if_none_match.contains(etag):
+            return request.make_response("", headers=headers, status=304)
+        body = json.dumps(
+            {
+                "books": books._get_library_catalogue_data(),
+                "next": next_key and self._encode_cursor(next_key),
+            }
+        )
+        return request.make_response(
+            body, headers=headers + [("Content-Type", "application/json")]
+        )
+
+    @http.route(
+        "/library/api/books.ndjson",
+        type="http",
+        auth="public",
+        methods=["GET"],
+        readonly=True,
+    )
+    def books_ndjson(self, genre_id=None, **kwargs):
+        domain = self._get_domain(genre_id)
+        registry = request.env.registry
+        context = dict(request.env.context)
+        uid = request.env.uid
+
+        def generate():
+            # The response is sent after the request cursor is closed, so
+            # the export reads through a cursor of its own
+            with registry.cursor(readonly=True) as cr:
+                env = api.Environment(cr, uid, context, su=True)
+                Book = env["product.template"]
+                after = None
+                while True:
+                    books, after = Book._get_library_catalogue_page(
+                        after=after, limit=EXPORT_BATCH_SIZE, domain=domain
+                    )
+                    for data in books._get_library_catalogue_data():
+                        yield json.dumps(data) + "\n"
+                    env.invalidate_all()
+                    if not after:
+                        break
+
+        return request.make_response(
+            generate(), headers=[("Content-Type", "application/x-ndjson")]
+        )
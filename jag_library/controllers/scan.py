@@ -0,0 +1,14 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo import http
+from odoo.http import request
+
+
+class LibraryScanController(http.Controller):
+    @http.route("/library/api/scan", type="json", auth="user", methods=["POST"])
+    def scan(self, isbns, location_id, mode="add", complete=False):
+        """Apply a burst of ISBN scans, see ``library_scan_isbns``."""
+        return request.env["product.template"].library_scan_isbns(
+            isbns, location_id, mode=mode, complete=complete
+        )
@@ -0,0 +1,16 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+
+def migrate(cr, version):
+    # The resized back covers are not stored per book anymore
+    cr.execute("""
+        DELETE FROM ir_attachment
+         WHERE res_model IN ('product.template', 'product.product')
+           AND res_field IN (
+                'image_back_cover_1024',
+                'image_back_cover_512',
+                'image_back_cover_256',
+                'image_back_cover_128'
+           )
+        """)
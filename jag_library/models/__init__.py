@@ -1,2 +1,17 @@
+from . import library_autocomplete
+# Before product_template: its table is the relation of the shelf_ids field
+from . import library_book_location
 from . import product_template
 from . import res_partner
+from . import library_book_importer
+from . import library_image_derivative
+from . import library_profiler
+from . import library_book_deduplicator
+from . import library_dashboard_stat
+from . import library_book_export
+from . import library_circulation
+from . import library_book_locator
+from . import stock_location
+from . import stock_quant
+from . import library_book_enricher
+from . import library_book_similarity
@@ -0,0 +1,185 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo import api, models
+from odoo.osv import expression
+from odoo.tools import SQL, create_index
+
+from ..tools.lru import LRUCache
+
+CACHE_SIZE = 5000
+CACHE_TTL = 30
+# Extra candidates read, for the ones filtered out by the widget domain
+# (e.g. the tags already selected) and the record rules
+CANDIDATE_MARGIN = 20
+# Trigrams do not help below three characters
+SUBSTRING_MIN_LENGTH = 3
+SEARCH_FUNCTION = "jag_library_unaccent"
+
+# {kind: (model, column, flag restricting the partial indexes)}
+AUTOCOMPLETE_KINDS = {
+    "author": ("res.partner", "name", "is_author"),
+    "publisher": ("res.partner", "name", "is_publisher"),
+    "genre": ("product.book.genre", "complete_name", None),
+}
+
+# {kind: {(database name, term, limit): [candidate ids]}}
+_caches = {kind: LRUCache(CACHE_SIZE, CACHE_TTL) for kind in AUTOCOMPLETE_KINDS}
+
+
+class LibraryAutocomplete(models.AbstractModel):
+    """Fast suggestions for the author, publisher and genre fields of books.
+
+    The fields of the book form pass a ``library_autocomplete`` context
+    key, which makes ``name_search`` read the suggestions from partial
+    expression indexes on the accent-free, lower case names: a prefix
+    index, read in order, and a trigram index for the matches inside the
+    names. Results are cached per worker for ``CACHE_TTL`` seconds, and
+    dropped when the partners or genres change.
+    """
+
+    _name = "library.autocomplete"
+    _description = "Library Autocomplete"
+
+    @api.model
+    def _init_indexes(self, kinds):
+        """Create the search function and the indexes of the given kinds.
+
+        The function wraps ``unaccent`` when the extension is installed,
+        and is declared immutable so that it can be indexed.
+        """
+        cr = self.env.cr
+        if not self.env.execute_query(
+            SQL("SELECT 1 FROM pg_proc WHERE proname = %s", SEARCH_FUNCTION)
+        ):
+            body = (
+                "SELECT unaccent('unaccent'::regdictionary, $1)"
+                if self.env.registry.has_unaccent
+                else "SELECT $1"
+            )
+            cr.execute(
+                SQL(
+                    """
+                    CREATE FUNCTION %s(text) RETURNS text
+                    LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS %s
+                    """,
+                    SQL.identifier(SEARCH_FUNCTION),
+                    body,
+                )
+            )
+        for kind in kinds:
+            model_name, column, flag = AUTOCOMPLETE_KINDS[kind]
+            table = self.env[model_name]._table
+            where = f"{flag} AND active" if flag else ""
+            expression_sql = f"{SEARCH_FUNCTION}(lower({column}))"
+            create_index(
+                cr,
+                f"{table}_library_{kind}_prefix_index",
+                table,
+                [f'({expression_sql}) COLLATE "C"'],
+                where=where,
+            )
+            if self.env.registry.has_trigram:
+                create_index(
+                    cr,
+                    f"{table}_library_{kind}_trigram_index",
+                    table,
+                    [f"({expression_sql}) gin_trgm_ops"],
+                    method="gin",
+                    where=where,
+                )
+
+    @api.model
+    def _name_search_ids(self, kind, name, domain, limit):
+        """Return the ids of the suggestions for ``name``, best first.
+
+        The cached candidates are filtered with ``domain`` and the record
+        rules in one query.
+        """
+        model_name = AUTOCOMPLETE_KINDS[kind][0]
+        term = name.strip().lower()
+        key = (self.env.cr.dbname, term, limit)
+        found, __ = _caches[kind].get_many([key])
+        if key in found:
+            candidates = found[key]
+        else:
+            candidates = self._read_candidates(kind, term, limit + CANDIDATE_MARGIN)
+            _caches[kind].set_many({key: candidates})
+        if not candidates:
+            return []
+        allowed = set(
+            self.env[model_name]._search(
+                expression.AND([domain or [], [("id", "in", candidates)]])
+            )
+        )
+        return [record_id for record_id in candidates if record_id in allowed][:limit]
+
+    @api.model
+    def _read_candidates(self, kind, term, limit):
+        """Read the names starting with ``term``, then those containing it."""
+        model_name, column, flag = AUTOCOMPLETE_KINDS[kind]
+        Model = self.env[model_name]
+        Model.flush_model([column] + ([flag, "active"] if flag else []))
+        table = SQL.identifier(Model._table)
+        where = SQL("%s AND active", SQL.identifier(flag)) if flag else SQL("TRUE")
+        normalized = SQL(
+            "%s(lower(%s))", SQL.identifier(SEARCH_FUNCTION), SQL.identifier(column)
+        )
+        escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        # The wildcards are parameters: the term is normalized in SQL first
+        prefix = SQL(
+            "%s(lower(%s)) || %s", SQL.identifier(SEARCH_FUNCTION), escaped, "%"
+        )
+        rows = self.env.execute_query(
+            SQL(
+                """
+                SELECT id FROM %(table)s
+                 WHERE %(where)s AND %(normalized)s COLLATE "C" LIKE %(prefix)s
+              ORDER BY %(normalized)s COLLATE "C", id
+                 LIMIT %(limit)s
+                """,
+                table=table,
+                where=where,
+                normalized=normalized,
+                prefix=prefix,
+                limit=limit,
+            )
+        )
+        ids = [record_id for (record_id,) in rows]
+        if (
+            len(ids) < limit
+            and len(term) >= SUBSTRING_MIN_LENGTH
+            and self.env.registry.has_trigram
+        ):
+            rows = self.env.execute_query(
+                SQL(
+                    """
+                    SELECT id FROM %(table)s
+                     WHERE %(where)s
+                       AND %(normalized)s
+                           LIKE %(wildcard)s || %(function)s(lower(%(term)s))
+                                || %(wildcard)s
+                       AND NOT %(normalized)s COLLATE "C" LIKE %(prefix)s
+                  ORDER BY %(normalized)s COLLATE "C", id
+                     LIMIT %(limit)s
+                    """,
+                    table=table,
+                    where=where,
+                    normalized=normalized,
+                    function=SQL.identifier(SEARCH_FUNCTION),
+                    term=escaped,
+                    wildcard="%",
+                    prefix=prefix,
+                    limit=limit - len(ids),
+                )
+            )
+            ids += [record_id for (record_id,) in rows]
+        return ids
+
+    @api.model
+    def _invalidate(self, kinds):
+        """Drop the cached suggestions, now and once the transaction commits."""
+        caches = [_caches[kind] for kind in kinds]
+        for cache in caches:
+            cache.clear()
+        self.env.cr.postcommit.add(lambda: [cache.clear() for cache in caches])
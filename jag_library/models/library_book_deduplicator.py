@@ -0,0 +1,261 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+import logging
+
+from odoo import _, api, models
+from odoo.exceptions import AccessError
+from odoo.tools import SQL, split_every
+
+from ..tools import titles
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = 0.75
+# Larger blocks are too generic (e.g. "Poems") to tell anything about
+# duplicates, and comparing all their pairs would be quadratic.
+MAX_BLOCK_SIZE = 50
+AUTHOR_BONUS = 0.15
+AUTHOR_PENALTY = 0.2
+
+
+class LibraryBookDeduplicator(models.AbstractModel):
+    """Find and merge duplicate books.
+
+    Only books sharing a block are compared: the same title key, or the
+    same author and the same first title word. The candidate pairs are
+    produced by SQL over the indexed ``library_title_key`` column and
+    scored in batches, so the catalogue is never compared pair by pair.
+    """
+
+    _name = "library.book.deduplicator"
+    _description = "Library Book Deduplicator"
+
+    @api.model
+    def _get_candidate_pairs(self):
+        """Return the ``(book id, book id)`` pairs sharing a block."""
+        return self.env.execute_query(
+            SQL(
+                """
+                WITH book AS (
+                    SELECT id, library_title_key AS title_key,
+                           split_part(library_title_key, ' ', 1) AS first_word
+                      FROM product_template
+                     WHERE is_book AND active AND library_title_key != ''
+                ), title_block AS (
+                    SELECT id, title_key,
+                           count(*) OVER (PARTITION BY title_key) AS size
+                      FROM book
+                ), author_block AS (
+                    SELECT book.id, rel.partner_id, book.first_word,
+                           count(*) OVER (
+                               PARTITION BY rel.partner_id, book.first_word
+                           ) AS size
+                      FROM book
+                      JOIN res_partner_product_template_rel rel
+                        ON rel.book_id = book.id
+                )
+                SELECT a.id, b.id
+                  FROM title_block a
+                  JOIN title_block b ON b.title_key = a.title_key AND b.id > a.id
+                 WHERE a.size BETWEEN 2 AND %(max_size)s
+                 UNION
+                SELECT a.id, b.id
+                  FROM author_block a
+                  JOIN author_block b
+                    ON b.partner_id = a.partner_id
+                   AND b.first_word = a.first_word
+                   AND b.id > a.id
+                 WHERE a.size BETWEEN 2 AND %(max_size)s
+                """,
+                max_size=MAX_BLOCK_SIZE,
+            )
+        )
+
+    @api.model
+    def _score(self, book1, book2):
+        """Return the similarity of two books between 0 and 1, or ``None``
+        when they cannot be the same book (different ISBNs)."""
+        if (
+            book1.isbn_normalized
+            and book2.isbn_normalized
+            and book1.isbn_normalized != book2.isbn_normalized
+        ):
+            return None
+        score = titles.key_similarity(book1.library_title_key, book2.library_title_key)
+        if book1.author_ids & book2.author_ids:
+            score += AUTHOR_BONUS
+        elif book1.author_ids and book2.author_ids:
+            score -= AUTHOR_PENALTY
+        return min(score, 1.0)
+
+    @api.model
+    def _find_duplicates(self, threshold=DEFAULT_THRESHOLD, limit=None):
+        """Return the pairs of books that are probably the same book.
+
+        The book to keep of each pair is the one with an ISBN, or else the
+        oldest one.
+
+        :return: list of dicts with the ``book_id`` to keep, the
+            ``duplicate_id`` to merge into it and the ``score``, the most
+            similar first
+        """
+        Book = self.env["product.template"].with_context(active_test=False)
+        suggestions = []
+        for pairs in split_every(1000, self._get_candidate_pairs()):
+            books = Book.browse({book_id for pair in pairs for book_id in pair})
+            books.fetch(["library_title_key", "isbn_normalized", "author_ids"])
+            for book1, book2 in (Book.browse(pair) for pair in pairs):
+                score = self._score(book1, book2)
+                if score is None or score < threshold:
+                    continue
+                if book2.isbn_normalized and not book1.isbn_normalized:
+                    book1, book2 = book2, book1
+                suggestions.append(
+                    {
+                        "book_id": book1.id,
+                        "duplicate_id": book2.id,
+                        "score": round(score, 3),
+                    }
+                )
+            self.env.invalidate_all()
+        suggestions.sort(key=lambda suggestion: -suggestion["score"])
+        _logger.info("Found %s probable duplicate books", len(suggestions))
+        return suggestions[:limit] if limit else suggestions
+
+    @api.model
+    def _merge(self, pairs):
+        """Merge each duplicate into the book kept, in bulk.
+
+        Authors and genres are added to the book kept, the free stock of
+        the duplicate is moved to it, its ISBN is taken over if the kept
+        book has none, and the duplicate is archived. A book merged into a
+        duplicate merged itself ends up in the last book of the chain.
+
+        :param pairs: iterable of ``(book id to keep, duplicate id)``
+        :return: the number of books merged
+        """
+        self._check_manager()
+        target_of = {}
+        for book_id, duplicate_id in pairs:
+            if book_id != duplicate_id:
+                target_of.setdefault(duplicate_id, book_id)
+        for duplicate_id in list(target_of):
+            seen = {duplicate_id}
+            target_id = target_of[duplicate_id]
+            while target_id in target_of and target_id not in seen:
+                seen.add(target_id)
+                target_id = target_of[target_id]
+            if target_id in seen:
+                # Cycle: leave the books of the cycle untouched
+                del target_of[duplicate_id]
+            else:
+                target_of[duplicate_id] = target_id
+        if not target_of:
+            return 0
+        Book = self.env["product.template"].with_context(active_test=False)
+        duplicates = Book.browse(list(target_of))
+        targets = Book.browse(set(target_of.values()))
+        self.env.flush_all()
+        values = SQL(", ").join(
+            SQL("(%s, %s)", duplicate_id, target_id)
+            for duplicate_id, target_id in target_of.items()
+        )
+        self.env.execute_query(
+            SQL(
+                """
+                INSERT INTO res_partner_product_template_rel (book_id, partner_id)
+                SELECT merge.target_id, rel.partner_id
+                  FROM (VALUES %s) AS merge(duplicate_id, target_id)
+                  JOIN res_partner_product_template_rel rel
+                    ON rel.book_id = merge.duplicate_id
+                    ON CONFLICT DO NOTHING
+                """,
+                values,
+            )
+        )
+        self.env.execute_query(
+            SQL(
+                """
+                INSERT INTO product_book_genre_product_template_rel
+                       (product_template_id, product_book_genre_id)
+                SELECT merge.target_id, rel.product_book_genre_id
+                  FROM (VALUES %s) AS merge(duplicate_id, target_id)
+                  JOIN product_book_genre_product_template_rel rel
+                    ON rel.product_template_id = merge.duplicate_id
+                    ON CONFLICT DO NOTHING
+                """,
+                values,
+            )
+        )
+        self.env.invalidate_all()
+        self._move_free_stock(target_of)
+
+        isbns = {}
+        for duplicate in duplicates.filtered("isbn"):
+            target = Book.browse(target_of[duplicate.id])
+            if not target.isbn and target not in isbns:
+                isbns[target] = duplicate
+        if isbns:
+            donors = Book.union(*isbns.values())
+            isbn_of = {donor: donor.isbn for donor in donors}
+            # Free the unique ISBNs before giving them to the books kept
+            donors.write({"isbn": False})
+            donors.flush_recordset()
+            for target, donor in isbns.items():
+                target.isbn = isbn_of[donor]
+        duplicates.write({"active": False})
+        targets._update_library_search_vector()
+        targets.genre_ids._update_book_stats()
+        (targets.author_ids | targets.publisher_id)._update_library_stats()
+        _logger.info("Merged %s duplicate books", len(target_of))
+        return len(target_of)
+
+    @api.model
+    def _move_free_stock(self, target_of):
+        """Move the free stock of the duplicates to the books kept.
+
+        The quantities go through the stock API, quant by quant. Reserved
+        quants stay with the duplicate, as their moves refer to it, and so
+        do the quants of a lot, which belongs to the product of the
+        duplicate. Stock only goes to books kept that are storable.
+
+        :param target_of: dict mapping duplicate ids to the ids of the
+            books kept
+        """
+        Quant = self.env["stock.quant"].sudo()
+        Book = self.env["product.template"].with_context(active_test=False)
+        variant_of = {
+            book.id: book.product_variant_id
+            for book in Book.browse(set(target_of.values()))
+            if book.is_storable
+        }
+        quants = Quant.search(
+            [
+                ("product_id.product_tmpl_id", "in", list(target_of)),
+                ("lot_id", "=", False),
+                ("reserved_quantity", "=", 0),
+                ("quantity", ">", 0),
+            ]
+        )
+        for quant in quants:
+            target = variant_of.get(target_of[quant.product_id.product_tmpl_id.id])
+            if not target:
+                continue
+            quantity = quant.quantity
+            location = quant.location_id
+            keys = {"package_id": quant.package_id, "owner_id": quant.owner_id}
+            Quant._update_available_quantity(
+                target, location, quantity, in_date=quant.in_date, **keys
+            )
+            Quant._update_available_quantity(
+                quant.product_id, location, -quantity, **keys
+            )
+        Quant._unlink_zero_quants()
+        self.env["library.book.location"]._flush_pending()
+
+    @api.model
+    def _check_manager(self):
+        if not self.env.user.has_group("jag_library.library_group_manager"):
+            raise AccessError(_("Only library managers can merge books."))
+        self.env["product.template"].check_access("write")
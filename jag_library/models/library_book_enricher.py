@@ -0,0 +1,263 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+import logging
+import os
+import time
+
+from odoo import _, api, fields, models
+from odoo.exceptions import AccessError, UserError
+
+from ..tools import bibliographic_index
+
+_logger = logging.getLogger(__name__)
+
+INDEX_PARAM = "jag_library.bibliographic_index"
+ENRICH_BATCH_SIZE = 1000
+ENRICHED_FIELDS = [
+    "publisher_id",
+    "author_ids",
+    "publication_date",
+    "number_of_pages",
+    "language",
+    "synopsis",
+]
+
+
+class LibraryBookEnricher(models.AbstractModel):
+    """Fill in the missing metadata of the books from a bibliographic index.
+
+    The books are matched by ISBN against an on-disk index built from a
+    bibliographic dump (see ``tools/bibliographic_index.py``). They are
+    read in batches with one index lookup per batch; authors, publishers
+    and languages are resolved once per batch with the importer, and the
+    search documents and partner statistics are updated once per batch.
+    """
+
+    _name = "library.book.enricher"
+    _description = "Library Book Enricher"
+
+    @api.model
+    def _build_index(self, source_path, file_format):
+        """Index a bibliographic dump stored on the server.
+
+        Private: the source path is not checked, so it must never come from
+        a client. The index is written at the path set in the
+        ``jag_library.bibliographic_index`` system parameter.
+
+        :param file_format: ``openlibrary``, ``csv``, ``marc`` or ``onix``
+        :return: the number of ISBNs indexed
+        """
+        self._check_manager()
+        index_path = self._get_index_path()
+        count = bibliographic_index.build_from_file(
+            index_path, source_path, file_format
+        )
+        _logger.info("Indexed %s ISBNs from %s in %s", count, source_path, index_path)
+        return count
+
+    @api.model
+    def _enrich(self, domain=None, overwrite=False, batch_size=None):
+        """Fill in the metadata of the books found in the index.
+
+        The index is read from the path set in the
+        ``jag_library.bibliographic_index`` system parameter. Each batch is
+        committed when running from the scheduler, so that a long
+        enrichment can be interrupted and resumed.
+
+        :param domain: optional domain restricting the books
+        :param overwrite: replace the values already set instead of only
+            filling in the empty fields
+        :return: dict with the ``processed``, ``found``, ``updated`` and
+            ``failed`` counts and the ``duration`` in seconds
+        """
+        self._check_manager()
+        index_path = self._get_index_path()
+        if not os.path.isfile(index_path):
+            raise UserError(_("The bibliographic index %s does not exist.", index_path))
+        batch_size = batch_size or ENRICH_BATCH_SIZE
+        Book = self.env["product.template"].with_context(
+            active_test=False, library_defer_book_updates=True
+        )
+        domain = [("is_book", "=", True), ("isbn_normalized", "!=", False)] + (
+            domain or []
+        )
+        if not overwrite:
+            domain += ["|"] * (len(ENRICHED_FIELDS) - 1) + [
+                (field_name, "=", False) for field_name in ENRICHED_FIELDS
+            ]
+        stats = {
+            "processed": 0,
+            "found": 0,
+            "updated": 0,
+            "failed": 0,
+            "duration": 0.0,
+        }
+        start = time.monotonic()
+        last_id = 0
+        with bibliographic_index.BibliographicIndex(index_path) as index:
+            while True:
+                books = Book.search_fetch(
+                    domain + [("id", ">", last_id)],
+                    ["isbn_normalized"] + ENRICHED_FIELDS,
+                    order="id",
+                    limit=batch_size,
+                )
+                if not books:
+                    break
+                last_id = books[-1].id
+                self._enrich_batch(books, index, overwrite, stats)
+                stats["duration"] = time.monotonic() - start
+                _logger.info(
+                    "Library enrichment: %(processed)s books processed, %(found)s "
+                    "found, %(updated)s updated",
+                    stats,
+                )
+                if self.env.context.get("library_commit_batches"):
+                    self.env.cr.commit()  # pylint: disable=invalid-commit
+                self.env.invalidate_all()
+        return stats
+
+    def _enrich_batch(self, books, index, overwrite, stats):
+        stats["processed"] += len(books)
+        records = index.lookup(books.mapped("isbn_normalized"))
+        stats["found"] += len(records)
+        if not records:
+            return
+        Importer = self.env["library.book.importer"]
+        authors = Importer._resolve_partners(
+            {name for record in records.values() for name in record.get("authors", [])},
+            "is_author",
+        )
+        publishers = Importer._resolve_partners(
+            {
+                record["publisher"]
+                for record in records.values()
+                if "publisher" in record
+            },
+            "is_publisher",
+        )
+        languages = Importer._resolve_languages(
+            {record["language"] for record in records.values() if "language" in record}
+        )
+        partners = books.author_ids | books.publisher_id
+        vals_list = []
+        for book in books:
+            record = records.get(book.isbn_normalized)
+            vals = record and self._prepare_vals(
+                book, record, authors, publishers, languages, overwrite
+            )
+            if vals:
+                vals_list.append((book, vals))
+        updated = self._write_books(vals_list, stats)
+        if not updated:
+            return
+        updated._update_library_search_vector()
+        (partners | updated.author_ids | updated.publisher_id)._update_library_stats()
+        stats["updated"] += len(updated)
+
+    def _write_books(self, vals_list, stats):
+        """Write the values of a batch of books and flush them at once.
+
+        The writes only update the cache until the flush, which sends the
+        whole batch to the database in a few queries. If the batch fails as
+        a whole, it is replayed book by book so that only the faulty books
+        are skipped.
+
+        :return: the books updated
+        """
+        books = self.env["product.template"].union(*(book for book, __ in vals_list))
+        try:
+            with self.env.cr.savepoint():
+                for book, vals in vals_list:
+                    book.write(vals)
+                self.env.flush_all()
+            return books
+        except Exception:
+            # Replayed book by book below to find the faulty books
+            self.env.invalidate_all()
+        updated = books.browse()
+        for book, vals in vals_list:
+            try:
+                with self.env.cr.savepoint():
+                    book.write(vals)
+                    self.env.flush_all()
+                updated |= book
+            except Exception as error:
+                self.env.invalidate_all()
+                stats["failed"] += 1
+                _logger.warning("Enrichment of book %s failed: %s", book.id, error)
+        return updated
+
+    @api.model
+    def _prepare_vals(self, book, record, authors, publishers, languages, overwrite):
+        """Return the values of ``book`` to fill in from its index ``record``."""
+        today = fields.Date.to_string(fields.Date.context_today(self))
+        pages = record.get("number_of_pages")
+        candidates = {
+            "publisher_id": publishers.get(record.get("publisher")),
+            "author_ids": [
+                authors[name] for name in record.get("authors", []) if name in authors
+            ],
+            "publication_date": (
+                record.get("publication_date")
+                if (record.get("publication_date") or "") <= today
+                else False
+            ),
+            "number_of_pages": int(pages) if str(pages).isdigit() else 0,
+            "language": languages.get(record.get("language")),
+            "synopsis": record.get("synopsis"),
+        }
+        vals = {}
+        for field_name, value in candidates.items():
+            if not value or (book[field_name] and not overwrite):
+                continue
+            if field_name == "author_ids":
+                if value == book.author_ids.ids:
+                    continue
+                value = [(6, 0, value)]
+            vals[field_name] = value
+        return vals
+
+    @api.model
+    def _get_index_path(self):
+        path = self.env["ir.config_parameter"].sudo().get_param(INDEX_PARAM)
+        if not path:
+            raise UserError(
+                _(
+                    "Set the path of the bibliographic index in the %s system "
+                    "parameter.",
+                    INDEX_PARAM,
+                )
+            )
+        return path
+
+    @api.model
+    def _check_manager(self):
+        if not self.env.user.has_group("jag_library.library_group_manager"):
+            raise AccessError(_("Only library managers can enrich the books."))
+
+    @api.model
+    def action_enrich_background(self):
+        """Check the index and run the enrichment in the scheduler."""
+        self._check_manager()
+        if not os.path.isfile(self._get_index_path()):
+            raise UserError(
+                _("The bibliographic index %s does not exist.", self._get_index_path())
+            )
+        self.env.ref("jag_library.ir_cron_library_book_enrichment")._trigger()
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "type": "info",
+                "message": _("The books will be enriched in the background."),
+            },
+        }
+
+    @api.model
+    def _cron_enrich(self):
+        path = self.env["ir.config_parameter"].sudo().get_param(INDEX_PARAM)
+        if not path or not os.path.isfile(path):
+            return
+        self.with_context(library_commit_batches=True)._enrich()
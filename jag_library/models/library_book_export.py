@@ -0,0 +1,209 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+import logging
+import os
+import tempfile
+
+from odoo import _, api, fields, models
+from odoo.exceptions import UserError
+from odoo.tools.safe_eval import safe_eval
+
+from ..tools import catalogue_writers
+
+_logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = [
+    "id",
+    "name",
+    "isbn",
+    "authors",
+    "publisher",
+    "genres",
+    "location",
+    "publication_year",
+    "number_of_pages",
+    "language",
+    "edition",
+    "binding",
+]
+
+
+class LibraryBookExport(models.Model):
+    """Export of the books to a CSV, XLSX or JSON Lines attachment.
+
+    Books are read in keyset pages, with their authors, publisher, genres
+    and location prefetched for the current page only, and every row is
+    written to a temporary file as soon as it is read, so the books are
+    never all held in memory. Exports can run right away or in the
+    background through the scheduler.
+    """
+
+    _name = "library.book.export"
+    _description = "Book Export"
+    _order = "id desc"
+
+    name = fields.Char(required=True, default=lambda self: _("Books"))
+    file_format = fields.Selection(
+        [
+            ("csv", "CSV"),
+            ("xlsx", "Excel (XLSX)"),
+            ("jsonl", "JSON Lines"),
+        ],
+        required=True,
+        default="csv",
+    )
+    domain = fields.Char(default="[]", required=True)
+    state = fields.Selection(
+        [
+            ("draft", "Draft"),
+            ("pending", "Pending"),
+            ("done", "Done"),
+            ("failed", "Failed"),
+        ],
+        default="draft",
+        readonly=True,
+    )
+    attachment_id = fields.Many2one("ir.attachment", readonly=True)
+    row_count = fields.Integer("Exported Books", readonly=True)
+    duration = fields.Float("Duration (s)", readonly=True)
+    error = fields.Text(readonly=True)
+
+    def _iter_rows(self):
+        """Yield the exported columns of the books, page by page."""
+        self.ensure_one()
+        Book = self.env["product.template"]
+        domain = safe_eval(self.domain or "[]")
+        after = None
+        while True:
+            books, after = Book._get_library_catalogue_page(
+                after=after, limit=EXPORT_BATCH_SIZE, domain=domain
+            )
+            yield from self._prepare_rows(books)
+            # Only the current page is kept in memory
+            self.env.invalidate_all()
+            if not after:
+                break
+
+    def _prepare_rows(self, books):
+        """Return the rows of ``books``, reading only the exported columns."""
+        books.fetch(
+            [
+                "name",
+                "isbn_normalized",
+                "author_ids",
+                "publisher_id",
+                "genre_ids",
+                "location",
+                "publication_year",
+                "number_of_pages",
+                "language",
+                "edition",
+                "binding",
+            ]
+        )
+        return [
+            {
+                "id": book.id,
+                "name": book.name,
+                "isbn": book.isbn_normalized or None,
+                "authors": book.author_ids.mapped("name"),
+                "publisher": book.publisher_id.name or None,
+                "genres": book.genre_ids.mapped("complete_name"),
+                "location": book.location or None,
+                "publication_year": book.publication_year or None,
+                "number_of_pages": book.number_of_pages or None,
+                "language": book.language.iso_code or None,
+                "edition": book.edition or None,
+                "binding": book.binding or None,
+            }
+            for book in books
+        ]
+
+    def _run(self):
+        self.ensure_one()
+        writer, mimetype, extension = catalogue_writers.WRITERS[self.file_format]
+        fd, path = tempfile.mkstemp(suffix=f".{extension}")
+        os.close(fd)
+        start = fields.Datetime.now()
+        try:
+            count = writer(self._iter_rows(), path, EXPORT_COLUMNS)
+            attachment = self._attach_file(path, f"{self.name}.{extension}", mimetype)
+        finally:
+            os.unlink(path)
+        self.write(
+            {
+                "state": "done",
+                "attachment_id": attachment.id,
+                "row_count": count,
+                "duration": (fields.Datetime.now() - start).total_seconds(),
+                "error": False,
+            }
+        )
+        _logger.info("Exported %s books to %s", count, attachment.name)
+
+    def _attach_file(self, path, filename, mimetype):
+        """Store the file at ``path`` as an attachment of the export."""
+        with open(path, "rb") as fileobj:
+            raw = fileobj.read()
+        return (
+            self.env["ir.attachment"]
+            .sudo()
+            .create(
+                {
+                    "name": filename,
+                    "mimetype": mimetype,
+                    "res_model": self._name,
+                    "res_id": self.id,
+                    "raw": raw,
+                }
+            )
+        )
+
+    def action_export(self):
+        """Export right away and download the file."""
+        self.ensure_one()
+        try:
+            self._run()
+        except ValueError as error:
+            raise UserError(str(error)) from error
+        return self.action_download()
+
+    def action_export_background(self):
+        """Leave the export to the scheduler, which runs it shortly."""
+        self.write({"state": "pending", "error": False})
+        self.env.ref("jag_library.ir_cron_library_book_export")._trigger()
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": _("Book Export"),
+                "message": _(
+                    "The export runs in the background. Download it from "
+                    "Library > Book Exports when it is done."
+                ),
+                "type": "info",
+                "next": {"type": "ir.actions.act_window_close"},
+            },
+        }
+
+    def action_download(self):
+        self.ensure_one()
+        return {
+            "type": "ir.actions.act_url",
+            "url": f"/web/content/{self.attachment_id.id}?download=true",
+            "target": "self",
+        }
+
+    @api.model
+    def _cron_run_pending(self):
+        for export in self.search([("state", "=", "pending")], order="id"):
+            try:
+                with self.env.cr.savepoint():
+                    # Read the books with the rights of the requester
+                    export.with_user(export.create_uid)._run()
+            except Exception as error:
+                _logger.exception("Book export %s failed", export.id)
+                export.write({"state": "failed", "error": str(error)})
+            self.env.cr.commit()  # pylint: disable=invalid-commit
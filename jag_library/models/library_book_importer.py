@@ -0,0 +1,289 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+import logging
+import time
+
+from odoo import _, api, models
+from odoo.tools import split_every
+
+from ..tools import catalogue_parsers
+from ..tools import isbn as isbn_tools
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+# Only the first errors are kept in memory; the others are only counted
+MAX_REPORTED_ERRORS = 1000
+
+
+class LibraryBookImporter(models.AbstractModel):
+    """Server-side API to load large catalogues into ``product.template``.
+
+    Records come from a generator (see ``tools/catalogue_parsers.py``) and
+    are created in batches: authors, publishers, genres and languages are
+    resolved once per batch, books are created with a single ``create()``
+    call per batch and a failing row only discards itself.
+    """
+
+    _name = "library.book.importer"
+    _description = "Library Book Importer"
+
+    @api.model
+    def _import_file(self, path, file_format, batch_size=DEFAULT_BATCH_SIZE):
+        """Import the catalogue file at ``path`` of the server.
+
+        Private: the path is not checked, so it must never come from a client.
+        The import wizard passes the uploaded content instead.
+
+        :param file_format: one of ``csv``, ``marc`` or ``onix``
+        :return: the import statistics, see :meth:`import_records`
+        """
+        with open(path, "rb") as fileobj:
+            return self.import_records(
+                catalogue_parsers.PARSERS[file_format](fileobj),
+                batch_size=batch_size,
+            )
+
+    @api.model
+    def import_records(self, records, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+        """Create books from an iterable of record dicts.
+
+        :param records: iterable of dicts as yielded by the catalogue parsers
+        :param batch_size: number of books created per ``create()`` call
+        :param progress: optional callable receiving the statistics after
+            every batch
+        :return: dict with ``processed``, ``created`` and ``failed`` counts,
+            ``errors`` (list of ``(row number, message)``), ``duration`` in
+            seconds and ``rate`` in rows per second
+        """
+        stats = {
+            "processed": 0,
+            "created": 0,
+            "failed": 0,
+            "errors": [],
+            "duration": 0.0,
+            "rate": 0.0,
+        }
+        start = time.monotonic()
+        for batch in split_every(batch_size, enumerate(records, start=1)):
+            self._import_batch(batch, stats)
+            # Keep the memory bounded: nothing from this batch is needed anymore
+            self.env.invalidate_all()
+            stats["duration"] = time.monotonic() - start
+            stats["rate"] = (
+                stats["processed"] / stats["duration"] if stats["duration"] else 0.0
+            )
+            _logger.info(
+                "Library import: %(processed)s rows processed, %(created)s created, "
+                "%(failed)s failed (%(rate).0f rows/s)",
+                stats,
+            )
+            if progress:
+                progress(stats)
+        return stats
+
+    def _import_batch(self, batch, stats):
+        stats["processed"] += len(batch)
+        rows = []
+        for row_number, record in batch:
+            empty_genres = [
+                path
+                for path in record.get("genres", [])
+                if not all(part.strip() for part in path.split("/"))
+            ]
+            if record.get("error"):
+                self._add_error(
+                    stats, row_number, _("Unreadable record: %s", record["error"])
+                )
+            elif record.get("isbn") and not isbn_tools.is_valid(record["isbn"]):
+                self._add_error(
+                    stats, row_number, _("ISBN %s is invalid", record["isbn"])
+                )
+            elif not record.get("name"):
+                self._add_error(stats, row_number, _("The book has no title"))
+            elif empty_genres:
+                self._add_error(
+                    stats, row_number, _("Genre %s has an empty level", empty_genres[0])
+                )
+            else:
+                rows.append((row_number, record))
+
+        existing = self.env["product.template"]._get_books_by_isbn(
+            [record["isbn"] for __, record in rows if record.get("isbn")]
+        )
+        seen = set(existing)
+        authors = self._resolve_partners(
+            {name for __, record in rows for name in record.get("authors", [])},
+            "is_author",
+        )
+        publishers = self._resolve_partners(
+            {record["publisher"] for __, record in rows if record.get("publisher")},
+            "is_publisher",
+        )
+        genres = self._resolve_genres(
+            {path for __, record in rows for path in record.get("genres", [])}
+        )
+        languages = self._resolve_languages(
+            {record["language"] for __, record in rows if record.get("language")}
+        )
+
+        vals_list = []
+        for row_number, record in rows:
+            normalized = isbn_tools.normalize(record.get("isbn"))
+            if normalized and normalized in seen:
+                self._add_error(
+                    stats,
+                    row_number,
+                    _("A book with ISBN %s already exists", record["isbn"]),
+                )
+                continue
+            seen.add(normalized)
+            try:
+                vals = self._prepare_book_vals(
+                    record, authors, publishers, genres, languages
+                )
+            except ValueError as error:
+                self._add_error(stats, row_number, str(error))
+                continue
+            vals_list.append((row_number, vals))
+        self._create_books(vals_list, stats)
+
+    def _prepare_book_vals(self, record, authors, publishers, genres, languages):
+        vals = {
+            "name": record["name"],
+            "is_book": True,
+            "isbn": record.get("isbn", False),
+            "author_ids": [
+                (6, 0, [authors[name] for name in record.get("authors", [])])
+            ],
+            "publisher_id": publishers.get(record.get("publisher"), False),
+            "genre_ids": [(6, 0, [genres[path] for path in record.get("genres", [])])],
+            "language": languages.get(record.get("language"), False),
+            "publication_date": record.get("publication_date", False),
+        }
+        for key in ("number_of_pages", "copies"):
+            if record.get(key):
+                vals[key] = int(record[key])
+        for key in ("synopsis", "edition", "binding"):
+            if record.get(key):
+                vals[key] = record[key]
+        return vals
+
+    def _create_books(self, vals_list, stats):
+        """Create the books of a batch in one call.
+
+        If the batch fails as a whole, it is replayed row by row so that
+        only the faulty rows are reported and discarded.
+        """
+        if not vals_list:
+            return
+        Book = self.env["product.template"]
+        try:
+            with self.env.cr.savepoint():
+                Book.create([vals for __, vals in vals_list])
+            stats["created"] += len(vals_list)
+            return
+        except Exception:
+            # Replayed row by row below to find the faulty rows
+            self.env.invalidate_all()
+        for row_number, vals in vals_list:
+            try:
+                with self.env.cr.savepoint():
+                    Book.create(vals)
+                stats["created"] += 1
+            except Exception as error:
+                self.env.invalidate_all()
+                self._add_error(stats, row_number, str(error))
+
+    @api.model
+    def _add_error(self, stats, row_number, message):
+        stats["failed"] += 1
+        if len(stats["errors"]) < MAX_REPORTED_ERRORS:
+            stats["errors"].append((row_number, message))
+
+    @api.model
+    def _resolve_partners(self, names, flag):
+        """Return ``{name: partner id}``, creating the missing partners.
+
+        :param flag: ``is_author`` or ``is_publisher``
+        """
+        if not names:
+            return {}
+        Partner = self.env["res.partner"].with_context(active_test=False)
+        result = {}
+        for partner in Partner.search_fetch(
+            [(flag, "=", True), ("name", "in", list(names))], ["name"], order="id"
+        ):
+            result.setdefault(partner.name, partner.id)
+        missing = sorted(names - result.keys())
+        if missing:
+            company_type = "person" if flag == "is_author" else "company"
+            partners = Partner.create(
+                [
+                    {"name": name, flag: True, "company_type": company_type}
+                    for name in missing
+                ]
+            )
+            result.update(zip(missing, partners.ids, strict=True))
+        return result
+
+    @api.model
+    def _resolve_genres(self, paths):
+        """Return ``{"Parent / Child": genre id}``, creating missing genres.
+
+        Missing genres are created level by level, one ``create()`` per
+        depth, so that parents always exist before their children.
+        """
+        if not paths:
+            return {}
+        Genre = self.env["product.book.genre"]
+        wanted = set()
+        for path in paths:
+            parts = [part.strip() for part in path.split("/")]
+            wanted.update(" / ".join(parts[: depth + 1]) for depth in range(len(parts)))
+        result = {}
+        for genre in Genre.search_fetch(
+            [("complete_name", "in", list(wanted))], ["complete_name"], order="id"
+        ):
+            result.setdefault(genre.complete_name, genre.id)
+        missing = sorted(wanted - result.keys(), key=lambda path: path.count(" / "))
+        for depth in sorted({path.count(" / ") for path in missing}):
+            level = [path for path in missing if path.count(" / ") == depth]
+            genres = Genre.create(
+                [
+                    {
+                        "name": path.rsplit(" / ", 1)[-1],
+                        "parent_id": (
+                            result.get(path.rsplit(" / ", 1)[0]) if depth else False
+                        ),
+                    }
+                    for path in level
+                ]
+            )
+            result.update(zip(level, genres.ids, strict=True))
+        return {
+            path: result[" / ".join(p.strip() for p in path.split("/"))]
+            for path in paths
+        }
+
+    @api.model
+    def _resolve_languages(self, codes):
+        """Return ``{code: res.lang id}`` for ISO (``es``) or Odoo (``es_ES``) codes."""
+        if not codes:
+            return {}
+        langs = (
+            self.env["res.lang"]
+            .with_context(active_test=False)
+            .search_fetch(
+                ["|", ("code", "in", list(codes)), ("iso_code", "in", list(codes))],
+                ["code", "iso_code", "active"],
+                order="active desc, id",
+            )
+        )
+        result = {}
+        for lang in langs:
+            for key in (lang.code, lang.iso_code):
+                if key in codes:
+                    result.setdefault(key, lang.id)
+        return result
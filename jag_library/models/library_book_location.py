@@ -0,0 +1,135 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+PENDING_KEY = "library.book.location.pending"
+
+
+class LibraryBookLocation(models.Model):
+    """The internal locations holding stock of each book, with the quantity.
+
+    One row per book and location with a positive on-hand quantity, kept
+    up to date by the changes of the stock quants. The table is also the
+    relation of the ``shelf_ids`` field of the books, so that books can be
+    searched and grouped by shelf through the indexes of both columns, and
+    it is the source of the ``location`` of the books and of the
+    ``library.book.locator`` service.
+    """
+
+    _name = "library.book.location"
+    _description = "Book Location"
+    _log_access = False
+    _order = "location_id, product_tmpl_id"
+
+    product_tmpl_id = fields.Many2one(
+        "product.template",
+        "Book",
+        required=True,
+        readonly=True,
+        index=True,
+        ondelete="cascade",
+    )
+    location_id = fields.Many2one(
+        "stock.location",
+        "Location",
+        required=True,
+        readonly=True,
+        index=True,
+        ondelete="cascade",
+    )
+    quantity = fields.Float(readonly=True, digits="Product Unit of Measure")
+
+    _sql_constraints = [
+        (
+            "book_location_uniq",
+            "UNIQUE (product_tmpl_id, location_id)",
+            "A book has a single row per location.",
+        ),
+    ]
+
+    @api.model
+    def _mark_for_refresh(self, template_ids):
+        """Refresh the rows of the books once, before the transaction commits.
+
+        Quants are written one at a time while a transfer is validated, so
+        the books are only collected here. They are refreshed together when
+        the cursor is flushed, or earlier by :meth:`_flush_pending`.
+        """
+        if not template_ids:
+            return
+        precommit = self.env.cr.precommit
+        pending = precommit.data.get(PENDING_KEY)
+        if pending is None:
+            pending = precommit.data[PENDING_KEY] = set()
+            precommit.add(self._precommit_refresh)
+        pending.update(template_ids)
+
+    @api.model
+    def _flush_pending(self):
+        """Refresh the books collected by :meth:`_mark_for_refresh` now."""
+        pending = self.env.cr.precommit.data.pop(PENDING_KEY, None)
+        if pending:
+            self._refresh(pending)
+
+    @api.model
+    def _precommit_refresh(self):
+        self._flush_pending()
+        # The transaction has already been flushed, write the recomputed
+        # locations of the books as well
+        self.env.flush_all()
+
+    @api.model
+    def _refresh(self, template_ids):
+        """Synchronize the rows of the books with their stock, in one query.
+
+        Only the rows whose quantity changed are written. The books are
+        then marked as modified, so that their ``location`` is recomputed,
+        and dropped from the cache of the book locator.
+        """
+        template_ids = list(template_ids)
+        if not template_ids:
+            return
+        self.env["stock.quant"].flush_model(["product_id", "location_id", "quantity"])
+        self.env["stock.location"].flush_model(["usage"])
+        self.env.execute_query(
+            SQL(
+                """
+                WITH stock AS (
+                    SELECT product.product_tmpl_id, quant.location_id,
+                           sum(quant.quantity) AS quantity
+                      FROM stock_quant quant
+                      JOIN product_product product
+                        ON product.id = quant.product_id
+                      JOIN stock_location location
+                        ON location.id = quant.location_id
+                     WHERE product.product_tmpl_id = ANY(%(ids)s)
+                       AND location.usage = 'internal'
+                  GROUP BY product.product_tmpl_id, quant.location_id
+                    HAVING sum(quant.quantity) > 0
+                ), removed AS (
+                    DELETE FROM library_book_location line
+                     WHERE line.product_tmpl_id = ANY(%(ids)s)
+                       AND NOT EXISTS (
+                            SELECT FROM stock
+                             WHERE stock.product_tmpl_id = line.product_tmpl_id
+                               AND stock.location_id = line.location_id
+                       )
+                )
+                INSERT INTO library_book_location
+                            (product_tmpl_id, location_id, quantity)
+                SELECT product_tmpl_id, location_id, quantity FROM stock
+                    ON CONFLICT (product_tmpl_id, location_id) DO UPDATE
+                   SET quantity = EXCLUDED.quantity
+                 WHERE library_book_location.quantity
+                       IS DISTINCT FROM EXCLUDED.quantity
+                """,
+                ids=template_ids,
+            )
+        )
+        self.invalidate_model()
+        books = self.env["product.template"].browse(template_ids).exists()
+        books.invalidate_recordset(["book_location_ids", "shelf_ids"])
+        books.modified(["book_location_ids"])
+        self.env["library.book.locator"]._invalidate(template_ids)
@@ -0,0 +1,112 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo import api, models
+from odoo.tools import SQL
+
+from ..tools.lru import LRUCache
+
+CACHE_SIZE = 20000
+CACHE_TTL = 300
+
+# {(database name, template id): ((location id, quantity), ...)}
+_cache = LRUCache(CACHE_SIZE, CACHE_TTL)
+
+
+class LibraryBookLocator(models.AbstractModel):
+    """Where the books are and how many copies are on the shelves.
+
+    The quantities of each book per internal location are read from the
+    ``library.book.location`` rows and kept in a bounded cache of the
+    worker process. Changes of the stock quants drop
+    the affected books from the cache of the worker making them, and the
+    other workers see them once their entries expire (``CACHE_TTL``).
+    Quantities are those of all the companies, as the public catalogue
+    shows them.
+    """
+
+    _name = "library.book.locator"
+    _description = "Library Book Locator"
+
+    @api.model
+    def _get_availability(self, template_ids):
+        """Return the internal stock of the given books in one call.
+
+        Only the books missing from the cache are read, with a single
+        query, and the location names are read once for the batch.
+
+        :return: dict mapping each template id to a dict with the total
+            ``quantity`` and the ``locations`` holding it, as a list of
+            dicts with the location ``id``, ``name`` and ``quantity``
+        """
+        # Apply the stock changes of the transaction before using the cache
+        self.env["library.book.location"]._flush_pending()
+        dbname = self.env.cr.dbname
+        template_ids = list(dict.fromkeys(template_ids))
+        found, missing = _cache.get_many([(dbname, tid) for tid in template_ids])
+        if missing:
+            fetched = self._read_quantities([tid for __, tid in missing])
+            _cache.set_many({(dbname, tid): value for tid, value in fetched.items()})
+            found.update(((dbname, tid), value) for tid, value in fetched.items())
+        locations = (
+            self.env["stock.location"]
+            .sudo()
+            .browse(
+                {location_id for value in found.values() for location_id, __ in value}
+            )
+        )
+        names = dict(zip(locations.ids, locations.mapped("complete_name")))
+        result = {}
+        for tid in template_ids:
+            quantities = found[(dbname, tid)]
+            result[tid] = {
+                "quantity": sum(quantity for __, quantity in quantities),
+                "locations": [
+                    {"id": location_id, "name": names[location_id], "quantity": qty}
+                    for location_id, qty in quantities
+                ],
+            }
+        return result
+
+    @api.model
+    def _read_quantities(self, template_ids):
+        """Read the positive quantities per internal location of the books.
+
+        :return: dict mapping every given template id to a tuple of
+            ``(location id, quantity)`` sorted by location name
+        """
+        rows = self.env.execute_query(
+            SQL(
+                """
+                SELECT line.product_tmpl_id, line.location_id, line.quantity
+                  FROM library_book_location line
+                  JOIN stock_location location ON location.id = line.location_id
+                 WHERE line.product_tmpl_id = ANY(%s)
+              ORDER BY location.complete_name, line.location_id
+                """,
+                list(template_ids),
+            )
+        )
+        quantities = {tid: [] for tid in template_ids}
+        for tid, location_id, quantity in rows:
+            quantities[tid].append((location_id, quantity))
+        return {tid: tuple(value) for tid, value in quantities.items()}
+
+    @api.model
+    def _invalidate(self, template_ids):
+        """Drop the books from the cache, now and when the transaction ends.
+
+        Dropping them again after the commit discards the values that
+        concurrent requests of this worker read before the commit, and
+        after a rollback the values read from the changes rolled back.
+        """
+        keys = [(self.env.cr.dbname, tid) for tid in template_ids]
+        if not keys:
+            return
+        _cache.discard_many(keys)
+        self.env.cr.postcommit.add(lambda: _cache.discard_many(keys))
+        self.env.cr.postrollback.add(lambda: _cache.discard_many(keys))
+
+    @api.model
+    def _clear_cache(self):
+        _cache.clear()
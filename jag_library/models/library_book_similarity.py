@@ -0,0 +1,288 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+import logging
+
+from odoo import api, fields, models
+from odoo.tools import SQL, create_index, split_every
+
+_logger = logging.getLogger(__name__)
+
+# Number of similar books kept per book
+SIMILAR_BOOKS = 10
+SIMILARITY_BATCH_SIZE = 200
+# Weights of the features of the books
+AUTHOR_WEIGHT = 3.0
+GENRE_WEIGHT = 2.0
+ANCESTOR_GENRE_WEIGHT = 1.0
+PUBLISHER_WEIGHT = 1.0
+LANGUAGE_WEIGHT = 0.5
+RATING_WEIGHT = 0.5
+
+
+class LibraryBookSimilarity(models.Model):
+    """The most similar books of every book, computed in advance.
+
+    Books are described by sparse feature vectors: their authors, genres
+    and the ancestors of their genres, publisher, language and rating,
+    each with a weight. Their similarity is the cosine of the vectors.
+    The neighbours of a batch of books are computed in one query: the
+    candidates are the books sharing an author, a genre or the publisher
+    with them, and only the ``SIMILAR_BOOKS`` best ones are stored.
+
+    Books whose features change are flagged in the hidden
+    ``library_similarity_dirty`` column of ``product_template``, together
+    with the books listing them as similar, and refreshed by the
+    scheduler.
+    """
+
+    _name = "library.book.similarity"
+    _description = "Similar Book"
+    _log_access = False
+    _order = "book_id, score desc, similar_book_id"
+
+    book_id = fields.Many2one(
+        "product.template", required=True, readonly=True, ondelete="cascade"
+    )
+    similar_book_id = fields.Many2one(
+        "product.template", required=True, readonly=True, ondelete="cascade"
+    )
+    score = fields.Float(readonly=True, digits=(4, 3))
+
+    def init(self):
+        super().init()
+        # Serves the similar books of a book in order, from the index only
+        create_index(
+            self.env.cr,
+            "library_book_similarity_book_score_index",
+            self._table,
+            ["book_id", "score DESC", "similar_book_id"],
+        )
+        create_index(
+            self.env.cr,
+            "library_book_similarity_similar_book_index",
+            self._table,
+            ["similar_book_id"],
+        )
+
+    @api.model
+    def _refresh(self, book_ids):
+        """Recompute the similar books of the given books, batch by batch.
+
+        Each batch is committed when running from the scheduler.
+        """
+        Book = self.env["product.template"]
+        Book.flush_model(
+            ["author_ids", "genre_ids", "publisher_id", "language", "rating"]
+        )
+        self.env["product.book.genre"].flush_model(["parent_path"])
+        for batch in split_every(SIMILARITY_BATCH_SIZE, book_ids):
+            self._refresh_batch(list(batch))
+            if self.env.context.get("library_commit_batches"):
+                self.env.cr.commit()  # pylint: disable=invalid-commit
+        self.invalidate_model()
+        Book.invalidate_model(["similar_book_ids"])
+
+    def _refresh_batch(self, book_ids):
+        self.env.execute_query(
+            SQL(
+                """
+                UPDATE product_template SET library_similarity_dirty = false
+                 WHERE id = ANY(%(ids)s) AND library_similarity_dirty
+                """,
+                ids=book_ids,
+            )
+        )
+        self.env.execute_query(
+            SQL("DELETE FROM library_book_similarity WHERE book_id = ANY(%s)", book_ids)
+        )
+        self.env.execute_query(
+            SQL(
+                """
+                WITH source AS (
+                    SELECT id FROM product_template
+                     WHERE id = ANY(%(ids)s) AND is_book AND active
+                ), candidate AS (
+                    SELECT DISTINCT pair.book_id, pair.candidate_id
+                      FROM (
+                        SELECT author.book_id, other.book_id AS candidate_id
+                          FROM source
+                          JOIN res_partner_product_template_rel author
+                            ON author.book_id = source.id
+                          JOIN res_partner_product_template_rel other
+                            ON other.partner_id = author.partner_id
+                         UNION ALL
+                        SELECT genre.product_template_id,
+                               other.product_template_id
+                          FROM source
+                          JOIN product_book_genre_product_template_rel genre
+                            ON genre.product_template_id = source.id
+                          JOIN product_book_genre_product_template_rel other
+                            ON other.product_book_genre_id =
+                               genre.product_book_genre_id
+                         UNION ALL
+                        SELECT book.id, other.id
+                          FROM source
+                          JOIN product_template book ON book.id = source.id
+                          JOIN product_template other
+                            ON other.publisher_id = book.publisher_id
+                      ) pair
+                      JOIN product_template other ON other.id = pair.candidate_id
+                     WHERE pair.candidate_id != pair.book_id
+                       AND other.is_book AND other.active
+                ), scope AS (
+                    SELECT id AS book_id FROM source
+                     UNION
+                    SELECT candidate_id FROM candidate
+                ), feature AS (
+                    SELECT book_id, kind, ref, max(weight) AS weight
+                      FROM (
+                        SELECT rel.book_id, 'a' AS kind, rel.partner_id AS ref,
+                               %(author)s AS weight
+                          FROM res_partner_product_template_rel rel
+                          JOIN scope ON scope.book_id = rel.book_id
+                         UNION ALL
+                        SELECT rel.product_template_id, 'g', ancestor.id,
+                               CASE WHEN ancestor.id = genre.id
+                                    THEN %(genre)s ELSE %(ancestor)s END
+                          FROM product_book_genre_product_template_rel rel
+                          JOIN scope ON scope.book_id = rel.product_template_id
+                          JOIN product_book_genre genre
+                            ON genre.id = rel.product_book_genre_id
+                          JOIN product_book_genre ancestor
+                            ON starts_with(genre.parent_path, ancestor.parent_path)
+                         UNION ALL
+                        SELECT book.id, 'p', book.publisher_id, %(publisher)s
+                          FROM product_template book
+                          JOIN scope ON scope.book_id = book.id
+                         WHERE book.publisher_id IS NOT NULL
+                         UNION ALL
+                        SELECT book.id, 'l', book.language, %(language)s
+                          FROM product_template book
+                          JOIN scope ON scope.book_id = book.id
+                         WHERE book.language IS NOT NULL
+                         UNION ALL
+                        SELECT book.id, 'r', book.rating::int, %(rating)s
+                          FROM product_template book
+                          JOIN scope ON scope.book_id = book.id
+                         WHERE book.rating != '0'
+                      ) features
+                  GROUP BY book_id, kind, ref
+                ), norm AS (
+                    SELECT book_id, sqrt(sum(weight * weight)) AS norm
+                      FROM feature
+                  GROUP BY book_id
+                ), score AS (
+                    SELECT candidate.book_id, candidate.candidate_id,
+                           sum(source_feature.weight * candidate_feature.weight)
+                               / (source_norm.norm * candidate_norm.norm) AS score
+                      FROM candidate
+                      JOIN feature source_feature
+                        ON source_feature.book_id = candidate.book_id
+                      JOIN feature candidate_feature
+                        ON candidate_feature.book_id = candidate.candidate_id
+                       AND candidate_feature.kind = source_feature.kind
+                       AND candidate_feature.ref = source_feature.ref
+                      JOIN norm source_norm
+                        ON source_norm.book_id = candidate.book_id
+                      JOIN norm candidate_norm
+                        ON candidate_norm.book_id = candidate.candidate_id
+                  GROUP BY candidate.book_id, candidate.candidate_id,
+                           source_norm.norm, candidate_norm.norm
+                ), ranked AS (
+                    SELECT book_id, candidate_id, score,
+                           row_number() OVER (
+                               PARTITION BY book_id
+                               ORDER BY score DESC, candidate_id
+                           ) AS rank
+                      FROM score
+                )
+                INSERT INTO library_book_similarity (book_id, similar_book_id, score)
+                SELECT book_id, candidate_id, round(score::numeric, 3)
+                  FROM ranked
+                 WHERE rank <= %(limit)s
+                """,
+                ids=book_ids,
+                author=AUTHOR_WEIGHT,
+                genre=GENRE_WEIGHT,
+                ancestor=ANCESTOR_GENRE_WEIGHT,
+                publisher=PUBLISHER_WEIGHT,
+                language=LANGUAGE_WEIGHT,
+                rating=RATING_WEIGHT,
+                limit=SIMILAR_BOOKS,
+            )
+        )
+
+    @api.model
+    def _mark_dirty(self, book_ids):
+        """Flag the books and those listing them as similar for a refresh."""
+        if not book_ids:
+            return
+        self.env.execute_query(
+            SQL(
+                """
+                UPDATE product_template SET library_similarity_dirty = true
+                 WHERE id = ANY(%(ids)s)
+                    OR id IN (
+                        SELECT book_id FROM library_book_similarity
+                         WHERE similar_book_id = ANY(%(ids)s)
+                    )
+                """,
+                ids=list(book_ids),
+            )
+        )
+        self._trigger_refresh()
+
+    @api.model
+    def _rebuild(self):
+        """Flag all the books for a refresh by the scheduler."""
+        self.env.execute_query(SQL("""
+                UPDATE product_template SET library_similarity_dirty = true
+                 WHERE is_book AND active
+                """))
+        self._trigger_refresh()
+
+    @api.model
+    def _trigger_refresh(self):
+        """Trigger the refresh once, when the transaction is committed.
+
+        Books are flagged by every write, so triggering the scheduler each
+        time would create a trigger row per write of a bulk update.
+        """
+        precommit = self.env.cr.precommit
+        if precommit.data.get("library_similarity_trigger"):
+            return
+        precommit.data["library_similarity_trigger"] = True
+        precommit.add(self._trigger_refresh_now)
+
+    @api.model
+    def _trigger_refresh_now(self):
+        cron = self.env.ref(
+            "jag_library.ir_cron_library_book_similarity", raise_if_not_found=False
+        )
+        if cron:
+            cron._trigger()
+            self.env["ir.cron.trigger"].flush_model()
+
+    @api.model
+    def _get_dirty_book_ids(self, limit=None):
+        return [
+            book_id
+            for (book_id,) in self.env.execute_query(
+                SQL(
+                    """
+                    SELECT id FROM product_template
+                     WHERE library_similarity_dirty
+                  ORDER BY id
+                     LIMIT %s
+                    """,
+                    limit,
+                )
+            )
+        ]
+
+    @api.model
+    def _cron_refresh(self, limit=None):
+        book_ids = self._get_dirty_book_ids(limit)
+        self.with_context(library_commit_batches=True)._refresh(book_ids)
+        _logger.info("Refreshed the similar books of %s books", len(book_ids))
@@ -0,0 +1,629 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+"""Circulation of the physical copies of the books.
+
+Checkouts, returns and reservations change the state of the copies with
+set-based UPDATE statements that only lock the copy rows involved, and
+keep the availability counters of the books up to date by applying
+deltas to ``library.book.availability``. Neither the book rows nor the
+stock quants are touched, so a busy desk does not serialize on them.
+"""
+
+import logging
+from collections import Counter
+from datetime import timedelta
+
+from odoo import api, fields, models
+from odoo.tools import SQL, create_index
+
+_logger = logging.getLogger(__name__)
+
+LOAN_DAYS = 21
+RESERVATION_HOLD_DAYS = 7
+COPY_CONDITIONS = [
+    ("new", "New"),
+    ("good", "Good"),
+    ("used", "Used"),
+    ("damaged", "Damaged"),
+]
+AVAILABILITY_COUNTERS = [
+    "copy_count",
+    "available_count",
+    "on_loan_count",
+    "held_count",
+    "waiting_count",
+]
+
+
+class LibraryBookCopy(models.Model):
+    _name = "library.book.copy"
+    _description = "Book Copy"
+    _rec_name = "barcode"
+    _order = "product_tmpl_id, barcode"
+
+    product_tmpl_id = fields.Many2one(
+        "product.template",
+        "Book",
+        required=True,
+        index=True,
+        ondelete="cascade",
+        domain=[("is_book", "=", True)],
+    )
+    barcode = fields.Char(required=True, copy=False)
+    location_id = fields.Many2one(
+        "stock.location",
+        index=True,
+        domain=[("usage", "=", "internal")],
+        help="Shelf of the copy when it is not on loan.",
+    )
+    condition = fields.Selection(COPY_CONDITIONS, default="new")
+    state = fields.Selection(
+        [
+            ("available", "Available"),
+            ("reserved", "Held for a Reservation"),
+            ("on_loan", "On Loan"),
+            ("lost", "Lost"),
+        ],
+        default="available",
+        required=True,
+        readonly=True,
+        index=True,
+    )
+    active = fields.Boolean(default=True)
+    loan_ids = fields.One2many("library.loan", "copy_id", "Loans")
+
+    _sql_constraints = [
+        ("barcode_uniq", "UNIQUE (barcode)", "The barcode of a copy must be unique."),
+    ]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        copies = super().create(vals_list)
+        self.env["library.book.availability"]._recompute(copies.product_tmpl_id.ids)
+        return copies
+
+    def write(self, vals):
+        books = self.product_tmpl_id
+        res = super().write(vals)
+        if {"product_tmpl_id", "active"}.intersection(vals):
+            self.env["library.book.availability"]._recompute(
+                (books | self.product_tmpl_id).ids
+            )
+        return res
+
+    def unlink(self):
+        books = self.product_tmpl_id
+        res = super().unlink()
+        self.env["library.book.availability"]._recompute(books.exists().ids)
+        return res
+
+    def action_mark_lost(self):
+        self.filtered(lambda book_copy: book_copy.state == "available").write(
+            {"state": "lost"}
+        )
+        self.env["library.book.availability"]._recompute(self.product_tmpl_id.ids)
+
+    def action_mark_found(self):
+        self.filtered(lambda book_copy: book_copy.state == "lost").write(
+            {"state": "available"}
+        )
+        self.env["library.book.availability"]._recompute(self.product_tmpl_id.ids)
+
+
+class LibraryBookAvailability(models.Model):
+    """Counters of the copies of each book, kept apart from the book row.
+
+    Circulation operations apply deltas to them, and editing copies
+    recomputes them, for the books involved only.
+    """
+
+    _name = "library.book.availability"
+    _description = "Book Availability"
+    _log_access = False
+    _rec_name = "book_id"
+
+    book_id = fields.Many2one(
+        "product.template", required=True, readonly=True, ondelete="cascade"
+    )
+    copy_count = fields.Integer("Copies", readonly=True)
+    available_count = fields.Integer("Available", readonly=True)
+    on_loan_count = fields.Integer("On Loan", readonly=True)
+    held_count = fields.Integer("Held", readonly=True)
+    waiting_count = fields.Integer("Waiting Reservations", readonly=True)
+
+    _sql_constraints = [
+        ("book_uniq", "UNIQUE (book_id)", "A book has a single availability."),
+    ]
+
+    @api.model
+    def _recompute(self, book_ids):
+        """Recount the copies and reservations of the books in one query."""
+        if not book_ids:
+            return
+        self.env.flush_all()
+        self.env.execute_query(
+            SQL(
+                """
+                INSERT INTO library_book_availability (
+                    book_id, copy_count, available_count, on_loan_count,
+                    held_count, waiting_count
+                )
+                SELECT book.id,
+                       coalesce(copies.copy_count, 0),
+                       coalesce(copies.available_count, 0),
+                       coalesce(copies.on_loan_count, 0),
+                       coalesce(copies.held_count, 0),
+                       coalesce(reservation.waiting_count, 0)
+                  FROM unnest(%(ids)s::int[]) AS book(id)
+             LEFT JOIN LATERAL (
+                    SELECT count(*) AS copy_count,
+                           count(*) FILTER (WHERE state = 'available')
+                               AS available_count,
+                           count(*) FILTER (WHERE state = 'on_loan')
+                               AS on_loan_count,
+                           count(*) FILTER (WHERE state = 'reserved') AS held_count
+                      FROM library_book_copy
+                     WHERE product_tmpl_id = book.id
+                       AND active AND state != 'lost'
+                   ) copies ON TRUE
+             LEFT JOIN LATERAL (
+                    SELECT count(*) AS waiting_count
+                      FROM library_reservation
+                     WHERE book_id = book.id AND state = 'waiting'
+                   ) reservation ON TRUE
+                    ON CONFLICT (book_id) DO UPDATE
+                   SET copy_count = EXCLUDED.copy_count,
+                       available_count = EXCLUDED.available_count,
+                       on_loan_count = EXCLUDED.on_loan_count,
+                       held_count = EXCLUDED.held_count,
+                       waiting_count = EXCLUDED.waiting_count
+                """,
+                ids=list(book_ids),
+            )
+        )
+        self.invalidate_model(AVAILABILITY_COUNTERS)
+
+    @api.model
+    def _apply_deltas(self, deltas):
+        """Add ``deltas`` to the counters in one statement.
+
+        :param deltas: dict mapping book ids to a dict of counter deltas,
+            e.g. ``{book_id: {"available_count": -1, "on_loan_count": 1}}``
+        """
+        if not deltas:
+            return
+        rows = SQL(", ").join(
+            SQL(
+                "(%s, 0, %s, %s, %s, %s)",
+                book_id,
+                *(delta.get(counter, 0) for counter in AVAILABILITY_COUNTERS[1:]),
+            )
+            for book_id, delta in deltas.items()
+        )
+        self.env.execute_query(
+            SQL(
+                """
+                INSERT INTO library_book_availability AS availability (
+                    book_id, copy_count, available_count, on_loan_count,
+                    held_count, waiting_count
+                )
+                VALUES %s
+                    ON CONFLICT (book_id) DO UPDATE
+                   SET available_count =
+                           availability.available_count + EXCLUDED.available_count,
+                       on_loan_count =
+                           availability.on_loan_count + EXCLUDED.on_loan_count,
+                       held_count = availability.held_count + EXCLUDED.held_count,
+                       waiting_count =
+                           availability.waiting_count + EXCLUDED.waiting_count
+                """,
+                rows,
+            )
+        )
+        self.invalidate_model(AVAILABILITY_COUNTERS)
+
+    @api.model
+    def _get_counts(self, book_ids):
+        """Return ``{book id: {counter: value}}`` for the given books."""
+        availabilities = self.search_fetch(
+            [("book_id", "in", list(book_ids))], ["book_id"] + AVAILABILITY_COUNTERS
+        )
+        return {
+            availability.book_id.id: {
+                counter: availability[counter] for counter in AVAILABILITY_COUNTERS
+            }
+            for availability in availabilities
+        }
+
+
+class LibraryLoan(models.Model):
+    _name = "library.loan"
+    _description = "Loan"
+    _order = "date_checkout desc, id desc"
+
+    copy_id = fields.Many2one(
+        "library.book.copy", required=True, index=True, ondelete="restrict"
+    )
+    book_id = fields.Many2one(
+        "product.template", required=True, index=True, ondelete="restrict"
+    )
+    partner_id = fields.Many2one(
+        "res.partner", "Borrower", required=True, index=True, ondelete="restrict"
+    )
+    date_checkout = fields.Datetime(
+        "Checked Out On", required=True, default=fields.Datetime.now
+    )
+    date_due = fields.Date("Due Date", required=True)
+    date_return = fields.Datetime("Returned On")
+    state = fields.Selection(
+        [
+            ("ongoing", "Ongoing"),
+            ("overdue", "Overdue"),
+            ("returned", "Returned"),
+        ],
+        default="ongoing",
+        required=True,
+        readonly=True,
+        index=True,
+    )
+
+    def init(self):
+        super().init()
+        # Overdue scan
+        create_index(
+            self.env.cr,
+            "library_loan_ongoing_date_due_index",
+            self._table,
+            ["date_due"],
+            where="state = 'ongoing'",
+        )
+        create_index(
+            self.env.cr,
+            "library_loan_copy_open_index",
+            self._table,
+            ["copy_id"],
+            where="state != 'returned'",
+        )
+
+    @api.model
+    def _get_copies_by_barcode(self, barcodes):
+        barcodes = [barcode.strip() for barcode in barcodes]
+        barcodes = list(dict.fromkeys(barcode for barcode in barcodes if barcode))
+        copies = self.env["library.book.copy"].search_fetch(
+            [("barcode", "in", barcodes)], ["barcode"]
+        )
+        found = {book_copy.barcode: book_copy.id for book_copy in copies}
+        return found, [barcode for barcode in barcodes if barcode not in found]
+
+    @api.model
+    def checkout(self, barcodes, partner_id, days=LOAN_DAYS):
+        """Lend the copies with the given barcodes to a borrower at once.
+
+        Available copies, and copies held for a reservation of the same
+        borrower, are lent; the others are reported.
+
+        :return: dict with the ``loan_ids`` created and the ``unknown`` and
+            ``unavailable`` barcodes
+        """
+        Reservation = self.env["library.reservation"]
+        found, unknown = self._get_copies_by_barcode(barcodes)
+        held = Reservation.search_fetch(
+            [
+                ("state", "=", "ready"),
+                ("partner_id", "=", partner_id),
+                ("copy_id", "in", list(found.values())),
+            ],
+            ["copy_id"],
+        )
+        held_copy_ids = held.copy_id.ids
+        self.env.flush_all()
+        rows = self.env.execute_query(
+            SQL(
+                """
+                UPDATE library_book_copy
+                   SET state = 'on_loan'
+                 WHERE id IN %s
+                   AND active
+                   AND (state = 'available' OR (state = 'reserved' AND id IN %s))
+             RETURNING id, product_tmpl_id, state
+                """,
+                tuple(found.values()) or (None,),
+                tuple(held_copy_ids) or (None,),
+            )
+        )
+        self.env["library.book.copy"].invalidate_model(["state"])
+        lent = {copy_id for copy_id, __, __ in rows}
+        unavailable = [
+            barcode for barcode, copy_id in found.items() if copy_id not in lent
+        ]
+        date_due = fields.Date.context_today(self) + timedelta(days=days)
+        loans = self.create(
+            [
+                {
+                    "copy_id": copy_id,
+                    "book_id": book_id,
+                    "partner_id": partner_id,
+                    "date_due": date_due,
+                }
+                for copy_id, book_id, __ in rows
+            ]
+        )
+        deltas = {}
+        for copy_id, book_id, __ in rows:
+            delta = deltas.setdefault(book_id, Counter())
+            delta["held_count" if copy_id in held_copy_ids else "available_count"] -= 1
+            delta["on_loan_count"] += 1
+        held.filtered(lambda reservation: reservation.copy_id.id in lent).write(
+            {"state": "done"}
+        )
+        self.env["library.book.availability"]._apply_deltas(deltas)
+        return {"loan_ids": loans.ids, "unknown": unknown, "unavailable": unavailable}
+
+    @api.model
+    def checkin(self, barcodes):
+        """Return the copies with the given barcodes at once.
+
+        Returned copies are held for the oldest waiting reservations of
+        their book, and made available otherwise.
+
+        :return: dict with the ``returned`` barcodes, the ``reserved``
+            ones held for a reservation, and the ``unknown`` and
+            ``not_on_loan`` barcodes
+        """
+        found, unknown = self._get_copies_by_barcode(barcodes)
+        self.flush_model()
+        rows = self.env.execute_query(
+            SQL(
+                """
+                UPDATE library_loan
+                   SET state = 'returned', date_return = now() at time zone 'UTC'
+                 WHERE copy_id IN %s AND state != 'returned'
+             RETURNING copy_id, book_id
+                """,
+                tuple(found.values()) or (None,),
+            )
+        )
+        self.invalidate_model(["state", "date_return"])
+        copy_ids_by_book = {}
+        for copy_id, book_id in rows:
+            copy_ids_by_book.setdefault(book_id, []).append(copy_id)
+        held = self.env["library.reservation"]._hold_returned_copies(copy_ids_by_book)
+        returned = {copy_id for copy_id, __ in rows}
+        available = returned - set(held)
+        if available:
+            self.env.execute_query(
+                SQL(
+                    "UPDATE library_book_copy SET state = 'available' WHERE id IN %s",
+                    tuple(available),
+                )
+            )
+            self.env["library.book.copy"].invalidate_model(["state"])
+        deltas = {}
+        for copy_id, book_id in rows:
+            delta = deltas.setdefault(book_id, Counter())
+            delta["on_loan_count"] -= 1
+            if copy_id in held:
+                delta["held_count"] += 1
+                delta["waiting_count"] -= 1
+            else:
+                delta["available_count"] += 1
+        self.env["library.book.availability"]._apply_deltas(deltas)
+        return {
+            "returned": [b for b, copy_id in found.items() if copy_id in returned],
+            "reserved": [b for b, copy_id in found.items() if copy_id in held],
+            "unknown": unknown,
+            "not_on_loan": [
+                b for b, copy_id in found.items() if copy_id not in returned
+            ],
+        }
+
+    @api.model
+    def _cron_scan_overdue(self):
+        """Flag the overdue loans and release the expired holds, set-based."""
+        self.flush_model()
+        overdue = self.env.execute_query(
+            SQL(
+                """
+                UPDATE library_loan SET state = 'overdue'
+                 WHERE state = 'ongoing' AND date_due < %s
+             RETURNING id
+                """,
+                fields.Date.context_today(self),
+            )
+        )
+        self.invalidate_model(["state"])
+        released = self.env["library.reservation"]._expire_holds()
+        _logger.info(
+            "Library circulation: %s loans overdue, %s holds released",
+            len(overdue),
+            released,
+        )
+
+
+class LibraryReservation(models.Model):
+    _name = "library.reservation"
+    _description = "Reservation"
+    _order = "date_reserved, id"
+
+    book_id = fields.Many2one(
+        "product.template",
+        required=True,
+        index=True,
+        ondelete="cascade",
+        domain=[("is_book", "=", True)],
+    )
+    partner_id = fields.Many2one(
+        "res.partner", "Borrower", required=True, index=True, ondelete="cascade"
+    )
+    date_reserved = fields.Datetime(
+        "Reserved On", required=True, default=fields.Datetime.now
+    )
+    copy_id = fields.Many2one(
+        "library.book.copy", "Held Copy", readonly=True, index="btree_not_null"
+    )
+    date_expiry = fields.Date("Hold Until", readonly=True)
+    state = fields.Selection(
+        [
+            ("waiting", "Waiting"),
+            ("ready", "Ready for Pickup"),
+            ("done", "Done"),
+            ("cancelled", "Cancelled"),
+        ],
+        default="waiting",
+        required=True,
+        readonly=True,
+        index=True,
+    )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Hold an available copy for each new reservation, if any."""
+        reservations = super().create(vals_list)
+        self.env.flush_all()
+        date_expiry = fields.Date.context_today(self) + timedelta(
+            days=RESERVATION_HOLD_DAYS
+        )
+        wanted = Counter(reservation.book_id.id for reservation in reservations)
+        # One copy per reservation, for all the books at once
+        rows = self.env.execute_query(
+            SQL(
+                """
+                UPDATE library_book_copy copy SET state = 'reserved'
+                  FROM unnest(%s::int[], %s::int[]) AS wanted(book_id, quantity)
+            CROSS JOIN LATERAL (
+                        SELECT id FROM library_book_copy
+                         WHERE product_tmpl_id = wanted.book_id
+                           AND state = 'available' AND active
+                         LIMIT wanted.quantity
+                           FOR UPDATE SKIP LOCKED
+                       ) AS picked
+                 WHERE copy.id = picked.id
+             RETURNING copy.id, copy.product_tmpl_id
+                """,
+                list(wanted),
+                list(wanted.values()),
+            )
+        )
+        copy_ids_by_book = {}
+        for copy_id, book_id in rows:
+            copy_ids_by_book.setdefault(book_id, []).append(copy_id)
+        deltas = {}
+        for reservation in reservations:
+            delta = deltas.setdefault(reservation.book_id.id, Counter())
+            copy_ids = copy_ids_by_book.get(reservation.book_id.id)
+            if copy_ids:
+                reservation.write(
+                    {
+                        "state": "ready",
+                        "copy_id": copy_ids.pop(0),
+                        "date_expiry": date_expiry,
+                    }
+                )
+                delta["available_count"] -= 1
+                delta["held_count"] += 1
+            else:
+                delta["waiting_count"] += 1
+        self.env["library.book.copy"].invalidate_model(["state"])
+        self.env["library.book.availability"]._apply_deltas(deltas)
+        return reservations
+
+    @api.model
+    def _hold_returned_copies(self, copy_ids_by_book):
+        """Hold returned copies for the oldest waiting reservations.
+
+        :param copy_ids_by_book: returned copy ids per book id
+        :return: dict mapping the held copy ids to their reservation
+        """
+        waiting = self.search(
+            [("book_id", "in", list(copy_ids_by_book)), ("state", "=", "waiting")],
+            order="date_reserved, id",
+        )
+        free = {book_id: list(ids) for book_id, ids in copy_ids_by_book.items()}
+        held = {}
+        for reservation in waiting:
+            copies = free.get(reservation.book_id.id)
+            if copies:
+                held[copies.pop(0)] = reservation
+        if not held:
+            return {}
+        date_expiry = fields.Date.context_today(self) + timedelta(
+            days=RESERVATION_HOLD_DAYS
+        )
+        for copy_id, reservation in held.items():
+            reservation.write(
+                {"state": "ready", "copy_id": copy_id, "date_expiry": date_expiry}
+            )
+        self.env.execute_query(
+            SQL(
+                "UPDATE library_book_copy SET state = 'reserved' WHERE id IN %s",
+                tuple(held),
+            )
+        )
+        self.env["library.book.copy"].invalidate_model(["state"])
+        return held
+
+    @api.model
+    def _expire_holds(self):
+        """Cancel the holds not picked up in time and free their copies."""
+        self.flush_model()
+        rows = self.env.execute_query(
+            SQL(
+                """
+                UPDATE library_reservation SET state = 'cancelled'
+                 WHERE state = 'ready' AND date_expiry < %s
+             RETURNING copy_id, book_id
+                """,
+                fields.Date.context_today(self),
+            )
+        )
+        self._release_copies(rows)
+        return len(rows)
+
+    def action_cancel(self):
+        ready = self.filtered(lambda reservation: reservation.state == "ready")
+        waiting = self.filtered(lambda reservation: reservation.state == "waiting")
+        rows = [
+            (reservation.copy_id.id, reservation.book_id.id) for reservation in ready
+        ]
+        (ready | waiting).write({"state": "cancelled"})
+        deltas = {}
+        for reservation in waiting:
+            deltas.setdefault(reservation.book_id.id, Counter())["waiting_count"] -= 1
+        self.env["library.book.availability"]._apply_deltas(deltas)
+        self._release_copies(rows)
+
+    @api.model
+    def _release_copies(self, rows):
+        """Hand the copies of cancelled holds over, like returned copies.
+
+        They are held for the oldest waiting reservations of their book,
+        and made available otherwise.
+
+        :param rows: list of ``(copy id, book id)``
+        """
+        self.invalidate_model(["state"])
+        if not rows:
+            return
+        copy_ids_by_book = {}
+        for copy_id, book_id in rows:
+            copy_ids_by_book.setdefault(book_id, []).append(copy_id)
+        held = self._hold_returned_copies(copy_ids_by_book)
+        available = [copy_id for copy_id, __ in rows if copy_id not in held]
+        if available:
+            self.env.execute_query(
+                SQL(
+                    "UPDATE library_book_copy SET state = 'available' WHERE id IN %s",
+                    tuple(available),
+                )
+            )
+            self.env["library.book.copy"].invalidate_model(["state"])
+        deltas = {}
+        for copy_id, book_id in rows:
+            delta = deltas.setdefault(book_id, Counter())
+            if copy_id in held:
+                # Still held, for the next reservation
+                delta["waiting_count"] -= 1
+            else:
+                delta["held_count"] -= 1
+                delta["available_count"] += 1
+        self.env["library.book.availability"]._apply_deltas(deltas)
@@ -0,0 +1,165 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+import logging
+
+from odoo import _, api, fields, models
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+REFRESH_PARAM = "jag_library.dashboard_refreshed_at"
+
+
+class LibraryDashboardStat(models.Model):
+    """Precomputed statistics of the catalogue, read by the dashboard.
+
+    The rows are rebuilt by :meth:`refresh` (hourly by default) with one
+    aggregation query per dimension, so the dashboard reads a few hundred
+    rows whatever the size of the catalogue.
+    """
+
+    _name = "library.dashboard.stat"
+    _description = "Library Statistics"
+    _log_access = False
+    _order = "dimension, sequence, name"
+
+    dimension = fields.Selection(
+        [
+            ("genre", "Genre"),
+            ("binding", "Binding"),
+            ("condition", "Condition"),
+            ("publication_year", "Publication Year"),
+            ("language", "Language"),
+            ("rating", "Rating"),
+            ("finished_month", "Books Read per Month"),
+        ],
+        required=True,
+        readonly=True,
+        index=True,
+    )
+    name = fields.Char(readonly=True)
+    sequence = fields.Integer(readonly=True)
+    genre_id = fields.Many2one("product.book.genre", readonly=True)
+    language_id = fields.Many2one("res.lang", readonly=True)
+    publication_year = fields.Integer(readonly=True, aggregator=None)
+    month = fields.Date(readonly=True)
+    book_count = fields.Integer("Books", readonly=True)
+    copy_count = fields.Integer("Copies", readonly=True)
+    reading_days_avg = fields.Float(
+        "Average Days to Read", digits=(16, 1), readonly=True, aggregator="avg"
+    )
+    refresh_date = fields.Datetime("Refreshed On", readonly=True)
+
+    def _get_dimension_queries(self):
+        """Return ``{dimension: query}``, each query returning the key and
+        the ``book_count``, ``copy_count`` and ``reading_days_avg`` of the
+        active books per value of the dimension."""
+        aggregates = SQL("""
+            count(*), coalesce(sum(book.copies), 0),
+            avg(book.date_end_reading - book.date_start_reading)
+                FILTER (WHERE book.date_end_reading >= book.date_start_reading)
+            """)
+        books = SQL("product_template book WHERE book.is_book AND book.active")
+
+        def by_column(column):
+            return SQL(
+                "SELECT %s, %s FROM %s GROUP BY 1",
+                SQL.identifier("book", column),
+                aggregates,
+                books,
+            )
+
+        return {
+            "genre": SQL(
+                """
+                SELECT rel.product_book_genre_id, %s
+                  FROM product_book_genre_product_template_rel rel
+                  JOIN product_template book ON book.id = rel.product_template_id
+                 WHERE book.is_book AND book.active
+              GROUP BY 1
+                """,
+                aggregates,
+            ),
+            "binding": by_column("binding"),
+            "condition": by_column("condition"),
+            "publication_year": by_column("publication_year"),
+            "language": by_column("language"),
+            "rating": by_column("rating"),
+            "finished_month": SQL(
+                """
+                SELECT date_trunc('month', book.date_end_reading)::date, %s
+                  FROM %s AND book.date_end_reading IS NOT NULL
+              GROUP BY 1
+                """,
+                aggregates,
+                books,
+            ),
+        }
+
+    def _prepare_stat_vals(self, dimension, key, labels):
+        """Return the values identifying the row of ``key`` in ``dimension``."""
+        vals = {"dimension": dimension}
+        if not key:
+            vals["name"] = _("Undefined")
+        elif dimension == "genre":
+            vals.update(genre_id=key, name=labels["genre"].get(key))
+        elif dimension == "language":
+            vals.update(language_id=key, name=labels["language"].get(key))
+        elif dimension == "publication_year":
+            vals.update(publication_year=key, name=str(key), sequence=key)
+        elif dimension == "finished_month":
+            vals.update(month=key, name=key.strftime("%Y-%m"))
+        else:
+            selection = labels[dimension]
+            vals["name"] = selection.get(key)
+            vals["sequence"] = list(selection).index(key) if key in selection else 0
+        return vals
+
+    @api.model
+    def _refresh(self):
+        """Rebuild all the statistics and record the refresh time."""
+        self.env["product.template"].flush_model()
+        now = fields.Datetime.now()
+        results = {
+            dimension: self.env.execute_query(query)
+            for dimension, query in self._get_dimension_queries().items()
+        }
+        Book = self.env["product.template"]
+        labels = {
+            dimension: dict(Book._fields[dimension]._description_selection(self.env))
+            for dimension in ("binding", "condition", "rating")
+        }
+        genres = self.env["product.book.genre"].browse(
+            [key for key, *__ in results["genre"]]
+        )
+        labels["genre"] = {genre.id: genre.complete_name for genre in genres}
+        langs = (
+            self.env["res.lang"]
+            .with_context(active_test=False)
+            .browse([key for key, *__ in results["language"] if key])
+        )
+        labels["language"] = {lang.id: lang.name for lang in langs}
+        vals_list = []
+        for dimension, rows in results.items():
+            for key, book_count, copy_count, reading_days_avg in rows:
+                vals = self._prepare_stat_vals(dimension, key, labels)
+                vals.update(
+                    book_count=book_count,
+                    copy_count=copy_count,
+                    reading_days_avg=reading_days_avg or 0.0,
+                    refresh_date=now,
+                )
+                vals_list.append(vals)
+        self.env.execute_query(SQL("DELETE FROM library_dashboard_stat"))
+        self.invalidate_model()
+        self.sudo().create(vals_list)
+        self.env["ir.config_parameter"].sudo().set_param(
+            REFRESH_PARAM, fields.Datetime.to_string(now)
+        )
+        _logger.info("Library dashboard refreshed: %s rows", len(vals_list))
+        return True
+
+    @api.model
+    def _cron_refresh(self):
+        self._refresh()
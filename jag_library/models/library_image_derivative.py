@@ -0,0 +1,205 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+import base64
+import logging
+
+from psycopg2 import IntegrityError
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+from odoo.tools.image import image_process
+
+_logger = logging.getLogger(__name__)
+
+DERIVATIVE_SIZES = (1024, 512, 256, 128)
+
+
+class LibraryImageDerivative(models.Model):
+    """Resized copy of a stored image, shared by every record holding it.
+
+    Derivatives are keyed by the checksum of the original attachment and by
+    their size, so they are generated once per distinct image instead of
+    once per record, and only when they are first needed.
+    """
+
+    _name = "library.image.derivative"
+    _description = "Resized Image"
+    _log_access = False
+
+    checksum = fields.Char(required=True, index=True, readonly=True)
+    size = fields.Integer(required=True, readonly=True)
+    image = fields.Binary(attachment=True, readonly=True)
+
+    _sql_constraints = [
+        (
+            "checksum_size_uniq",
+            "UNIQUE (checksum, size)",
+            "A derivative already exists for this image and size.",
+        ),
+    ]
+
+    @api.model
+    def _get_original_attachments(self, records, field_name):
+        """Return the attachments holding ``field_name`` for ``records``."""
+        return (
+            self.env["ir.attachment"]
+            .sudo()
+            .search_fetch(
+                [
+                    ("res_model", "=", records._name),
+                    ("res_field", "=", field_name),
+                    ("res_id", "in", records.ids),
+                ],
+                ["res_id", "checksum"],
+            )
+        )
+
+    @api.model
+    def _get_images(self, records, field_name, size):
+        """Return the ``size`` derivative of image ``field_name`` per record.
+
+        Derivatives already generated are read from the filestore; missing
+        ones are resized from their original and stored for the next
+        request, unless the cursor is read-only.
+
+        :return: dict mapping record ids to base64 images
+        """
+        originals = self._get_original_attachments(records, field_name)
+        if not originals:
+            return {}
+        images = self._get_or_create(originals, size)
+        return {
+            original.res_id: images.get(original.checksum) for original in originals
+        }
+
+    @api.model
+    def _get_or_create(self, originals, size):
+        """Return ``{checksum: base64 image}`` for the given original attachments."""
+        # bin_size would read the size of the images instead of their content
+        derivatives = (
+            self.sudo()
+            .with_context(bin_size=False)
+            .search_fetch(
+                [
+                    ("checksum", "in", list(set(originals.mapped("checksum")))),
+                    ("size", "=", size),
+                ],
+                ["checksum", "image"],
+            )
+        )
+        images = {derivative.checksum: derivative.image for derivative in derivatives}
+        to_create = {}
+        for original in originals:
+            if original.checksum in images:
+                continue
+            image = base64.b64encode(image_process(original.raw, size=(size, size)))
+            images[original.checksum] = to_create[original.checksum] = image
+        if to_create and not getattr(self.env.cr, "readonly", False):
+            try:
+                with self.env.cr.savepoint():
+                    self.sudo().create(
+                        [
+                            {"checksum": checksum, "size": size, "image": image}
+                            for checksum, image in to_create.items()
+                        ]
+                    )
+            except IntegrityError:
+                # Another worker stored the same derivatives meanwhile
+                _logger.debug("Image derivatives already stored", exc_info=True)
+        return images
+
+    @api.model
+    def _get_missing_originals(self, model_name, field_name, size, limit):
+        """Return one attachment per distinct image that has no ``size`` derivative."""
+        attachment_ids = [
+            attachment_id
+            for (attachment_id,) in self.env.execute_query(
+                SQL(
+                    """
+                    SELECT DISTINCT ON (a.checksum) a.id
+                      FROM ir_attachment a
+                     WHERE a.res_model = %(model)s
+                       AND a.res_field = %(field)s
+                       AND a.checksum IS NOT NULL
+                       AND NOT EXISTS (
+                            SELECT 1
+                              FROM library_image_derivative d
+                             WHERE d.checksum = a.checksum AND d.size = %(size)s
+                       )
+                     LIMIT %(limit)s
+                    """,
+                    model=model_name,
+                    field=field_name,
+                    size=size,
+                    limit=limit,
+                )
+            )
+        ]
+        return self.env["ir.attachment"].sudo().browse(attachment_ids)
+
+    @api.model
+    def _backfill(
+        self,
+        model_name="product.template",
+        field_name="image_back_cover_1920",
+        sizes=DERIVATIVE_SIZES,
+        batch_size=200,
+        limit=None,
+    ):
+        """Generate the missing derivatives in batches.
+
+        Each batch is committed when running from the scheduler, so that a
+        long backfill can be interrupted and resumed.
+
+        :param limit: maximum number of derivatives generated, ``None`` for all
+        :return: the number of derivatives generated
+        """
+        count = 0
+        for size in sizes:
+            while limit is None or count < limit:
+                size_limit = (
+                    batch_size if limit is None else min(batch_size, limit - count)
+                )
+                originals = self._get_missing_originals(
+                    model_name, field_name, size, size_limit
+                )
+                if not originals:
+                    break
+                self._get_or_create(originals, size)
+                count += len(originals)
+                _logger.info(
+                    "Generated %s image derivatives of size %s", len(originals), size
+                )
+                if self.env.context.get("library_commit_batches"):
+                    self.env.cr.commit()  # pylint: disable=invalid-commit
+                self.env.invalidate_all()
+        return count
+
+    @api.model
+    def _purge(self, orphans_only=True):
+        """Delete derivatives in bulk.
+
+        :param orphans_only: only delete the derivatives whose original is
+            not stored anymore; ``False`` deletes all of them, they will be
+            generated again on demand
+        :return: the number of derivatives deleted
+        """
+        query = SQL("SELECT id FROM library_image_derivative d")
+        if orphans_only:
+            query = SQL(
+                """%s WHERE NOT EXISTS (
+                    SELECT 1 FROM ir_attachment a
+                     WHERE a.checksum = d.checksum AND a.res_field IS NOT NULL
+                       AND a.res_model != %s
+                )""",
+                query,
+                self._name,
+            )
+        ids = [derivative_id for (derivative_id,) in self.env.execute_query(query)]
+        self.browse(ids).sudo().unlink()
+        return len(ids)
+
+    @api.model
+    def _cron_backfill(self, limit=1000):
+        self.with_context(library_commit_batches=True)._backfill(limit=limit)
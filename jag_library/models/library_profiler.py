@@ -0,0 +1,49 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo import _, api, models, tools
+from odoo.exceptions import AccessError
+
+from ..tools import profiling
+
+PROFILING_PARAM = "jag_library.profiling"
+
+
+class LibraryProfiler(models.AbstractModel):
+    """Access point to the profiling data of the library hot paths.
+
+    The data lives in the memory of each worker process, so the statistics
+    returned describe the calls served by the worker answering the request.
+    """
+
+    _name = "library.profiler"
+    _description = "Library Profiler"
+
+    @api.model
+    @tools.ormcache()
+    def _is_enabled(self):
+        return tools.str2bool(
+            self.env["ir.config_parameter"].sudo().get_param(PROFILING_PARAM, "False")
+        )
+
+    @api.model
+    def _check_manager(self):
+        if not self.env.user.has_group("jag_library.library_group_manager"):
+            raise AccessError(_("Only library managers can read profiling data."))
+
+    @api.model
+    def get_stats(self, recent=50):
+        """Return the aggregated statistics and the most recent calls."""
+        self._check_manager()
+        records = profiling.get_records()
+        return {
+            "enabled": self._is_enabled(),
+            "summary": profiling.summarize(records),
+            "recent": [record._asdict() for record in records[-recent:]],
+        }
+
+    @api.model
+    def reset(self):
+        self._check_manager()
+        profiling.clear()
+        return True
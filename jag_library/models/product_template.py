@@ -1,8 +1,59 @@
 # Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
 # License AGPL-3.0 or later (https://ww
 
+import base64
+import re
+from collections import Counter
+
 from odoo import _, api, fields, models
-from odoo.exceptions import ValidationError
+from odoo.exceptions import AccessError, ValidationError
+from odoo.tools import SQL, create_index, sql
+from odoo.tools.image import image_process
+
+from ..tools import isbn as isbn_tools
+from ..tools import sequencing, titles
+from ..tools.profiling import profiled
+
+# Stored cover images, with the stored fields resized from each of them.
+# Books with the same original share the attachments of the whole group.
+COVER_FIELDS = {
+    "image_1920": ("image_1920", "image_1024", "image_512", "image_256", "image_128"),
+    "image_back_cover_1920": ("image_back_cover_1920",),
+}
+# Fields of the books aggregated in the genre statistics
+GENRE_STATS_FIELDS = {"genre_ids", "copies", "rating", "active", "is_book"}
+# Fields of the books aggregated in the author and publisher statistics
+PARTNER_STATS_FIELDS = {
+    "author_ids",
+    "publisher_id",
+    "copies",
+    "rating",
+    "publication_date",
+    "active",
+    "is_book",
+}
+# Room left between the sequences of the books when they are renumbered
+SEQUENCE_GAP = 100
+# Features of the books compared by library.book.similarity
+SIMILARITY_FIELDS = {
+    "author_ids",
+    "genre_ids",
+    "publisher_id",
+    "language",
+    "rating",
+    "active",
+    "is_book",
+}
+# Fields feeding the full-text search document of a book
+SEARCH_DOCUMENT_FIELDS = {
+    "name",
+    "isbn",
+    "author_ids",
+    "publisher_id",
+    "genre_ids",
+    "synopsis",
+    "reading_notes",
+}
 
 
 class ProductTemplate(models.Model):
@@ -10,6 +61,24 @@ class ProductTemplate(models.Model):
 
     is_book = fields.Boolean(string="Is a book")
     isbn = fields.Char("ISBN")
+    isbn_normalized = fields.Char(
+        "Normalized ISBN",
+        compute="_compute_isbn_normalized",
+        store=True,
+        precompute=True,
+        index=True,
+        help="ISBN-13 form of the ISBN without separators, used to detect "
+        "duplicates and to look books up.",
+    )
+    library_title_key = fields.Char(
+        "Title Key",
+        compute="_compute_library_title_key",
+        store=True,
+        precompute=True,
+        index=True,
+        help="Significant words of the title, without case, accents or "
+        "articles, used to find duplicate books.",
+    )
     number_of_pages = fields.Integer()
     copies = fields.Integer(default=1)
     rating = fields.Selection(
@@ -62,33 +131,24 @@ class ProductTemplate(models.Model):
     image_back_cover_1920 = fields.Image(
         "Back Cover", max_width=1920, max_height=1920
     )
+    # The resized back covers are not stored per book: they are generated on
+    # first access and shared by all the books with the same back cover.
+    # Being readonly without maximum size, assigning them does not resize.
     image_back_cover_1024 = fields.Image(
         "Back Cover 1024",
-        related="image_back_cover_1920",
-        max_width=1024,
-        max_height=1024,
-        store=True,
+        compute="_compute_image_back_cover_1024",
     )
     image_back_cover_512 = fields.Image(
         "Back Cover 512",
-        related="image_back_cover_1920",
-        max_width=512,
-        max_height=512,
-        store=True,
+        compute="_compute_image_back_cover_512",
     )
     image_back_cover_256 = fields.Image(
         "Back Cover 256",
-        related="image_back_cover_1920",
-        max_width=256,
-        max_height=256,
-        store=True,
+        compute="_compute_image_back_cover_256",
     )
     image_back_cover_128 = fields.Image(
         "Back Cover 128",
-        related="image_back_cover_1920",
-        max_width=128,
-        max_height=128,
-        store=True,
+        compute="_compute_image_back_cover_128",
     )
     condition = fields.Selection(
         [
@@ -104,38 +164,266 @@ class ProductTemplate(models.Model):
         compute="_compute_location",
         store=True,
     )
+    book_location_ids = fields.One2many(
+        "library.book.location", "product_tmpl_id", "Stock per Location", copy=False
+    )
+    shelf_ids = fields.Many2many(
+        "stock.location",
+        "library_book_location",
+        "product_tmpl_id",
+        "location_id",
+        string="Shelves",
+        readonly=True,
+        copy=False,
+        depends=["book_location_ids"],
+        help="Internal locations holding stock of the book.",
+    )
 
     sequence = fields.Integer(
         string='Secuencia',
         default=10,
         help="Determines the order in the list view. The lowest number is displayed first."
     )
+    cover_thumbnail_url = fields.Char(
+        compute="_compute_cover_thumbnail_url",
+        help="URL of the cover thumbnail, changing whenever the cover changes "
+        "so that browsers can cache it indefinitely.",
+    )
+
+    copy_ids = fields.One2many("library.book.copy", "product_tmpl_id", "Copies")
+    available_copy_count = fields.Integer(
+        "Available Copies", compute="_compute_copy_availability", compute_sudo=True
+    )
+    on_loan_copy_count = fields.Integer(
+        "Copies on Loan", compute="_compute_copy_availability", compute_sudo=True
+    )
+    waiting_reservation_count = fields.Integer(
+        "Waiting Reservations", compute="_compute_copy_availability", compute_sudo=True
+    )
+    shelf_quantity = fields.Float(
+        "On the Shelves",
+        compute="_compute_shelf_quantity",
+        digits="Product Unit of Measure",
+        help="Quantity in the internal locations, read from the cache of the "
+        "library book locator.",
+    )
+
+    similar_book_ids = fields.Many2many(
+        "product.template",
+        compute="_compute_similar_book_ids",
+        string="Similar Books",
+    )
+
+    library_search = fields.Char(
+        "Search Everything",
+        compute="_compute_library_search",
+        search="_search_library_search",
+        help="Full-text search on the title, ISBN, authors, publisher, genres, "
+        "synopsis and reading notes of the books.",
+    )
+
+    def init(self):
+        super().init()
+        if not sql.column_exists(self.env.cr, self._table, "library_search_vector"):
+            sql.create_column(
+                self.env.cr, self._table, "library_search_vector", "tsvector"
+            )
+            self.search([("is_book", "=", True)])._update_library_search_vector()
+        create_index(
+            self.env.cr,
+            "product_template_library_search_vector_index",
+            self._table,
+            ["library_search_vector"],
+            method="gin",
+        )
+        if not sql.column_exists(
+            self.env.cr, self._table, "library_similarity_dirty"
+        ):
+            sql.create_column(
+                self.env.cr, self._table, "library_similarity_dirty", "boolean"
+            )
+            self.env.execute_query(
+                SQL(
+                    "UPDATE product_template SET library_similarity_dirty = true"
+                    " WHERE is_book AND active"
+                )
+            )
+        create_index(
+            self.env.cr,
+            "product_template_library_similarity_dirty_index",
+            self._table,
+            ["id"],
+            where="library_similarity_dirty",
+        )
+        if not self.env.execute_query(
+            SQL("SELECT 1 FROM library_book_location LIMIT 1")
+        ):
+            # Fill the book locations of an existing database
+            rows = self.env.execute_query(
+                SQL(
+                    """
+                    SELECT DISTINCT product.product_tmpl_id
+                      FROM stock_quant quant
+                      JOIN product_product product ON product.id = quant.product_id
+                    """
+                )
+            )
+            self.env["library.book.location"]._refresh(
+                tmpl_id for tmpl_id, in rows
+            )
+        # Sort key of the book kanban (default_order="location,sequence")
+        create_index(
+            self.env.cr,
+            "product_template_book_kanban_order_index",
+            self._table,
+            ["location", "sequence", "id"],
+            where="is_book",
+        )
+        # Keyset pagination of the catalogue API
+        create_index(
+            self.env.cr,
+            "product_template_book_sequence_id_index",
+            self._table,
+            ["sequence", "id"],
+            where="is_book",
+        )
 
     @api.depends("publication_date")
+    @profiled
     def _compute_publication_year(self):
         for book in self:
             if book.publication_date:
                 book.publication_year = book.publication_date.year
 
-    @api.depends(
-        "product_variant_ids.stock_quant_ids.location_id",
-        "product_variant_ids.stock_quant_ids.quantity",
-        "qty_available"
-    )
-    def _compute_location(self):
+    @api.depends("image_back_cover_1920")
+    def _compute_image_back_cover_1024(self):
+        self._compute_image_back_cover_derivative(1024)
+
+    @api.depends("image_back_cover_1920")
+    def _compute_image_back_cover_512(self):
+        self._compute_image_back_cover_derivative(512)
+
+    @api.depends("image_back_cover_1920")
+    def _compute_image_back_cover_256(self):
+        self._compute_image_back_cover_derivative(256)
+
+    @api.depends("image_back_cover_1920")
+    def _compute_image_back_cover_128(self):
+        self._compute_image_back_cover_derivative(128)
+
+    def _compute_image_back_cover_derivative(self, size):
+        field_name = f"image_back_cover_{size}"
+        stored = self.filtered(lambda book: book.id)
+        images = self.env["library.image.derivative"]._get_images(
+            stored, "image_back_cover_1920", size
+        )
+        for book in self:
+            if book.id in images:
+                book[field_name] = images[book.id]
+                continue
+            # Unsaved or pending image: resize it here
+            image = book.with_context(bin_size=False).image_back_cover_1920
+            book[field_name] = image and base64.b64encode(
+                image_process(base64.b64decode(image), size=(size, size))
+            )
+
+    @api.depends("image_1920")
+    def _compute_cover_thumbnail_url(self):
+        attachments = (
+            self.env["ir.attachment"]
+            .sudo()
+            .search_fetch(
+                [
+                    ("res_model", "=", self._name),
+                    ("res_field", "=", "image_256"),
+                    ("res_id", "in", self._origin.ids),
+                ],
+                ["res_id", "checksum"],
+            )
+        )
+        checksums = {
+            attachment.res_id: attachment.checksum for attachment in attachments
+        }
+        for book in self:
+            checksum = checksums.get(book._origin.id)
+            book.cover_thumbnail_url = (
+                checksum
+                and f"/web/image/{self._name}/{book._origin.id}/image_256"
+                f"?unique={checksum[:8]}"
+            )
+
+    @api.depends("name", "is_book")
+    def _compute_library_title_key(self):
+        for book in self:
+            book.library_title_key = book.is_book and titles.title_key(book.name)
+
+    def _compute_copy_availability(self):
+        counts = self.env["library.book.availability"]._get_counts(self._origin.ids)
+        for book in self:
+            book_counts = counts.get(book._origin.id, {})
+            book.available_copy_count = book_counts.get("available_count", 0)
+            book.on_loan_copy_count = book_counts.get("on_loan_count", 0)
+            book.waiting_reservation_count = book_counts.get("waiting_count", 0)
+
+    def _compute_similar_book_ids(self):
+        similarities = self.env["library.book.similarity"].sudo().search_fetch(
+            [("book_id", "in", self._origin.ids)], ["book_id", "similar_book_id"]
+        )
+        similar_ids = {}
+        for similarity in similarities:
+            similar_ids.setdefault(similarity.book_id.id, []).append(
+                similarity.similar_book_id.id
+            )
         for book in self:
-            # Filter quants to only include those in 'internal' locations
-            # with a positive quantity.
-            quants = book.product_variant_ids.mapped("stock_quant_ids")
-            quants_in_internal_locs = quants.filtered(
-                lambda q: q.location_id.usage == "internal" and q.quantity > 0
+            book.similar_book_ids = [(6, 0, similar_ids.get(book._origin.id, []))]
+
+    def _compute_shelf_quantity(self):
+        availability = self.env["library.book.locator"]._get_availability(
+            [book_id for book_id in self._origin.ids if book_id]
+        )
+        for book in self:
+            book.shelf_quantity = availability.get(book._origin.id, {}).get(
+                "quantity", 0.0
             )
-            # Get the unique display names of these locations
-            locations = quants_in_internal_locs.mapped(
-                "location_id.display_name"
+
+    @api.depends("isbn")
+    def _compute_isbn_normalized(self):
+        for book in self:
+            book.isbn_normalized = isbn_tools.normalize(book.isbn)
+
+    @api.depends("book_location_ids", "book_location_ids.location_id.complete_name")
+    @profiled
+    def _compute_location(self):
+        names_by_template = self._get_internal_location_names()
+        for book in self:
+            book.location = ", ".join(names_by_template.get(book._origin.id, []))
+
+    def _get_internal_location_names(self):
+        """Return the names of the internal locations holding stock, per book.
+
+        The ``library.book.location`` rows of all the books in the recordset
+        are read with a single query, and every location name is read once
+        for the whole batch.
+
+        :return: dict mapping template ids to the list of location names,
+            sorted by name
+        """
+        template_ids = [tmpl_id for tmpl_id in self._origin.ids if tmpl_id]
+        if not template_ids:
+            return {}
+        lines = self.env["library.book.location"].search_fetch(
+            [("product_tmpl_id", "in", template_ids)],
+            ["product_tmpl_id", "location_id"],
+        )
+        lines.location_id.fetch(["complete_name"])
+        names_by_template = {}
+        for line in lines:
+            names_by_template.setdefault(line.product_tmpl_id.id, []).append(
+                line.location_id.complete_name
             )
-            # Join the unique location names
-            book.location = ", ".join(list(set(locations)))
+        return {
+            tmpl_id: sorted(names) for tmpl_id, names in names_by_template.items()
+        }
 
     _sql_constraints = [
         (
@@ -148,35 +436,652 @@ class ProductTemplate(models.Model):
             "CHECK (publication_date <= current_date)",
             _("Publication date must not be in the future."),
         ),
-        ("isbn_uniq", "UNIQUE (isbn)", _("ISBN must be unique.")),
+        ("isbn_uniq", "UNIQUE (isbn_normalized)", _("ISBN must be unique.")),
     ]
 
+    @api.model_create_multi
+    def create(self, vals_list):
+        vals_list = [dict(vals) for vals in vals_list]
+        donors = [self._pop_shared_covers(vals) for vals in vals_list]
+        books = super().create(vals_list)
+        for book, book_donors in zip(books, donors, strict=True):
+            for field_name, donor_id in book_donors.items():
+                book._share_cover(field_name, donor_id)
+        books.filtered("is_book")._update_library_search_vector()
+        self.env["library.book.similarity"]._mark_dirty(books.filtered("is_book").ids)
+        books.genre_ids._update_book_stats()
+        (books.author_ids | books.publisher_id)._update_library_stats()
+        return books
+
+    def write(self, vals):
+        vals = dict(vals)
+        donors = self._pop_shared_covers(vals)
+        if SIMILARITY_FIELDS.intersection(vals):
+            books = self if "is_book" in vals else self.filtered("is_book")
+            self.env["library.book.similarity"]._mark_dirty(books.ids)
+        if self.env.context.get("library_defer_book_updates"):
+            # The caller updates the search documents and statistics itself,
+            # once for a whole batch of writes
+            res = super().write(vals)
+            for field_name, donor_id in donors.items():
+                self._share_cover(field_name, donor_id)
+            return res
+        genres = self.genre_ids if GENRE_STATS_FIELDS.intersection(vals) else None
+        partners = None
+        if PARTNER_STATS_FIELDS.intersection(vals):
+            partners = self.author_ids | self.publisher_id
+        res = super().write(vals)
+        for field_name, donor_id in donors.items():
+            self._share_cover(field_name, donor_id)
+        if SEARCH_DOCUMENT_FIELDS.intersection(vals) or "is_book" in vals:
+            self.filtered("is_book")._update_library_search_vector()
+        if genres is not None:
+            (genres | self.genre_ids)._update_book_stats()
+        if partners is not None:
+            (partners | self.author_ids | self.publisher_id)._update_library_stats()
+        return res
+
+    def unlink(self):
+        genres = self.genre_ids
+        partners = self.author_ids | self.publisher_id
+        self.env["library.book.similarity"]._mark_dirty(self.ids)
+        res = super().unlink()
+        genres.exists()._update_book_stats()
+        partners.exists()._update_library_stats()
+        return res
+
+    def _update_library_search_vector(self):
+        """Rebuild the full-text search document of the books in one query.
+
+        The title and ISBN weigh the most, then the authors, then the
+        publisher and genres, and finally the synopsis and reading notes,
+        whose HTML tags are stripped.
+        """
+        if not self.ids:
+            return
+        self.env.flush_all()
+        self.env.execute_query(
+            SQL(
+                """
+                UPDATE product_template pt
+                   SET library_search_vector =
+                       setweight(to_tsvector('simple', concat_ws(' ',
+                           (SELECT string_agg(value, ' ')
+                              FROM jsonb_each_text(pt.name)),
+                           pt.isbn,
+                           pt.isbn_normalized
+                       )), 'A')
+                       || setweight(to_tsvector('simple', coalesce((
+                           SELECT string_agg(rp.name, ' ')
+                             FROM res_partner_product_template_rel rel
+                             JOIN res_partner rp ON rp.id = rel.partner_id
+                            WHERE rel.book_id = pt.id
+                       ), '')), 'B')
+                       || setweight(to_tsvector('simple', concat_ws(' ',
+                           (SELECT name FROM res_partner WHERE id = pt.publisher_id),
+                           (SELECT string_agg(g.complete_name, ' ')
+                              FROM product_book_genre_product_template_rel rel
+                              JOIN product_book_genre g
+                                ON g.id = rel.product_book_genre_id
+                             WHERE rel.product_template_id = pt.id)
+                       )), 'C')
+                       || setweight(to_tsvector('simple', regexp_replace(
+                           concat_ws(' ', pt.synopsis, pt.reading_notes),
+                           '<[^>]*>|&[a-z]+;', ' ', 'g'
+                       )), 'D')
+                 WHERE pt.id IN %s
+                """,
+                tuple(self.ids),
+            )
+        )
+
+    @api.model
+    def _library_tsquery(self, text):
+        """Turn user input into a prefix tsquery matching all of its words."""
+        words = re.findall(r"\w+", text or "")
+        return " & ".join(f"{word}:*" for word in words)
+
+    def _compute_library_search(self):
+        self.library_search = False
+
+    def _search_library_search(self, operator, value):
+        tsquery = self._library_tsquery(value)
+        if not tsquery:
+            return []
+        query = self._search([("is_book", "=", True)])
+        query.add_where(
+            SQL(
+                "%s @@ to_tsquery('simple', %s)",
+                SQL.identifier(self._table, "library_search_vector"),
+                tsquery,
+            )
+        )
+        if operator in ("not ilike", "not like", "!=", "not in"):
+            return [("id", "not in", query)]
+        return [("id", "in", query)]
+
+    @api.model
+    def library_search_ranked(self, text, limit=20, offset=0):
+        """Return the books matching ``text``, the most relevant first.
+
+        :return: list of dicts with the ``id``, ``display_name`` and
+            ``rank`` of each book
+        """
+        tsquery = self._library_tsquery(text)
+        if not tsquery:
+            return []
+        query = self._search([("is_book", "=", True)])
+        rank = SQL(
+            "ts_rank_cd(%s, to_tsquery('simple', %s))",
+            SQL.identifier(self._table, "library_search_vector"),
+            tsquery,
+        )
+        query.add_where(
+            SQL(
+                "%s @@ to_tsquery('simple', %s)",
+                SQL.identifier(self._table, "library_search_vector"),
+                tsquery,
+            )
+        )
+        query.order = SQL("%s DESC, %s", rank, SQL.identifier(self._table, "id"))
+        query.limit = limit
+        query.offset = offset
+        rows = self.env.execute_query(
+            query.select(SQL.identifier(self._table, "id"), rank)
+        )
+        books = self.browse([book_id for book_id, __ in rows])
+        names = dict(zip(books.ids, books.mapped("display_name"), strict=True))
+        return [
+            {"id": book_id, "display_name": names[book_id], "rank": book_rank}
+            for book_id, book_rank in rows
+        ]
+
+    def web_resequence(self, specification, field_name="sequence", offset=0):
+        """Reorder books by moving as few of them as possible.
+
+        The list and kanban views send the records of the reordered range
+        in their new order; instead of writing all of them one by one,
+        only the moved books get a new sequence.
+        """
+        if field_name == "sequence" and self and all(self.mapped("is_book")):
+            self._library_resequence()
+            return self.web_read(specification)
+        return super().web_resequence(
+            specification, field_name=field_name, offset=offset
+        )
+
+    def _library_resequence(self):
+        """Give the books sequences following the order of the recordset.
+
+        The books already in order keep their sequence, and the moved ones
+        get sequences in the gaps between their new neighbours, usually a
+        single row update. When a gap is too narrow, the books and those
+        after them are renumbered in one statement instead.
+        """
+        self.check_access("write")
+        self.flush_model(["sequence", "is_book"])
+        current = dict(
+            self.env.execute_query(
+                SQL(
+                    "SELECT id, sequence FROM product_template WHERE id = ANY(%s)",
+                    self.ids,
+                )
+            )
+        )
+        keys = [(current[book_id] or 0, book_id) for book_id in self.ids]
+        stable = sequencing.stable_positions(keys)
+        if len(stable) == len(keys):
+            return
+        before, after = self._get_library_sequence_bounds(min(keys), max(keys))
+        sequences = {}
+        position = 0
+        while position < len(keys):
+            if position in stable:
+                position += 1
+                continue
+            end = position
+            while end < len(keys) and end not in stable:
+                end += 1
+            low = keys[position - 1][0] if position else before
+            high = keys[end][0] if end < len(keys) else after
+            values = sequencing.spread(low, high, end - position, SEQUENCE_GAP)
+            if values is None:
+                self._library_renumber()
+                return
+            sequences.update(zip(self.ids[position:end], values, strict=True))
+            position = end
+        self.env.execute_query(
+            SQL(
+                """
+                UPDATE product_template book SET sequence = moved.sequence
+                  FROM (VALUES %s) AS moved(id, sequence)
+                 WHERE book.id = moved.id
+                """,
+                SQL(", ").join(
+                    SQL("(%s, %s)", book_id, sequence)
+                    for book_id, sequence in sequences.items()
+                ),
+            )
+        )
+        self.browse(sequences).invalidate_recordset(["sequence"])
+
+    def _get_library_sequence_bounds(self, first_key, last_key):
+        """Return the sequences of the books right before and after a range.
+
+        :param first_key: ``(sequence, id)`` of the first book of the range
+        :param last_key: ``(sequence, id)`` of the last book of the range
+        :return: tuple of two sequences, ``None`` at the ends of the list
+        """
+        bounds = []
+        for operator, key, order in (
+            ("<", first_key, "DESC"),
+            (">", last_key, "ASC"),
+        ):
+            rows = self.env.execute_query(
+                SQL(
+                    """
+                    SELECT sequence FROM product_template
+                     WHERE is_book AND (sequence, id) %s (%s, %s)
+                       AND id != ALL(%s)
+                  ORDER BY sequence %s, id %s
+                     LIMIT 1
+                    """,
+                    SQL(operator),
+                    *key,
+                    self.ids,
+                    SQL(order),
+                    SQL(order),
+                )
+            )
+            bounds.append(rows[0][0] if rows else None)
+        return tuple(bounds)
+
+    def _library_renumber(self):
+        """Renumber the books in the order of the recordset, in one statement.
+
+        The books are placed from the position of the first of them, every
+        ``SEQUENCE_GAP``, and the books after that position follow them in
+        their current order.
+        """
+        self.check_access("write")
+        self.flush_model(["sequence", "is_book"])
+        rows = self.env.execute_query(
+            SQL(
+                """
+                SELECT sequence, id FROM product_template
+                 WHERE id = ANY(%s)
+              ORDER BY sequence, id
+                 LIMIT 1
+                """,
+                self.ids,
+            )
+        )
+        if not rows:
+            return
+        first_key = rows[0]
+        before = self._get_library_sequence_bounds(first_key, first_key)[0]
+        start = before + SEQUENCE_GAP if before is not None else first_key[0]
+        self.env.execute_query(
+            SQL(
+                """
+                WITH ordered AS (
+                    SELECT id, position
+                      FROM unnest(%(ids)s::int[]) WITH ORDINALITY AS o(id, position)
+                     UNION ALL
+                    SELECT id, %(count)s + row_number() OVER (ORDER BY sequence, id)
+                      FROM product_template
+                     WHERE is_book AND (sequence, id) > (%(sequence)s, %(id)s)
+                       AND id != ALL(%(ids)s)
+                )
+                UPDATE product_template book
+                   SET sequence = %(start)s + (ordered.position - 1) * %(gap)s
+                  FROM ordered
+                 WHERE book.id = ordered.id
+                   AND book.sequence IS DISTINCT FROM
+                       %(start)s + (ordered.position - 1) * %(gap)s
+                """,
+                ids=self.ids,
+                count=len(self),
+                sequence=first_key[0],
+                id=first_key[1],
+                start=start,
+                gap=SEQUENCE_GAP,
+            )
+        )
+        self.invalidate_model(["sequence"])
+
+    def _get_library_catalogue_page(self, after=None, limit=100, domain=None):
+        """Return the next page of books in ``(sequence, id)`` order.
+
+        Pages are selected with a row comparison on the indexed sort key
+        instead of an offset, so every page costs the same however deep it
+        is.
+
+        :param after: ``(sequence, id)`` of the last book of the previous
+            page, ``None`` for the first page
+        :return: tuple ``(books, next key)``, the key being ``None`` on the
+            last page
+        """
+        query = self._search(
+            [("is_book", "=", True)] + (domain or []),
+            order="sequence, id",
+            limit=limit,
+        )
+        if after:
+            query.add_where(
+                SQL(
+                    "(%s, %s) > (%s, %s)",
+                    SQL.identifier(self._table, "sequence"),
+                    SQL.identifier(self._table, "id"),
+                    *after,
+                )
+            )
+        rows = self.env.execute_query(
+            query.select(
+                SQL.identifier(self._table, "id"),
+                SQL.identifier(self._table, "sequence"),
+            )
+        )
+        books = self.browse([book_id for book_id, __ in rows])
+        next_key = rows[-1][::-1] if len(rows) == limit else None
+        return books, next_key
+
+    def _get_library_catalogue_version(self):
+        """Return a fingerprint of the catalogue data of the books.
+
+        It is read with one query on the write dates of the books and of
+        the records shown with them, the stock rows and the similar book
+        rows, so that an unchanged page can be recognized without building
+        it. Genres are renamed in bulk, so any genre change counts.
+        """
+        self.flush_model()
+        self.env["res.partner"].flush_model(["write_date"])
+        self.env["product.book.genre"].flush_model(["write_date"])
+        self.env["library.book.location"].flush_model(["quantity"])
+        rows = self.env.execute_query(
+            SQL(
+                """
+                WITH shown AS (
+                    SELECT id FROM product_template WHERE id = ANY(%(ids)s)
+                     UNION
+                    SELECT similar_book_id FROM library_book_similarity
+                     WHERE book_id = ANY(%(ids)s)
+                )
+                SELECT (SELECT max(book.write_date)
+                          FROM product_template book JOIN shown USING (id)),
+                       (SELECT max(partner.write_date) FROM res_partner partner
+                         WHERE partner.id IN (
+                                SELECT partner_id FROM res_partner_product_template_rel
+                                 WHERE book_id = ANY(%(ids)s)
+                                 UNION
+                                SELECT publisher_id FROM product_template
+                                 WHERE id = ANY(%(ids)s)
+                               )),
+                       (SELECT max(write_date) FROM product_book_genre),
+                       (SELECT array_agg(similar_book_id ORDER BY id)
+                          FROM library_book_similarity
+                         WHERE book_id = ANY(%(ids)s)),
+                       (SELECT array_agg(quantity ORDER BY id)
+                          FROM library_book_location
+                         WHERE product_tmpl_id = ANY(%(ids)s))
+                """,
+                ids=self.ids,
+            )
+        )
+        return repr((self.ids, rows[0]))
+
+    def _get_library_catalogue_data(self):
+        """Return the public catalogue data of the books as JSON-ready dicts."""
+        availability = self.env["library.book.locator"]._get_availability(self.ids)
+        self.similar_book_ids.fetch(["name"])
+        self.fetch(
+            [
+                "name",
+                "isbn_normalized",
+                "author_ids",
+                "publisher_id",
+                "genre_ids",
+                "location",
+                "publication_year",
+                "number_of_pages",
+                "language",
+                "edition",
+                "binding",
+                "sequence",
+            ]
+        )
+        return [
+            {
+                "id": book.id,
+                "name": book.name,
+                "isbn": book.isbn_normalized or None,
+                "authors": book.author_ids.mapped("name"),
+                "publisher": book.publisher_id.name or None,
+                "genres": book.genre_ids.mapped("complete_name"),
+                "location": book.location or None,
+                "publication_year": book.publication_year or None,
+                "number_of_pages": book.number_of_pages or None,
+                "language": book.language.iso_code or None,
+                "edition": book.edition or None,
+                "binding": book.binding or None,
+                "thumbnail_url": book.cover_thumbnail_url or None,
+                "available_quantity": availability[book.id]["quantity"],
+                "similar_books": [
+                    {"id": similar.id, "name": similar.name}
+                    for similar in book.similar_book_ids
+                ],
+            }
+            for book in self
+        ]
+
+    def _pop_shared_covers(self, vals):
+        """Remove from ``vals`` the covers already stored for another book.
+
+        :return: dict mapping the removed cover fields to the id of a book
+            already holding the same image
+        """
+        donors = {}
+        Attachment = self.env["ir.attachment"].sudo()
+        for field_name in COVER_FIELDS:
+            if not vals.get(field_name):
+                continue
+            checksum = Attachment._compute_checksum(base64.b64decode(vals[field_name]))
+            donor = Attachment.search_fetch(
+                [
+                    ("res_model", "=", self._name),
+                    ("res_field", "=", field_name),
+                    ("res_id", "not in", self.ids),
+                    ("checksum", "=", checksum),
+                ],
+                ["res_id"],
+                limit=1,
+            )
+            if donor:
+                donors[field_name] = donor.res_id
+                del vals[field_name]
+        return donors
+
+    def _share_cover(self, field_name, donor_id):
+        """Point the cover ``field_name`` of the books to the donor's files.
+
+        The attachments of the donor (the original and its stored resized
+        versions) are duplicated without reading, resizing or writing any
+        image: the new attachments reference the same stored blobs. The
+        filestore already stores identical content once, so the gain is the
+        resizing skipped at write time, not storage.
+        """
+        Attachment = self.env["ir.attachment"].sudo()
+        field_names = COVER_FIELDS[field_name]
+        domain = [("res_model", "=", self._name), ("res_field", "in", field_names)]
+        Attachment.search(domain + [("res_id", "in", self.ids)]).unlink()
+        sources = Attachment.search_fetch(
+            domain + [("res_id", "=", donor_id)],
+            [
+                "name",
+                "res_field",
+                "store_fname",
+                "db_datas",
+                "checksum",
+                "file_size",
+                "mimetype",
+            ],
+        )
+        Attachment.create(
+            [
+                {
+                    "name": source.name,
+                    "res_model": self._name,
+                    "res_field": source.res_field,
+                    "res_id": book.id,
+                    "store_fname": source.store_fname,
+                    "db_datas": source.db_datas,
+                    "checksum": source.checksum,
+                    "file_size": source.file_size,
+                    "mimetype": source.mimetype,
+                }
+                for book in self
+                for source in sources
+            ]
+        )
+        self.invalidate_recordset(field_names)
+        self.modified([field_name])
+        # The resized versions were shared too, there is nothing to recompute
+        for name in field_names[1:]:
+            self.env.remove_to_compute(self._fields[name], self)
+
     @api.constrains("isbn")
+    @profiled
     def _constrain_isbn_valid(self):
-        for book in self:
-            if book.isbn and not book.check_isbn():
-                raise ValidationError(
-                    _("ISBN {} is invalid").format(book.isbn),
-                )
+        invalid = isbn_tools.invalid_isbns(self.mapped("isbn"))
+        if invalid:
+            raise ValidationError(
+                _("ISBN {} is invalid").format(", ".join(invalid)),
+            )
 
     def check_isbn(self):
         self.ensure_one()
-        digits = [int(x) for x in self.isbn if x.isdigit()]
-        if len(digits) == 13:
-            ponderations = [1, 3] * 6
-            terms = [
-                a * b
-                for a, b in zip(
-                    digits[:12],
-                    ponderations,
-                    strict=False,
-                )
+        return isbn_tools.is_valid(self.isbn)
+
+    @api.model
+    def _get_books_by_isbn(self, isbns):
+        """Look books up by ISBN with one query on the normalized column.
+
+        :param isbns: ISBNs in any accepted spelling (ISBN-10, ISBN-13,
+            with or without separators)
+        :return: dict mapping each normalized ISBN found to its book
+        """
+        normalized = {isbn_tools.normalize(isbn) for isbn in isbns} - {False}
+        if not normalized:
+            return {}
+        books = self.search([("isbn_normalized", "in", list(normalized))])
+        return {book.isbn_normalized: book for book in books}
+
+    @api.model
+    def library_scan_isbns(self, isbns, location_id, mode="add", complete=False):
+        """Apply a burst of ISBN scans to the stock of a location.
+
+        All the ISBNs are resolved with one lookup on the normalized ISBN,
+        and the resulting quantities are applied as a single inventory
+        adjustment, so the book locations are recomputed once.
+
+        :param isbns: scanned ISBNs, a book scanned ``n`` times counting as
+            ``n`` copies
+        :param location_id: id of the scanned ``stock.location``
+        :param mode: ``add`` to add the scanned copies to the quantity of
+            the location (shelving), ``set`` to replace it (stock-taking)
+        :param complete: in ``set`` mode, also set to zero the books of the
+            location that were not scanned
+        :return: dict with the ``books`` counted (``id``, ``name``,
+            ``isbn``, ``quantity``) and the ``invalid``, ``unknown`` and
+            ``not_storable`` ISBNs
+        """
+        # Applying an inventory adjustment is reserved to stock managers
+        if not self.env.user.has_group("stock.group_stock_manager"):
+            raise AccessError(_("Only stock managers can apply scanned books."))
+        if mode not in ("add", "set"):
+            raise ValidationError(_("Unknown scan mode %s", mode))
+        location = self.env["stock.location"].browse(location_id).exists()
+        if not location:
+            raise ValidationError(_("The scanned location does not exist."))
+        isbns = [isbn.strip() for isbn in isbns if isbn and isbn.strip()]
+        invalid = isbn_tools.invalid_isbns(isbns)
+        invalid_set = set(invalid)
+        books_by_isbn = self._get_books_by_isbn(set(isbns) - invalid_set)
+        counts = Counter()
+        unknown = []
+        not_storable = []
+        for isbn in isbns:
+            if isbn in invalid_set:
+                continue
+            book = books_by_isbn.get(isbn_tools.normalize(isbn))
+            if not book:
+                unknown.append(isbn)
+            elif not book.is_storable:
+                not_storable.append(isbn)
+            else:
+                counts[book] += 1
+        self._apply_scanned_quantities(counts, location, mode, complete)
+        return {
+            "books": [
+                {
+                    "id": book.id,
+                    "name": book.name,
+                    "isbn": book.isbn_normalized,
+                    "quantity": quantity,
+                }
+                for book, quantity in counts.items()
+            ],
+            "invalid": list(dict.fromkeys(invalid)),
+            "unknown": list(dict.fromkeys(unknown)),
+            "not_storable": list(dict.fromkeys(not_storable)),
+        }
+
+    @api.model
+    def _apply_scanned_quantities(self, counts, location, mode, complete=False):
+        """Apply the scanned copies per book as one inventory adjustment."""
+        Quant = self.env["stock.quant"].with_context(inventory_mode=True)
+        counted = {
+            book.product_variant_id: quantity for book, quantity in counts.items()
+        }
+        domain = [("location_id", "=", location.id)]
+        if mode == "set" and complete:
+            domain.append(("product_id.product_tmpl_id.is_book", "=", True))
+        else:
+            domain.append(("product_id", "in", [product.id for product in counted]))
+        targets = {}
+        for quant in Quant.search(domain, order="id"):
+            if quant.product_id in counted:
+                quantity = counted.pop(quant.product_id)
+                if mode == "add":
+                    quantity += quant.quantity
+                targets.setdefault(quantity, Quant.browse())
+                targets[quantity] |= quant
+            elif mode == "set":
+                # Other quants of a scanned book, or a book not scanned
+                targets.setdefault(0, Quant.browse())
+                targets[0] |= quant
+        quants = Quant.browse()
+        for quantity, group in targets.items():
+            group.write(
+                {"inventory_quantity": quantity, "inventory_quantity_set": True}
+            )
+            quants |= group
+        quants |= Quant.create(
+            [
+                {
+                    "product_id": product.id,
+                    "location_id": location.id,
+                    "inventory_quantity": quantity,
+                }
+                for product, quantity in counted.items()
             ]
-            remain = sum(terms) % 10
-            check = 10 - remain if remain != 0 else 0
-            return digits[-1] == check
-        return False
+        )
+        if quants:
+            quants._apply_inventory()
+            # Show the shelved books at their new location right away
+            self.env["library.book.location"]._flush_pending()
 
+    @profiled
     def button_check_isbn(self):
         result = False
         for book in self:
@@ -184,10 +1089,11 @@ class ProductTemplate(models.Model):
                 raise ValidationError(
                     _("Provide an ISBN for {} ").format(book.name),
                 )
-            if book.isbn and not book.check_isbn():
-                raise ValidationError(
-                    _("{} ISBN is invalid").format(book.isbn),
-                )
+        invalid = isbn_tools.invalid_isbns(self.mapped("isbn"))
+        if invalid:
+            raise ValidationError(
+                _("{} ISBN is invalid").format(", ".join(invalid)),
+            )
         result = {
             "type": "ir.actions.client",
             "tag": "display_notification",
@@ -230,8 +1136,10 @@ class ProductBookGenre(models.Model):
     _order = "complete_name"
 
     name = fields.Char(index=True, required=True)
+    # Descendants are not recomputed through the ORM when a genre is renamed
+    # or moved: write() rebuilds the whole subtree in a single query instead.
     complete_name = fields.Char(
-        compute="_compute_complete_name", recursive=True, store=True
+        compute="_compute_complete_name", store=True, index=True
     )
     parent_id = fields.Many2one(
         _name, "Parent Category", index=True, ondelete="cascade"
@@ -241,8 +1149,169 @@ class ProductBookGenre(models.Model):
     child_ids = fields.One2many(_name, "parent_id", "Child Categories")
     notes = fields.Text()
     color = fields.Integer()
+    # Statistics of the books in the genre and its subgenres, maintained by
+    # _update_book_stats() whenever the books or the tree change.
+    book_count = fields.Integer("Books in Genre", readonly=True)
+    subtree_book_count = fields.Integer("Books", readonly=True)
+    subtree_copies = fields.Integer("Copies", readonly=True)
+    subtree_rating_avg = fields.Float(
+        "Average Rating", digits=(3, 1), readonly=True
+    )
+
+    def init(self):
+        super().init()
+        self.search([])._update_book_stats()
+        self.env["library.autocomplete"]._init_indexes(["genre"])
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        genres = super().create(vals_list)
+        genres._update_book_stats()
+        self.env["library.autocomplete"]._invalidate(["genre"])
+        return genres
+
+    def write(self, vals):
+        moved = None
+        if "parent_id" in vals:
+            moved = self.search([("id", "parent_of", self.ids)])
+        res = super().write(vals)
+        if "name" in vals or "parent_id" in vals:
+            self._update_subtree_complete_name()
+            self.env["library.autocomplete"]._invalidate(["genre"])
+            genres = self.search([("id", "child_of", self.ids)])
+            genres.book_ids.filtered("is_book")._update_library_search_vector()
+        if moved is not None or "book_ids" in vals:
+            (self | (moved or self.browse()))._update_book_stats()
+        return res
+
+    def unlink(self):
+        ancestors = self.search([("id", "parent_of", self.ids)]) - self
+        res = super().unlink()
+        ancestors.exists()._update_book_stats()
+        self.env["library.autocomplete"]._invalidate(["genre"])
+        return res
+
+    @api.model
+    def _name_search(self, name, domain=None, operator="ilike", limit=100, order=None):
+        if (
+            self.env.context.get("library_autocomplete") == "genre"
+            and name
+            and operator == "ilike"
+            and limit
+        ):
+            return self.env["library.autocomplete"]._name_search_ids(
+                "genre", name, domain, limit
+            )
+        return super()._name_search(
+            name, domain=domain, operator=operator, limit=limit, order=order
+        )
+
+    def _update_book_stats(self):
+        """Recompute the book statistics of the genres and their ancestors.
+
+        Direct and subtree counts, copies and average rating are computed
+        for all of them in one UPDATE, using ``parent_path`` prefixes to
+        collect the books of each subtree. Books are counted once per
+        subtree even when they belong to several of its genres, and unrated
+        books are left out of the average.
+        """
+        genre_ids = {
+            int(genre_id)
+            for path in self.exists().mapped("parent_path")
+            for genre_id in (path or "").split("/")
+            if genre_id
+        }
+        if not genre_ids:
+            return
+        self.env["product.template"].flush_model(GENRE_STATS_FIELDS)
+        self.flush_model(["parent_path"])
+        self.env.execute_query(
+            SQL(
+                """
+                WITH subtree AS (
+                    SELECT ancestor.id AS genre_id,
+                           rel.product_template_id AS book_id,
+                           bool_or(genre.id = ancestor.id) AS direct
+                      FROM product_book_genre ancestor
+                      JOIN product_book_genre genre
+                        ON starts_with(genre.parent_path, ancestor.parent_path)
+                      JOIN product_book_genre_product_template_rel rel
+                        ON rel.product_book_genre_id = genre.id
+                     WHERE ancestor.id IN %(ids)s
+                  GROUP BY ancestor.id, rel.product_template_id
+                ), stats AS (
+                    SELECT subtree.genre_id,
+                           count(*) FILTER (WHERE subtree.direct) AS book_count,
+                           count(*) AS subtree_book_count,
+                           sum(book.copies) AS subtree_copies,
+                           avg(book.rating::int) FILTER (WHERE book.rating != '0')
+                               AS subtree_rating_avg
+                      FROM subtree
+                      JOIN product_template book
+                        ON book.id = subtree.book_id
+                       AND book.is_book AND book.active
+                  GROUP BY subtree.genre_id
+                )
+                UPDATE product_book_genre genre
+                   SET book_count = coalesce(stats.book_count, 0),
+                       subtree_book_count = coalesce(stats.subtree_book_count, 0),
+                       subtree_copies = coalesce(stats.subtree_copies, 0),
+                       subtree_rating_avg = coalesce(stats.subtree_rating_avg, 0)
+                  FROM product_book_genre target
+             LEFT JOIN stats ON stats.genre_id = target.id
+                 WHERE genre.id = target.id AND target.id IN %(ids)s
+                """,
+                ids=tuple(genre_ids),
+            )
+        )
+        self.browse(genre_ids).invalidate_recordset(
+            ["book_count", "subtree_book_count", "subtree_copies", "subtree_rating_avg"]
+        )
+
+    def action_view_books(self):
+        """Open the books of the genre and its subgenres, loaded page by page."""
+        self.ensure_one()
+        action = self.env["ir.actions.act_window"]._for_xml_id(
+            "jag_library.action_product_books_kanban"
+        )
+        action["domain"] = [("is_book", "=", True), ("genre_ids", "child_of", self.id)]
+        action["display_name"] = self.complete_name
+        return action
+
+    def _update_subtree_complete_name(self):
+        """Rebuild ``complete_name`` for the genres and all their descendants.
+
+        The names of the ancestors listed in ``parent_path`` are joined in a
+        single UPDATE for the whole subtree, and the ORM cache is then
+        invalidated for the updated genres.
+        """
+        self.flush_model(["name", "parent_id", "parent_path", "complete_name"])
+        prefixes = [f"{path}%" for path in self.mapped("parent_path") if path]
+        if not prefixes:
+            return
+        rows = self.env.execute_query(
+            SQL(
+                """
+                UPDATE product_book_genre genre
+                   SET complete_name = (
+                        SELECT string_agg(ancestor.name, ' / ' ORDER BY path.depth)
+                          FROM unnest(string_to_array(
+                                rtrim(genre.parent_path, '/'), '/'
+                               )::int[]) WITH ORDINALITY AS path(id, depth)
+                          JOIN product_book_genre ancestor ON ancestor.id = path.id
+                       )
+                 WHERE genre.parent_path LIKE ANY(%s)
+             RETURNING genre.id
+                """,
+                prefixes,
+            )
+        )
+        genres = self.browse(genre_id for (genre_id,) in rows)
+        genres.invalidate_recordset(["complete_name"])
+        genres.modified(["complete_name"])
 
-    @api.depends("name", "parent_id.complete_name")
+    @api.depends("name", "parent_id")
+    @profiled
     def _compute_complete_name(self):
         for category in self:
             if category.parent_id:
@@ -2,6 +2,18 @@
 # License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
 
 from odoo import api, fields, models
+from odoo.tools import SQL
+
+from .product_template import PARTNER_STATS_FIELDS
+
+# Fields of the partners shown in the author and publisher suggestions
+AUTOCOMPLETE_FIELDS = {"name", "is_author", "is_publisher", "active", "company_id"}
+LIBRARY_STATS_FIELDS = [
+    "library_book_count",
+    "library_copy_count",
+    "library_rating_avg",
+    "library_last_publication_year",
+]
 
 
 class ResPartner(models.Model):
@@ -25,6 +37,117 @@ class ResPartner(models.Model):
         string="Published Books",
     )
 
+    # Statistics of the books written or published by the partner,
+    # maintained by _update_library_stats() whenever the books change.
+    library_book_count = fields.Integer("Books", readonly=True)
+    library_copy_count = fields.Integer("Copies", readonly=True)
+    library_rating_avg = fields.Float("Average Rating", digits=(3, 1), readonly=True)
+    library_last_publication_year = fields.Integer("Latest Publication", readonly=True)
+
+    def init(self):
+        super().init()
+        partner_ids = [partner_id for (partner_id,) in self.env.execute_query(SQL("""
+                    SELECT partner_id FROM res_partner_product_template_rel
+                     UNION
+                    SELECT publisher_id FROM product_template
+                     WHERE publisher_id IS NOT NULL
+                    """))]
+        self.browse(partner_ids)._update_library_stats()
+        self.env["library.autocomplete"]._init_indexes(["author", "publisher"])
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        partners = super().create(vals_list)
+        partners._invalidate_library_autocomplete()
+        return partners
+
+    def write(self, vals):
+        if AUTOCOMPLETE_FIELDS.intersection(vals):
+            # Partners leaving the suggestions
+            self._invalidate_library_autocomplete()
+        res = super().write(vals)
+        if "name" in vals:
+            books = self.authored_book_ids | self.published_book_ids
+            books.filtered("is_book")._update_library_search_vector()
+        if AUTOCOMPLETE_FIELDS.intersection(vals):
+            self._invalidate_library_autocomplete()
+        return res
+
+    def unlink(self):
+        self._invalidate_library_autocomplete()
+        return super().unlink()
+
+    def _invalidate_library_autocomplete(self):
+        partners = self.sudo().with_context(active_test=False)
+        kinds = [
+            kind
+            for kind, flag in (("author", "is_author"), ("publisher", "is_publisher"))
+            if any(partners.mapped(flag))
+        ]
+        if kinds:
+            self.env["library.autocomplete"]._invalidate(kinds)
+
+    @api.model
+    def _name_search(self, name, domain=None, operator="ilike", limit=100, order=None):
+        kind = self.env.context.get("library_autocomplete")
+        if kind in ("author", "publisher") and name and operator == "ilike" and limit:
+            return self.env["library.autocomplete"]._name_search_ids(
+                kind, name, domain, limit
+            )
+        return super()._name_search(
+            name, domain=domain, operator=operator, limit=limit, order=order
+        )
+
+    def _update_library_stats(self):
+        """Recompute the book statistics of the partners in one UPDATE.
+
+        A book counts once per partner, whether the partner wrote it,
+        published it or both. Archived books are left out, and so are
+        unrated books from the average rating.
+        """
+        if not self.ids:
+            return
+        self.env["product.template"].flush_model(
+            PARTNER_STATS_FIELDS | {"publication_year"}
+        )
+        self.env.execute_query(
+            SQL(
+                """
+                WITH link AS (
+                    SELECT partner_id, book_id
+                      FROM res_partner_product_template_rel
+                     WHERE partner_id IN %(ids)s
+                     UNION
+                    SELECT publisher_id, id
+                      FROM product_template
+                     WHERE publisher_id IN %(ids)s
+                ), stats AS (
+                    SELECT link.partner_id,
+                           count(*) AS book_count,
+                           sum(book.copies) AS copy_count,
+                           avg(book.rating::int) FILTER (WHERE book.rating != '0')
+                               AS rating_avg,
+                           max(book.publication_year) AS last_publication_year
+                      FROM link
+                      JOIN product_template book
+                        ON book.id = link.book_id AND book.is_book AND book.active
+                  GROUP BY link.partner_id
+                )
+                UPDATE res_partner partner
+                   SET library_book_count = coalesce(stats.book_count, 0),
+                       library_copy_count = coalesce(stats.copy_count, 0),
+                       library_rating_avg = coalesce(stats.rating_avg, 0),
+                       library_last_publication_year =
+                           coalesce(stats.last_publication_year, 0)
+                  FROM res_partner target
+             LEFT JOIN stats ON stats.partner_id = target.id
+                 WHERE partner.id = target.id AND target.id IN %(ids)s
+                """,
+                ids=tuple(self.ids),
+            )
+        )
+        self.invalidate_recordset(LIBRARY_STATS_FIELDS)
+
     @api.onchange("company_type")
     def _onchange_company_type_set_partner_type(self):
         if self.company_type == "person":
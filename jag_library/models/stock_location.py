@@ -0,0 +1,33 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo import models
+from odoo.tools import SQL
+
+
+class StockLocation(models.Model):
+    _inherit = "stock.location"
+
+    def write(self, vals):
+        res = super().write(vals)
+        if "usage" in vals:
+            # The stock of the books may enter or leave the internal locations
+            self._mark_library_books_for_refresh()
+        return res
+
+    def _mark_library_books_for_refresh(self):
+        self.env["stock.quant"].flush_model(["product_id", "location_id"])
+        rows = self.env.execute_query(
+            SQL(
+                """
+                SELECT DISTINCT product.product_tmpl_id
+                  FROM stock_quant quant
+                  JOIN product_product product ON product.id = quant.product_id
+                 WHERE quant.location_id = ANY(%s)
+                """,
+                self.ids,
+            )
+        )
+        self.env["library.book.location"]._mark_for_refresh(
+            [template_id for (template_id,) in rows]
+        )
@@ -0,0 +1,37 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo import api, models
+
+LOCATOR_FIELDS = {"product_id", "location_id", "quantity"}
+
+
+class StockQuant(models.Model):
+    _inherit = "stock.quant"
+
+    def _get_library_template_ids(self):
+        return self.sudo().product_id.product_tmpl_id.ids
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        quants = super().create(vals_list)
+        self.env["library.book.location"]._mark_for_refresh(
+            quants._get_library_template_ids()
+        )
+        return quants
+
+    def write(self, vals):
+        if not LOCATOR_FIELDS.intersection(vals):
+            return super().write(vals)
+        # The books before the change, in case the product changes
+        template_ids = set(self._get_library_template_ids())
+        res = super().write(vals)
+        template_ids.update(self._get_library_template_ids())
+        self.env["library.book.location"]._mark_for_refresh(template_ids)
+        return res
+
+    def unlink(self):
+        template_ids = self._get_library_template_ids()
+        res = super().unlink()
+        self.env["library.book.location"]._mark_for_refresh(template_ids)
+        return res
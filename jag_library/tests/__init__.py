@@ -1 +1,19 @@
 from . import test_book
+from . import test_isbn
+from . import test_import
+from . import test_images
+from . import test_genre
+from . import test_benchmark
+from . import test_profiling
+from . import test_catalogue_api
+from . import test_scan
+from . import test_dedup
+from . import test_partner_stats
+from . import test_dashboard
+from . import test_export
+from . import test_circulation
+from . import test_locator
+from . import test_enrich
+from . import test_autocomplete
+from . import test_similarity
+from . import test_resequence
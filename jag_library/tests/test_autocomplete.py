@@ -0,0 +1,69 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo.tests.common import TransactionCase
+
+
+class TestAutocomplete(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        Partner = self.env["res.partner"]
+        self.gabo = Partner.create(
+            {"name": "Gabriel García Márquez", "is_author": True}
+        )
+        self.gaiman = Partner.create({"name": "Neil Gaiman", "is_author": True})
+        self.contact = Partner.create({"name": "Gabriel Contact"})
+        self.publisher = Partner.create(
+            {"name": "Gabriel Ediciones", "is_publisher": True, "is_company": True}
+        )
+        self.Author = Partner.with_context(library_autocomplete="author")
+        fantasy = self.env["product.book.genre"].create({"name": "Fantasía"})
+        self.epic = self.env["product.book.genre"].create(
+            {"name": "Epic", "parent_id": fantasy.id}
+        )
+        self.Genre = self.env["product.book.genre"].with_context(
+            library_autocomplete="genre"
+        )
+
+    def _ids(self, Model, name, domain=None):
+        return [record_id for record_id, __ in Model.name_search(name, domain)]
+
+    def test_authors(self):
+        "Only authors are suggested, and the widget domain still applies"
+        domain = [("is_author", "=", True)]
+        self.assertEqual(self._ids(self.Author, "gab", domain), self.gabo.ids)
+        self.assertEqual(
+            self._ids(self.Author, "GAB", domain + [("id", "!=", self.gabo.id)]), []
+        )
+        # Too short to look inside the names
+        self.assertEqual(self._ids(self.Author, "ga", domain), self.gabo.ids)
+        if self.env.registry.has_trigram:
+            self.assertEqual(self._ids(self.Author, "gai", domain), [self.gaiman.id])
+
+    def test_accents(self):
+        if not self.env.registry.has_unaccent:
+            self.skipTest("The unaccent extension is not installed")
+        self.assertEqual(self._ids(self.Author, "gabriel garcia"), self.gabo.ids)
+
+    def test_invalidation(self):
+        "Changes to the authors drop the cached suggestions"
+        self.assertEqual(self._ids(self.Author, "neil"), self.gaiman.ids)
+        self.gaiman.name = "Terry Pratchett"
+        self.assertEqual(self._ids(self.Author, "neil"), [])
+        self.contact.is_author = True
+        self.assertEqual(self._ids(self.Author, "gabriel c"), self.contact.ids)
+
+    def test_cache(self):
+        self._ids(self.Author, "gabriel")
+        with self.assertQueryCount(1):
+            self._ids(self.Author, "gabriel")
+
+    def test_genres(self):
+        "Genres are suggested on their complete name"
+        self.assertEqual(
+            self._ids(self.Genre, "fantas"), (self.epic.parent_id | self.epic).ids
+        )
+        if self.env.registry.has_trigram:
+            self.assertEqual(self._ids(self.Genre, "epic"), self.epic.ids)
+        self.epic.name = "Heroic"
+        self.assertEqual(self._ids(self.Genre, "epic"), [])
@@ -0,0 +1,228 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+"""Performance benchmarks of the library models.
+
+These tests are not run with the standard test suite. Run them with::
+
+    odoo-bin -d <db> -i jag_library --test-tags /jag_library:LibraryBenchmark
+
+``JAG_LIBRARY_BENCHMARK_SIZES`` sets the catalogue sizes (comma separated,
+``1000,10000,100000`` by default) and ``JAG_LIBRARY_BENCHMARK_REPORT`` the
+path of the JSON report. When ``JAG_LIBRARY_BENCHMARK_BASELINE`` points to
+a previous report, the differences with it are logged.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from odoo import fields, release
+from odoo.tests.common import TransactionCase, tagged
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = "1000,10000,100000"
+BATCH_SIZE = 1000
+
+
+@tagged("-standard", "-at_install", "post_install", "jag_library_benchmark")
+class LibraryBenchmark(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.sizes = [
+            int(size)
+            for size in os.environ.get(
+                "JAG_LIBRARY_BENCHMARK_SIZES", DEFAULT_SIZES
+            ).split(",")
+        ]
+        cls.report_path = os.environ.get(
+            "JAG_LIBRARY_BENCHMARK_REPORT",
+            os.path.join(tempfile.gettempdir(), "jag_library_benchmark.json"),
+        )
+        cls.stock_location = cls.env.ref("stock.stock_location_stock")
+
+    @contextmanager
+    def measure(self, results, name):
+        """Record the query count, wall time and peak memory of a block."""
+        self.env.flush_all()
+        self.env.invalidate_all()
+        queries = self.env.cr.sql_log_count
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            yield
+            self.env.flush_all()
+        finally:
+            elapsed = time.perf_counter() - start
+            __, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[name] = {
+                "queries": self.env.cr.sql_log_count - queries,
+                "seconds": round(elapsed, 4),
+                "peak_kib": round(peak / 1024, 1),
+            }
+            _logger.info("Benchmark %s: %s", name, results[name])
+
+    def _create_catalogue(self, size):
+        """Create ``size`` books with authors, publishers, genres and stock."""
+        Partner = self.env["res.partner"]
+        authors = Partner.create(
+            [
+                {"name": f"Author {i}", "is_author": True, "company_type": "person"}
+                for i in range(max(size // 10, 1))
+            ]
+        )
+        publishers = Partner.create(
+            [
+                {
+                    "name": f"Publisher {i}",
+                    "is_publisher": True,
+                    "company_type": "company",
+                }
+                for i in range(max(size // 100, 1))
+            ]
+        )
+        Genre = self.env["product.book.genre"]
+        roots = Genre.create([{"name": f"Genre {i}"} for i in range(10)])
+        children = Genre.create(
+            [
+                {"name": f"Subgenre {i}", "parent_id": roots[i % len(roots)].id}
+                for i in range(100)
+            ]
+        )
+        shelves = self.env["stock.location"].create(
+            [
+                {"name": f"Shelf {i}", "location_id": self.stock_location.id}
+                for i in range(50)
+            ]
+        )
+        books = self.env["product.template"]
+        for start in range(0, size, BATCH_SIZE):
+            books |= books.create(
+                [
+                    {
+                        "name": f"Book {i}",
+                        "is_book": True,
+                        "type": "consu",
+                        "is_storable": True,
+                        "isbn": self._isbn(i),
+                        "copies": 1 + i % 3,
+                        "rating": str(i % 6),
+                        "author_ids": [(6, 0, [authors[i % len(authors)].id])],
+                        "publisher_id": publishers[i % len(publishers)].id,
+                        "genre_ids": [(6, 0, [children[i % len(children)].id])],
+                    }
+                    for i in range(start, min(start + BATCH_SIZE, size))
+                ]
+            )
+        self.env["stock.quant"].sudo().create(
+            [
+                {
+                    "product_id": book.product_variant_id.id,
+                    "location_id": shelves[i % len(shelves)].id,
+                    "quantity": 1 + i % 3,
+                }
+                for i, book in enumerate(books)
+            ]
+        )
+        return books, authors, roots, shelves
+
+    @staticmethod
+    def _isbn(number):
+        digits = f"978{number:09d}"
+        total = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(digits))
+        return digits + str((10 - total % 10) % 10)
+
+    def _run_size(self, size):
+        results = {}
+        with self.measure(results, "bulk_create"):
+            books, authors, roots, shelves = self._create_catalogue(size)
+
+        Quant = self.env["stock.quant"].sudo()
+        moved = books[: max(size // 10, 1)]
+        with self.measure(results, "compute_location_after_stock_moves"):
+            # Move one unit of 10% of the books to the next shelf, the way
+            # stock moves update quants when they are done
+            for i, book in enumerate(moved):
+                product = book.product_variant_id
+                Quant._update_available_quantity(product, shelves[i % len(shelves)], -1)
+                Quant._update_available_quantity(
+                    product, shelves[(i + 1) % len(shelves)], 1
+                )
+            self.env.cr.flush()
+            moved.mapped("location")
+
+        with self.measure(results, "constrain_isbn_valid"):
+            books._constrain_isbn_valid()
+
+        with self.measure(results, "genre_rename"):
+            roots[0].name = "Renamed Genre"
+
+        kanban_fields = {
+            name: {}
+            for name in (
+                "name",
+                "cover_thumbnail_url",
+                "number_of_pages",
+                "rating",
+                "location",
+                "sequence",
+            )
+        }
+        kanban_fields.update(
+            {
+                field_name: {"fields": {"display_name": {}}}
+                for field_name in ("publisher_id", "author_ids", "genre_ids")
+            }
+        )
+        with self.measure(results, "kanban_web_search_read"):
+            self.env["product.template"].web_search_read(
+                [("is_book", "=", True)],
+                kanban_fields,
+                order="location, sequence",
+                limit=80,
+            )
+
+        with self.measure(results, "partner_authored_book_ids"):
+            authors.mapped("authored_book_ids.name")
+        return results
+
+    def _log_comparison(self, report):
+        baseline_path = os.environ.get("JAG_LIBRARY_BENCHMARK_BASELINE")
+        if not baseline_path or not os.path.exists(baseline_path):
+            return
+        with open(baseline_path) as baseline_file:
+            baseline = json.load(baseline_file)
+        for size, results in report["sizes"].items():
+            for name, metrics in results.items():
+                previous = baseline.get("sizes", {}).get(size, {}).get(name)
+                if not previous:
+                    continue
+                _logger.info(
+                    "Benchmark %s (%s books): %+d queries, %+.1f%% time",
+                    name,
+                    size,
+                    metrics["queries"] - previous["queries"],
+                    100 * (metrics["seconds"] / (previous["seconds"] or 1) - 1),
+                )
+
+    def test_benchmark(self):
+        report = {
+            "date": fields.Datetime.to_string(fields.Datetime.now()),
+            "odoo_version": release.version,
+            "sizes": {},
+        }
+        for size in self.sizes:
+            with self.env.cr.savepoint() as savepoint:
+                report["sizes"][str(size)] = self._run_size(size)
+                savepoint.rollback()
+            self.env.invalidate_all()
+        with open(self.report_path, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+        _logger.info("Benchmark report written to %s", self.report_path)
+        self._log_comparison(report)
@@ -252,6 +252,8 @@ class TestBook(TransactionCase):
         self.env["stock.quant"]._update_available_quantity(
             self.book_odoo.product_variant_id, self.shelf1, 1
         )
+        # The locations are refreshed when the cursor is flushed
+        self.env.cr.flush()
         # Force recompute and check the initial location
         self.book_odoo.invalidate_recordset()
         book_at_shelf1 = self.env["product.template"].browse(self.book_odoo.id)
@@ -285,6 +287,7 @@ class TestBook(TransactionCase):
         # Verify move is done and update stock
         self.assertEqual(move.state, "done", "Move should be in done state")
         self.env["stock.quant"]._quant_tasks()
+        self.env.cr.flush()
 
         # Force recompute and check the new location
         self.book_odoo.invalidate_recordset()
@@ -295,3 +298,114 @@ class TestBook(TransactionCase):
         # 3. Check that searching by location works
         found_books = self.Book.search([("location", "=", self.shelf2.display_name)])
         self.assertIn(updated_book, found_books)
+
+    def test_book_location_batch(self):
+        "Test 16: Locations of several books are computed in one batch"
+        Quant = self.env["stock.quant"]
+        Quant._update_available_quantity(
+            self.book_odoo.product_variant_id, self.shelf1, 2
+        )
+        Quant._update_available_quantity(
+            self.book_quijote.product_variant_id, self.shelf2, 1
+        )
+        self.env.cr.flush()
+        books = self.book_odoo | self.book_quijote
+        names = books._get_internal_location_names()
+        self.assertEqual(names[self.book_odoo.id], [self.shelf1.display_name])
+        self.assertEqual(names[self.book_quijote.id], [self.shelf2.display_name])
+
+        books.invalidate_recordset()
+        self.assertEqual(self.book_odoo.location, self.shelf1.display_name)
+        self.assertEqual(self.book_quijote.location, self.shelf2.display_name)
+
+        # Stock in non-internal locations is ignored
+        customer = self.env.ref("stock.stock_location_customers")
+        Quant._update_available_quantity(
+            self.book_quijote.product_variant_id, customer, 1
+        )
+        self.env.cr.flush()
+        books.invalidate_recordset()
+        self.assertEqual(self.book_quijote.location, self.shelf2.display_name)
+
+    def test_library_search(self):
+        "Test 17: Books are found by any word of their search document"
+        (self.book_odoo | self.book_quijote).is_book = True
+        self.book_odoo.synopsis = "<p>A practical guide to <b>modules</b></p>"
+        self.book_odoo.flush_recordset()
+        self.assertEqual(
+            self.Book.search([("library_search", "ilike", "reis modul")]),
+            self.book_odoo,
+        )
+        self.assertEqual(
+            self.Book.search([("library_search", "ilike", "9788491050759")]),
+            self.book_quijote,
+        )
+        self.assertEqual(
+            self.Book.search([("library_search", "ilike", "novel")]), self.book_odoo
+        )
+
+        # Renaming an author updates the books' search documents
+        self.author_cervantes.name = "Miguel de Cervantes Saavedra"
+        results = self.Book.library_search_ranked("saavedra")
+        self.assertEqual([r["id"] for r in results], [self.book_quijote.id])
+
+        # Title matches rank before synopsis matches
+        self.book_quijote.synopsis = "<p>A knight reads too many Odoo books</p>"
+        results = self.Book.library_search_ranked("odoo")
+        self.assertEqual(
+            [r["id"] for r in results], [self.book_odoo.id, self.book_quijote.id]
+        )
+
+    def test_book_shelves(self):
+        "Test 18: Books are searched and grouped by shelf through the relation"
+        Quant = self.env["stock.quant"]
+        Quant._update_available_quantity(
+            self.book_odoo.product_variant_id, self.shelf2, 2
+        )
+        Quant._update_available_quantity(
+            self.book_odoo.product_variant_id, self.shelf1, 1
+        )
+        Quant._update_available_quantity(
+            self.book_quijote.product_variant_id, self.shelf2, 3
+        )
+        books = self.book_odoo | self.book_quijote
+        self.env.cr.flush()
+
+        # The names are sorted, and each pair carries its quantity
+        self.assertEqual(
+            self.book_odoo.location,
+            f"{self.shelf1.display_name}, {self.shelf2.display_name}",
+        )
+        self.assertEqual(self.book_odoo.shelf_ids, self.shelf1 | self.shelf2)
+        lines = self.book_quijote.book_location_ids
+        self.assertEqual(lines.location_id, self.shelf2)
+        self.assertEqual(lines.quantity, 3)
+
+        self.assertEqual(
+            self.Book.search([("shelf_ids", "=", self.shelf2.id)]) & books, books
+        )
+        self.assertEqual(
+            self.Book.search([("shelf_ids", "=", self.shelf1.id)]), self.book_odoo
+        )
+        groups = self.Book._read_group(
+            [("id", "in", books.ids)], ["shelf_ids"], ["__count"]
+        )
+        self.assertEqual(dict(groups), {self.shelf1: 1, self.shelf2: 2})
+
+        # Renaming a shelf renames the location of its books
+        self.shelf2.name = "Shelf 3"
+        self.assertEqual(self.book_quijote.location, self.shelf2.display_name)
+
+        # Emptying a shelf removes its rows
+        Quant._update_available_quantity(
+            self.book_odoo.product_variant_id, self.shelf1, -1
+        )
+        self.env.cr.flush()
+        self.assertEqual(self.book_odoo.shelf_ids, self.shelf2)
+        self.assertEqual(self.book_odoo.location, self.shelf2.display_name)
+
+        # A shelf leaving the internal locations no longer holds books
+        self.shelf2.usage = "transit"
+        self.env.cr.flush()
+        self.assertFalse(self.book_odoo.shelf_ids)
+        self.assertFalse(self.book_quijote.location)
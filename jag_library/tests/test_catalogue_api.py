@@ -0,0 +1,83 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+import json
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+
+from odoo.tests.common import HttpCase, tagged
+
+
+@tagged("-at_install", "post_install")
+class TestCatalogueApi(HttpCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env["product.template"].search([("is_book", "=", True)]).write(
+            {"is_book": False}
+        )
+        cls.author = cls.env["res.partner"].create(
+            {"name": "Ursula K. Le Guin", "is_author": True}
+        )
+        cls.genre = cls.env["product.book.genre"].create({"name": "Fantasy"})
+        cls.books = cls.env["product.template"].create(
+            [
+                {
+                    "name": f"Earthsea {i}",
+                    "is_book": True,
+                    "sequence": 10 - i % 2,
+                    "author_ids": [(6, 0, cls.author.ids)],
+                    "genre_ids": [(6, 0, cls.genre.ids)],
+                }
+                for i in range(5)
+            ]
+        )
+
+    def test_pages(self):
+        "Cursors walk through all the books in (sequence, id) order"
+        names = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.url_open(f"/library/api/books?{urlencode(params)}")
+            self.assertEqual(response.status_code, 200)
+            page = response.json()
+            names += [book["name"] for book in page["books"]]
+            cursor = page["next"]
+            if not cursor:
+                break
+        expected = self.books.sorted(lambda book: (book.sequence, book.id))
+        self.assertEqual(names, expected.mapped("name"))
+        book = page["books"][-1]
+        self.assertEqual(book["authors"], ["Ursula K. Le Guin"])
+        self.assertEqual(book["genres"], ["Fantasy"])
+
+    def test_etag(self):
+        "Unchanged pages are answered with 304 Not Modified"
+        response = self.url_open("/library/api/books")
+        etag = response.headers["ETag"]
+        response = self.url_open("/library/api/books", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        # Write dates are those of the transaction, which the test never
+        # commits: write the book as a later transaction would
+        self.books[0].write(
+            {"name": "Tehanu", "write_date": datetime.now() + timedelta(minutes=1)}
+        )
+        response = self.url_open("/library/api/books", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_invalid_cursor(self):
+        response = self.url_open("/library/api/books?cursor=nope")
+        self.assertEqual(response.status_code, 400)
+
+    def test_ndjson(self):
+        "The export streams one JSON document per book"
+        response = self.url_open("/library/api/books.ndjson")
+        self.assertEqual(response.status_code, 200)
+        lines = response.text.splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(
+            {json.loads(line)["id"] for line in lines}, set(self.books.ids)
+        )
@@ -0,0 +1,145 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests.common import TransactionCase, new_test_user
+
+
+class TestCirculation(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.Loan = self.env["library.loan"]
+        self.Reservation = self.env["library.reservation"]
+        self.book = self.env["product.template"].create(
+            {"name": "Circulating Book", "is_book": True}
+        )
+        self.copies = self.env["library.book.copy"].create(
+            [
+                {"product_tmpl_id": self.book.id, "barcode": "CIRC-1"},
+                {"product_tmpl_id": self.book.id, "barcode": "CIRC-2"},
+            ]
+        )
+        self.alice = self.env["res.partner"].create({"name": "Alice Borrower"})
+        self.bob = self.env["res.partner"].create({"name": "Bob Borrower"})
+
+    def _counts(self):
+        self.book.invalidate_recordset(
+            ["available_copy_count", "on_loan_copy_count", "waiting_reservation_count"]
+        )
+        return (
+            self.book.available_copy_count,
+            self.book.on_loan_copy_count,
+            self.book.waiting_reservation_count,
+        )
+
+    def test_product_form_access(self):
+        "Users outside the library groups still open the products"
+        user = new_test_user(self.env, login="stock_clerk", groups="base.group_user")
+        book = self.book.with_user(user)
+        self.assertEqual(book.available_copy_count, 2)
+        book.get_views([(False, "form")])
+
+    def test_checkout_checkin(self):
+        self.assertEqual(self._counts(), (2, 0, 0))
+        result = self.Loan.checkout(["CIRC-1", "CIRC-1", "UNKNOWN"], self.alice.id)
+        self.assertEqual(len(result["loan_ids"]), 1)
+        self.assertEqual(result["unknown"], ["UNKNOWN"])
+        self.assertEqual(self.copies[0].state, "on_loan")
+        self.assertEqual(self._counts(), (1, 1, 0))
+
+        result = self.Loan.checkout(["CIRC-1"], self.bob.id)
+        self.assertEqual(result["unavailable"], ["CIRC-1"])
+
+        result = self.Loan.checkin(["CIRC-1", "CIRC-2"])
+        self.assertEqual(result["returned"], ["CIRC-1"])
+        self.assertEqual(result["not_on_loan"], ["CIRC-2"])
+        self.assertEqual(self.copies[0].loan_ids.state, "returned")
+        self.assertEqual(self.copies[0].state, "available")
+        self.assertEqual(self._counts(), (2, 0, 0))
+
+    def test_reservation(self):
+        "Returned copies are held for the oldest waiting reservation"
+        self.Loan.checkout(["CIRC-1", "CIRC-2"], self.alice.id)
+        reservation = self.Reservation.create(
+            {"book_id": self.book.id, "partner_id": self.bob.id}
+        )
+        self.assertEqual(reservation.state, "waiting")
+        self.assertEqual(self._counts(), (0, 2, 1))
+
+        result = self.Loan.checkin(["CIRC-2"])
+        self.assertEqual(result["reserved"], ["CIRC-2"])
+        self.assertEqual(reservation.state, "ready")
+        self.assertEqual(reservation.copy_id, self.copies[1])
+        self.assertEqual(self._counts(), (0, 1, 0))
+
+        result = self.Loan.checkout(["CIRC-2"], self.alice.id)
+        self.assertEqual(result["unavailable"], ["CIRC-2"])
+        result = self.Loan.checkout(["CIRC-2"], self.bob.id)
+        self.assertEqual(len(result["loan_ids"]), 1)
+        self.assertEqual(reservation.state, "done")
+        self.assertEqual(self._counts(), (0, 2, 0))
+
+    def test_cancel_reservation(self):
+        reservation = self.Reservation.create(
+            {"book_id": self.book.id, "partner_id": self.bob.id}
+        )
+        self.assertEqual(reservation.state, "ready")
+        self.assertEqual(self._counts(), (1, 0, 0))
+        reservation.action_cancel()
+        self.assertEqual(reservation.copy_id.state, "available")
+        self.assertEqual(self._counts(), (2, 0, 0))
+
+    def test_cancel_hands_over(self):
+        "Cancelled holds go to the next waiting reservation"
+        carol = self.env["res.partner"].create({"name": "Carol Borrower"})
+        reservations = self.Reservation.create(
+            [
+                {"book_id": self.book.id, "partner_id": partner.id}
+                for partner in (self.alice, self.bob, carol)
+            ]
+        )
+        self.assertEqual(reservations.mapped("state"), ["ready", "ready", "waiting"])
+        self.assertEqual(reservations[:2].copy_id, self.copies)
+        self.assertEqual(self._counts(), (0, 0, 1))
+
+        released = reservations[0].copy_id
+        reservations[0].action_cancel()
+        self.assertEqual(reservations[2].state, "ready")
+        self.assertEqual(reservations[2].copy_id, released)
+        self.assertEqual(released.state, "reserved")
+        self.assertEqual(self._counts(), (0, 0, 0))
+
+    def test_overdue(self):
+        result = self.Loan.checkout(["CIRC-1"], self.alice.id, days=-1)
+        reservation = self.Reservation.create(
+            {"book_id": self.book.id, "partner_id": self.bob.id}
+        )
+        reservation.date_expiry = fields.Date.today() - timedelta(days=1)
+        self.Loan._cron_scan_overdue()
+        self.assertEqual(self.Loan.browse(result["loan_ids"]).state, "overdue")
+        self.assertEqual(reservation.state, "cancelled")
+        self.assertEqual(self._counts(), (1, 1, 0))
+
+    def test_recompute_matches_deltas(self):
+        "The counters kept by deltas match a full recount"
+        self.Loan.checkout(["CIRC-1"], self.alice.id)
+        self.Reservation.create({"book_id": self.book.id, "partner_id": self.bob.id})
+        self.Reservation.create({"book_id": self.book.id, "partner_id": self.alice.id})
+        Availability = self.env["library.book.availability"]
+        counts = Availability._get_counts(self.book.ids)
+        Availability._recompute(self.book.ids)
+        self.assertEqual(Availability._get_counts(self.book.ids), counts)
+
+    def test_desk(self):
+        desk = self.env["library.circulation.desk"].create(
+            {
+                "operation": "checkout",
+                "partner_id": self.alice.id,
+                "barcodes": "CIRC-1\n\nCIRC-9\n",
+            }
+        )
+        desk.action_apply()
+        self.assertEqual(desk.processed_count, 1)
+        self.assertIn("CIRC-9", desk.error_log)
@@ -0,0 +1,66 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from datetime import date
+
+from odoo.tests.common import TransactionCase
+
+
+class TestDashboard(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.Stat = self.env["library.dashboard.stat"]
+        self.genre = self.env["product.book.genre"].create({"name": "Dashboard"})
+        self.env["product.template"].create(
+            [
+                {
+                    "name": "Read in May",
+                    "is_book": True,
+                    "copies": 2,
+                    "binding": "paperback",
+                    "genre_ids": [(6, 0, self.genre.ids)],
+                    "date_start_reading": date(2024, 5, 1),
+                    "date_end_reading": date(2024, 5, 11),
+                },
+                {
+                    "name": "Also read in May",
+                    "is_book": True,
+                    "binding": "paperback",
+                    "genre_ids": [(6, 0, self.genre.ids)],
+                    "date_start_reading": date(2024, 5, 10),
+                    "date_end_reading": date(2024, 5, 30),
+                },
+            ]
+        )
+        self.Stat._refresh()
+
+    def test_refresh(self):
+        genre_stat = self.Stat.search(
+            [("dimension", "=", "genre"), ("genre_id", "=", self.genre.id)]
+        )
+        self.assertEqual(genre_stat.book_count, 2)
+        self.assertEqual(genre_stat.copy_count, 3)
+        self.assertEqual(genre_stat.name, "Dashboard")
+        binding_stat = self.Stat.search(
+            [("dimension", "=", "binding"), ("name", "=", "paperback")]
+        )
+        self.assertGreaterEqual(binding_stat.book_count, 2)
+        self.assertTrue(
+            self.env["ir.config_parameter"].get_param(
+                "jag_library.dashboard_refreshed_at"
+            )
+        )
+
+    def test_reading_days(self):
+        "Books read are counted per month with their average reading time"
+        month_stat = self.Stat.search(
+            [("dimension", "=", "finished_month"), ("month", "=", "2024-05-01")]
+        )
+        self.assertEqual(month_stat.book_count, 2)
+        self.assertEqual(month_stat.reading_days_avg, 15)
+
+    def test_refresh_replaces(self):
+        "Refreshing replaces the rows instead of adding to them"
+        count = self.Stat.search_count([])
+        self.Stat._refresh()
+        self.assertEqual(self.Stat.search_count([]), count)
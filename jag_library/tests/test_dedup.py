@@ -0,0 +1,124 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo.exceptions import AccessError
+from odoo.tests.common import BaseCase, TransactionCase, new_test_user
+
+from ..tools import titles
+
+
+class TestTitles(BaseCase):
+    def test_title_key(self):
+        self.assertEqual(
+            titles.title_key("Don Quijote de la Mancha"), "don quijote mancha"
+        )
+        self.assertEqual(titles.title_key("Cien años de soledad"), "cien anos soledad")
+        self.assertEqual(titles.title_key("The The"), "the the")
+        self.assertEqual(titles.title_key(False), "")
+
+    def test_similarity(self):
+        key = titles.title_key("Don Quijote de la Mancha")
+        self.assertEqual(titles.key_similarity(key, key), 1.0)
+        self.assertGreater(
+            titles.key_similarity(key, titles.title_key("Don Quixote de la Mancha")),
+            0.6,
+        )
+        self.assertLess(
+            titles.key_similarity(key, titles.title_key("Don Juan Tenorio")), 0.5
+        )
+
+
+class TestDeduplicator(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.Dedup = self.env["library.book.deduplicator"]
+        Partner = self.env["res.partner"]
+        self.cervantes = Partner.create({"name": "Cervantes", "is_author": True})
+        self.zorrilla = Partner.create({"name": "Zorrilla", "is_author": True})
+        self.novel, self.classic = self.env["product.book.genre"].create(
+            [{"name": "Novel"}, {"name": "Classic"}]
+        )
+        Book = self.env["product.template"]
+        self.quijote = Book.create(
+            {
+                "name": "Don Quijote de la Mancha",
+                "is_book": True,
+                "author_ids": [(6, 0, self.cervantes.ids)],
+                "genre_ids": [(6, 0, self.novel.ids)],
+            }
+        )
+        self.quijote_isbn = Book.create(
+            {
+                "name": "Don Quijote de la mancha",
+                "is_book": True,
+                "isbn": "9788491050209",
+                "is_storable": True,
+                "genre_ids": [(6, 0, self.classic.ids)],
+            }
+        )
+        self.quixote = Book.create(
+            {
+                "name": "Don Quixote de la Mancha",
+                "is_book": True,
+                "author_ids": [(6, 0, self.cervantes.ids)],
+            }
+        )
+        self.tenorio = Book.create(
+            {
+                "name": "Don Juan Tenorio",
+                "is_book": True,
+                "author_ids": [(6, 0, self.zorrilla.ids)],
+            }
+        )
+
+    def test_find(self):
+        "Books sharing a block and similar enough are suggested"
+        pairs = {
+            (suggestion["book_id"], suggestion["duplicate_id"])
+            for suggestion in self.Dedup._find_duplicates()
+        }
+        # The book with an ISBN is the one to keep
+        self.assertIn((self.quijote_isbn.id, self.quijote.id), pairs)
+        self.assertIn((self.quijote.id, self.quixote.id), pairs)
+        self.assertFalse(
+            {pair for pair in pairs if self.tenorio.id in pair},
+        )
+
+    def test_merge(self):
+        "Merging moves authors, genres, stock and ISBN to the book kept"
+        stock = self.env.ref("stock.stock_location_stock")
+        (self.quijote | self.quijote_isbn).is_storable = True
+        self.env["stock.quant"]._update_available_quantity(
+            self.quijote.product_variant_id, stock, 2
+        )
+        # quixote -> quijote -> quijote_isbn
+        count = self.Dedup._merge(
+            [
+                (self.quijote.id, self.quixote.id),
+                (self.quijote_isbn.id, self.quijote.id),
+            ]
+        )
+        self.assertEqual(count, 2)
+        self.assertFalse(self.quijote.active)
+        self.assertFalse(self.quixote.active)
+        self.assertEqual(self.quijote_isbn.author_ids, self.cervantes)
+        self.assertEqual(self.quijote_isbn.genre_ids, self.novel | self.classic)
+        self.assertEqual(self.quijote_isbn.qty_available, 2)
+        self.assertEqual(self.quijote_isbn.location, stock.display_name)
+        self.assertEqual(self.novel.book_count, 1)
+
+    def test_merge_isbn(self):
+        "The ISBN of the duplicate moves to a kept book without one"
+        isbn = self.quijote_isbn.isbn
+        self.Dedup._merge([(self.quijote.id, self.quijote_isbn.id)])
+        self.assertFalse(self.quijote_isbn.isbn)
+        self.assertEqual(self.quijote.isbn, isbn)
+
+    def test_merge_access(self):
+        "Only library managers merge books"
+        user = new_test_user(
+            self.env, login="library_reader", groups="jag_library.library_group_user"
+        )
+        with self.assertRaises(AccessError):
+            self.Dedup.with_user(user)._merge([(self.quijote.id, self.quixote.id)])
+        self.assertTrue(self.quixote.active)
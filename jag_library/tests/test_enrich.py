@@ -0,0 +1,129 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+import io
+import json
+import os
+import tempfile
+
+from odoo.tests.common import TransactionCase
+
+from ..tools import bibliographic_index
+
+
+def _openlibrary_line(record_type, document):
+    return "\t".join(
+        [record_type, document["key"], "1", "2024-01-01", json.dumps(document)]
+    ).encode()
+
+
+OPENLIBRARY_DUMP = b"\n".join(
+    [
+        _openlibrary_line(
+            "/type/edition",
+            {
+                "key": "/books/OL1M",
+                "title": "Dune",
+                "isbn_10": ["0441172717"],
+                "authors": [{"key": "/authors/OL1A"}],
+                "publishers": ["Ace Books"],
+                "publish_date": "1990",
+                "number_of_pages": 535,
+                "languages": [{"key": "/languages/eng"}],
+                "description": {"type": "/type/text", "value": "Arrakis."},
+            },
+        ),
+        _openlibrary_line(
+            "/type/author", {"key": "/authors/OL1A", "name": "Frank Herbert"}
+        ),
+    ]
+)
+
+
+class TestBookEnrichment(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.index_path = os.path.join(tmpdir.name, "books.sqlite")
+        bibliographic_index.build(
+            self.index_path,
+            iter(
+                [
+                    {
+                        "isbn": "978-0-553-29335-7",
+                        "name": "Foundation",
+                        "authors": ["Isaac Asimov"],
+                        "publisher": "Bantam",
+                        "publication_date": "1991-10-01",
+                        "number_of_pages": 255,
+                        "language": "en",
+                    },
+                    {
+                        "isbn": "9780000000002",
+                        "name": "Future book",
+                        "publication_date": "2999-01-01",
+                    },
+                ]
+            ),
+        )
+        self.env["ir.config_parameter"].set_param(
+            "jag_library.bibliographic_index", self.index_path
+        )
+        self.Enricher = self.env["library.book.enricher"]
+
+    def test_lookup(self):
+        "Lookups accept any ISBN spelling and skip the unknown numbers"
+        with bibliographic_index.BibliographicIndex(self.index_path) as index:
+            records = index.lookup(["0553293354", "9780441172719"])
+        self.assertEqual(list(records), ["0553293354"])
+        self.assertEqual(records["0553293354"]["authors"], ["Isaac Asimov"])
+
+    def test_enrich(self):
+        "Only the empty fields are filled in, and the partners are created once"
+        book, other = self.env["product.template"].create(
+            [
+                {"name": "Foundation", "is_book": True, "isbn": "9780553293357"},
+                {
+                    "name": "Foundation (copy)",
+                    "is_book": True,
+                    "isbn": "9780000000002",
+                    "number_of_pages": 12,
+                },
+            ]
+        )
+        stats = self.Enricher._enrich(batch_size=1)
+        self.assertEqual(stats["updated"], 1)
+        self.assertEqual(book.author_ids.name, "Isaac Asimov")
+        self.assertTrue(book.author_ids.is_author)
+        self.assertEqual(book.publisher_id.name, "Bantam")
+        self.assertEqual(book.publication_year, 1991)
+        self.assertEqual(book.number_of_pages, 255)
+        self.assertEqual(book.author_ids.library_book_count, 1)
+        # Future dates are not filled in
+        self.assertFalse(other.publication_date)
+        self.assertEqual(other.number_of_pages, 12)
+
+    def test_openlibrary(self):
+        "Open Library editions are indexed under all their ISBNs with their authors"
+        dump = os.path.join(os.path.dirname(self.index_path), "ol_dump.txt")
+        with open(dump, "wb") as fileobj:
+            fileobj.write(OPENLIBRARY_DUMP)
+        count = bibliographic_index.build_from_file(
+            self.index_path, dump, "openlibrary"
+        )
+        self.assertEqual(count, 1)
+        book = self.env["product.template"].create(
+            {"name": "Dune", "is_book": True, "isbn": "9780441172719"}
+        )
+        self.Enricher._enrich(domain=[("id", "=", book.id)])
+        self.assertEqual(book.author_ids.name, "Frank Herbert")
+        self.assertIn("Arrakis.", book.synopsis)
+        self.assertEqual(book.language.iso_code, "en")
+
+    def test_parse_openlibrary(self):
+        records = list(
+            bibliographic_index.iter_openlibrary_editions(io.BytesIO(OPENLIBRARY_DUMP))
+        )
+        self.assertEqual(records[0]["publication_date"], "1990-01-01")
+        self.assertEqual(records[0]["author_keys"], ["/authors/OL1A"])
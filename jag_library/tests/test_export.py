@@ -0,0 +1,64 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+import csv
+import io
+import json
+import zipfile
+
+from odoo.tests.common import TransactionCase
+
+from ..models import library_book_export
+
+
+class TestBookExport(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        author = self.env["res.partner"].create({"name": "Author", "is_author": True})
+        genre = self.env["product.book.genre"].create({"name": "Export"})
+        self.books = self.env["product.template"].create(
+            [
+                {
+                    "name": f"Exported {i}",
+                    "is_book": True,
+                    "author_ids": [(6, 0, author.ids)],
+                    "genre_ids": [(6, 0, genre.ids)],
+                }
+                for i in range(5)
+            ]
+        )
+        self.domain = str([("id", "in", self.books.ids)])
+
+    def export(self, file_format):
+        export = self.env["library.book.export"].create(
+            {"domain": self.domain, "file_format": file_format}
+        )
+        export._run()
+        self.assertEqual(export.state, "done")
+        self.assertEqual(export.row_count, 5)
+        return export.attachment_id.raw
+
+    def test_csv(self):
+        # Several pages are read and written one after the other
+        self.patch(library_book_export, "EXPORT_BATCH_SIZE", 2)
+        rows = list(csv.DictReader(io.StringIO(self.export("csv").decode())))
+        self.assertEqual(
+            [int(row["id"]) for row in rows],
+            self.books.sorted(lambda book: (book.sequence, book.id)).ids,
+        )
+        self.assertEqual(rows[0]["authors"], "Author")
+        self.assertEqual(rows[0]["genres"], "Export")
+
+    def test_jsonl(self):
+        rows = [json.loads(line) for line in self.export("jsonl").splitlines()]
+        self.assertEqual(rows[0]["authors"], ["Author"])
+
+    def test_xlsx(self):
+        data = self.export("xlsx")
+        self.assertTrue(zipfile.is_zipfile(io.BytesIO(data)))
+
+    def test_background(self):
+        "Background exports are left to the scheduler"
+        export = self.env["library.book.export"].create({"domain": self.domain})
+        export.action_export_background()
+        self.assertEqual(export.state, "pending")
@@ -0,0 +1,120 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo.tests.common import TransactionCase
+
+
+class TestGenreTree(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.Genre = self.env["product.book.genre"]
+        self.fiction = self.Genre.create({"name": "Fiction"})
+        self.novel = self.Genre.create({"name": "Novel", "parent_id": self.fiction.id})
+        self.historical = self.Genre.create(
+            {"name": "Historical", "parent_id": self.novel.id}
+        )
+        self.medieval = self.Genre.create(
+            {"name": "Medieval", "parent_id": self.historical.id}
+        )
+        self.classics = self.Genre.create({"name": "Classics"})
+
+    def assertRecursiveNames(self, genres):
+        """Compare ``complete_name`` with the name built from the ancestors."""
+        genres.invalidate_recordset()
+        for genre in genres:
+            names = []
+            node = genre
+            while node:
+                names.insert(0, node.name)
+                node = node.parent_id
+            self.assertEqual(genre.complete_name, " / ".join(names))
+
+    def test_create(self):
+        "New genres get the names of their ancestors"
+        self.assertEqual(
+            self.medieval.complete_name, "Fiction / Novel / Historical / Medieval"
+        )
+        self.assertRecursiveNames(self.Genre.search([]))
+
+    def test_rename_subtree(self):
+        "Renaming a genre renames all its descendants"
+        self.fiction.name = "Literature"
+        self.assertEqual(
+            self.medieval.complete_name, "Literature / Novel / Historical / Medieval"
+        )
+        self.assertRecursiveNames(self.Genre.search([]))
+
+    def test_move_subtree(self):
+        "Moving a genre updates the path and name of all its descendants"
+        self.historical.parent_id = self.classics
+        self.assertEqual(
+            self.medieval.complete_name, "Classics / Historical / Medieval"
+        )
+        self.assertTrue(self.medieval.parent_path.startswith(self.classics.parent_path))
+        self.assertRecursiveNames(self.Genre.search([]))
+
+        self.historical.parent_id = False
+        self.assertEqual(self.medieval.complete_name, "Historical / Medieval")
+        self.assertRecursiveNames(self.Genre.search([]))
+
+    def test_rename_several(self):
+        "Several subtrees are renamed in a single write"
+        (self.novel | self.classics).write({"name": "Renamed"})
+        self.assertEqual(
+            self.medieval.complete_name, "Fiction / Renamed / Historical / Medieval"
+        )
+        self.assertRecursiveNames(self.Genre.search([]))
+
+    def test_book_stats(self):
+        "Genres count the books, copies and ratings of their whole subtree"
+        Book = self.env["product.template"]
+        quijote = Book.create(
+            {
+                "name": "Don Quijote de la mancha",
+                "is_book": True,
+                "copies": 3,
+                "rating": "5",
+                "genre_ids": [(6, 0, [self.novel.id, self.medieval.id])],
+            }
+        )
+        Book.create(
+            {
+                "name": "The Name of the Rose",
+                "is_book": True,
+                "copies": 2,
+                "rating": "4",
+                "genre_ids": [(6, 0, [self.medieval.id])],
+            }
+        )
+        Book.create(
+            {
+                "name": "Unrated",
+                "is_book": True,
+                "genre_ids": [(6, 0, [self.classics.id])],
+            }
+        )
+        # Products that are not books are not counted
+        Book.create({"name": "Bookmark", "genre_ids": [(6, 0, [self.novel.id])]})
+
+        self.assertEqual(self.novel.book_count, 1)
+        self.assertEqual(self.fiction.book_count, 0)
+        # A book in two genres of the subtree is counted once
+        self.assertEqual(self.fiction.subtree_book_count, 2)
+        self.assertEqual(self.fiction.subtree_copies, 5)
+        self.assertAlmostEqual(self.fiction.subtree_rating_avg, 4.5)
+        self.assertEqual(self.classics.subtree_book_count, 1)
+        self.assertEqual(self.classics.subtree_rating_avg, 0)
+
+        # Changing the genres of a book updates the old and new genres
+        quijote.genre_ids = [(6, 0, [self.classics.id])]
+        self.assertEqual(self.fiction.subtree_book_count, 1)
+        self.assertEqual(self.novel.book_count, 0)
+        self.assertEqual(self.classics.subtree_copies, 4)
+
+        # Moving a subtree moves its books to the new ancestors
+        self.historical.parent_id = self.classics
+        self.assertEqual(self.fiction.subtree_book_count, 0)
+        self.assertEqual(self.classics.subtree_book_count, 3)
+
+        action = self.classics.action_view_books()
+        self.assertEqual(len(Book.search(action["domain"])), 3)
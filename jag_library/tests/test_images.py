@@ -0,0 +1,100 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+import base64
+import io
+
+from PIL import Image
+
+from odoo.tests.common import TransactionCase
+
+
+def make_image(color, size=(600, 900)):
+    output = io.BytesIO()
+    Image.new("RGB", size, color).save(output, format="PNG")
+    return base64.b64encode(output.getvalue())
+
+
+class TestBackCoverThumbnails(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.Derivative = self.env["library.image.derivative"]
+        self.cover = make_image("red")
+        self.books = self.env["product.template"].create(
+            [
+                {"name": "First Copy", "image_back_cover_1920": self.cover},
+                {"name": "Second Copy", "image_back_cover_1920": self.cover},
+            ]
+        )
+
+    def test_generated_on_demand(self):
+        "Thumbnails are generated on first access and shared between books"
+        self.assertFalse(self.Derivative.search([]))
+        self.books.invalidate_recordset()
+        thumbnails = self.books.mapped("image_back_cover_128")
+        self.assertEqual(thumbnails[0], thumbnails[1])
+        width, height = Image.open(io.BytesIO(base64.b64decode(thumbnails[0]))).size
+        self.assertLessEqual(max(width, height), 128)
+        self.assertEqual(len(self.Derivative.search([("size", "=", 128)])), 1)
+
+    def test_read_bin_size(self):
+        "Thumbnails are read as web reads and exports do"
+        self.Derivative._backfill()
+        self.books.invalidate_recordset()
+        books = self.books.with_context(bin_size=True)
+        books.read(["image_back_cover_128", "image_back_cover_256"])
+        thumbnail = self.books[0].image_back_cover_128
+        width, height = Image.open(io.BytesIO(base64.b64decode(thumbnail))).size
+        self.assertLessEqual(max(width, height), 128)
+
+    def test_backfill_and_purge(self):
+        "Derivatives can be generated and purged in bulk"
+        self.assertEqual(self.Derivative._backfill(), 4)
+        self.assertEqual(self.Derivative._backfill(), 0)
+        self.books.write({"image_back_cover_1920": make_image("blue")})
+        self.assertEqual(self.Derivative._purge(), 4)
+        self.assertEqual(self.Derivative._purge(orphans_only=False), 0)
+
+
+class TestSharedCovers(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.cover = make_image("green", size=(300, 450))
+        self.book = self.env["product.template"].create(
+            {"name": "First Edition", "image_1920": self.cover}
+        )
+
+    def _attachments(self, book):
+        return (
+            self.env["ir.attachment"]
+            .sudo()
+            .search(
+                [
+                    ("res_model", "=", "product.template"),
+                    ("res_field", "in", ["image_1920", "image_128"]),
+                    ("res_id", "=", book.id),
+                ],
+                order="res_field",
+            )
+        )
+
+    def test_identical_cover_is_shared(self):
+        "A cover already stored for another book reuses its files"
+        other = self.env["product.template"].create({"name": "Second Edition"})
+        other.write({"image_1920": self.cover})
+        self.assertEqual(
+            self._attachments(other).mapped("store_fname"),
+            self._attachments(self.book).mapped("store_fname"),
+        )
+        self.assertEqual(other.image_128, self.book.image_128)
+
+    def test_cover_thumbnail_url(self):
+        "The kanban receives a cache-busted thumbnail URL instead of the image"
+        url = self.book.cover_thumbnail_url
+        self.assertTrue(
+            url.startswith(f"/web/image/product.template/{self.book.id}/image_256?")
+        )
+        self.book.image_1920 = make_image("yellow", size=(300, 450))
+        self.assertNotEqual(self.book.cover_thumbnail_url, url)
+        self.book.image_1920 = False
+        self.assertFalse(self.book.cover_thumbnail_url)
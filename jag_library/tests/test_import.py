@@ -0,0 +1,80 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+import io
+
+from odoo.tests.common import TransactionCase
+
+from ..tools import catalogue_parsers
+
+CSV_DATA = b"""name,isbn,authors,publisher,publication_date,language,genres,number_of_pages
+Odoo Development Essentials,978-1784392796,Daniel Reis,Packt Publishing,2015,en,Technical / Odoo,214
+Odoo 17 Development Essentials,,Daniel Reis;Greg Mader,Packt Publishing,2024-02-29,en,Technical / Odoo,
+Bad ISBN,123-456,Daniel Reis,,,,,
+Duplicate,1784392790,,,,,,
+Bad pages,,,,,,,many
+"""
+
+
+class TestBookImport(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.Importer = self.env["library.book.importer"]
+        self.reis = self.env["res.partner"].create(
+            {"name": "Daniel Reis", "is_author": True, "company_type": "person"}
+        )
+
+    def test_parse_csv(self):
+        "CSV rows are parsed lazily into record dicts"
+        records = catalogue_parsers.iter_csv(io.BytesIO(CSV_DATA))
+        first = next(records)
+        self.assertEqual(first["authors"], ["Daniel Reis"])
+        self.assertEqual(first["publication_date"], "2015-01-01")
+        self.assertEqual(first["genres"], ["Technical / Odoo"])
+
+    def test_import_records(self):
+        "Books are created in batches and failing rows are reported"
+        records = catalogue_parsers.iter_csv(io.BytesIO(CSV_DATA))
+        stats = self.Importer.import_records(records, batch_size=2)
+        self.assertEqual(stats["processed"], 5)
+        self.assertEqual(stats["created"], 2)
+        self.assertEqual(stats["failed"], 3)
+        self.assertEqual([row for row, __ in stats["errors"]], [3, 4, 5])
+
+        books = self.env["product.template"].search(
+            [("name", "like", "Development Essentials")]
+        )
+        self.assertEqual(len(books), 2)
+        self.assertTrue(all(books.mapped("is_book")))
+        # Existing partners are reused, missing ones are created once
+        self.assertIn(self.reis, books.author_ids)
+        self.assertEqual(
+            self.env["res.partner"].search_count([("name", "=", "Daniel Reis")]), 1
+        )
+        self.assertEqual(
+            self.env["res.partner"].search_count([("name", "=", "Packt Publishing")]),
+            1,
+        )
+        genre = books.genre_ids
+        self.assertEqual(len(genre), 1)
+        self.assertEqual(genre.complete_name, "Technical / Odoo")
+        self.assertEqual(genre.parent_id.name, "Technical")
+
+    def test_malformed_records(self):
+        "Unreadable records and empty genre levels only fail their own row"
+        data = (
+            b"name,genres\n"
+            b"Readable,Fiction / Classics\n"
+            b"Latin-1 \xf1and\xfa,Fiction\n"
+            b"Empty level,Fiction / / Classics\n"
+        )
+        stats = self.Importer.import_records(
+            catalogue_parsers.iter_csv(io.BytesIO(data))
+        )
+        self.assertEqual(stats["created"], 1)
+        self.assertEqual([row for row, __ in stats["errors"]], [2, 3])
+
+        marc = b"12x45" + b"0" * 30 + b"\x1d"
+        records = list(catalogue_parsers.iter_marc(io.BytesIO(marc)))
+        self.assertEqual(len(records), 1)
+        self.assertIn("error", records[0])
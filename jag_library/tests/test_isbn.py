@@ -0,0 +1,73 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from psycopg2 import IntegrityError
+
+from odoo.tests.common import BaseCase, TransactionCase
+from odoo.tools import mute_logger
+
+from ..tools import isbn as isbn_tools
+
+
+class TestIsbnTools(BaseCase):
+    def test_isbn13(self):
+        "ISBN-13 numbers are validated with or without separators"
+        self.assertTrue(isbn_tools.is_valid("978-1784392796"))
+        self.assertTrue(isbn_tools.is_valid("9788491050759"))
+        self.assertTrue(isbn_tools.is_valid("ISBN-13: 978-0-306-40615-7"))
+        self.assertFalse(isbn_tools.is_valid("978-1234567890"))
+        # Valid EAN-13 outside the Bookland prefixes is not an ISBN
+        self.assertFalse(isbn_tools.is_valid("4006381333931"))
+
+    def test_isbn10(self):
+        "ISBN-10 numbers, including the X check digit, are accepted"
+        self.assertTrue(isbn_tools.is_valid("0-306-40615-2"))
+        self.assertTrue(isbn_tools.is_valid("0-8044-2957-x"))
+        self.assertFalse(isbn_tools.is_valid("0-306-40615-3"))
+        self.assertFalse(isbn_tools.is_valid("123-456"))
+
+    def test_conversion(self):
+        "ISBN-10 and ISBN-13 convert to each other"
+        self.assertEqual(isbn_tools.to_isbn13("0-306-40615-2"), "9780306406157")
+        self.assertEqual(isbn_tools.to_isbn10("978-0-306-40615-7"), "0306406152")
+        self.assertEqual(isbn_tools.to_isbn10("080442957X"), "080442957X")
+        self.assertFalse(isbn_tools.to_isbn10("979-10-90636-07-1"))
+
+    def test_normalize(self):
+        "Every spelling of an ISBN normalizes to the same ISBN-13"
+        self.assertEqual(
+            {
+                isbn_tools.normalize(value)
+                for value in ("978-1784392796", "9781784392796", "1784392790")
+            },
+            {"9781784392796"},
+        )
+        self.assertFalse(isbn_tools.normalize(""))
+        self.assertEqual(isbn_tools.normalize("123-456"), "123456")
+
+    def test_validate_many(self):
+        "A list of ISBNs is validated in a single call"
+        values = ["978-1784392796", "123-456", False, "0-306-40615-2"]
+        self.assertEqual(isbn_tools.validate_many(values), [True, False, False, True])
+        self.assertEqual(isbn_tools.invalid_isbns(values), ["123-456"])
+
+
+class TestIsbnNormalized(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.Book = self.env["product.template"]
+        self.book = self.Book.create(
+            {"name": "Odoo Development Essentials", "isbn": "978-1784392796"}
+        )
+
+    def test_normalized_column(self):
+        "The normalized ISBN is stored and used for lookups"
+        self.assertEqual(self.book.isbn_normalized, "9781784392796")
+        found = self.Book._get_books_by_isbn(["1784392790", "9780306406157"])
+        self.assertEqual(found, {"9781784392796": self.book})
+
+    @mute_logger("odoo.sql_db")
+    def test_unique_normalized(self):
+        "Two spellings of the same ISBN violate the unique constraint"
+        with self.assertRaises(IntegrityError):
+            self.Book.create({"name": "Duplicate Book", "isbn": "9781784392796"})
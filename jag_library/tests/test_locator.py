@@ -0,0 +1,67 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo.tests.common import TransactionCase
+
+from ..tools.lru import LRUCache
+
+
+class TestBookLocator(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.Locator = self.env["library.book.locator"]
+        self.Locator._clear_cache()
+        stock = self.env.ref("stock.stock_location_stock")
+        self.shelf = self.env["stock.location"].create(
+            {"name": "Locator Shelf", "location_id": stock.id}
+        )
+        self.book, self.other = self.env["product.template"].create(
+            [
+                {"name": "Located Book", "is_book": True, "is_storable": True},
+                {"name": "Other Book", "is_book": True, "is_storable": True},
+            ]
+        )
+        self.Quant = self.env["stock.quant"]
+        self.Quant._update_available_quantity(
+            self.book.product_variant_id, self.shelf, 3
+        )
+
+    def test_batch_lookup(self):
+        "A batch of books is answered with one query, and then from the cache"
+        self.env.cr.flush()
+        self.env.invalidate_all()
+        with self.assertQueryCount(2):
+            availability = self.Locator._get_availability([self.book.id, self.other.id])
+        self.assertEqual(availability[self.book.id]["quantity"], 3)
+        self.assertEqual(
+            availability[self.book.id]["locations"],
+            [{"id": self.shelf.id, "name": self.shelf.complete_name, "quantity": 3}],
+        )
+        self.assertEqual(availability[self.other.id], {"quantity": 0, "locations": []})
+        self.env.invalidate_all()
+        with self.assertQueryCount(1):
+            self.Locator._get_availability([self.book.id, self.other.id])
+
+    def test_invalidation(self):
+        "Stock changes drop only the books they touch from the cache"
+        self.Locator._get_availability([self.book.id, self.other.id])
+        self.Quant._update_available_quantity(
+            self.other.product_variant_id, self.shelf, 2
+        )
+        self.Quant._update_available_quantity(
+            self.book.product_variant_id, self.shelf, -1
+        )
+        availability = self.Locator._get_availability([self.book.id, self.other.id])
+        self.assertEqual(availability[self.book.id]["quantity"], 2)
+        self.assertEqual(availability[self.other.id]["quantity"], 2)
+        self.assertEqual(self.book.shelf_quantity, 2)
+
+    def test_lru_cache(self):
+        cache = LRUCache(2, 60)
+        cache.set_many({"a": 1, "b": 2})
+        cache.get_many(["a"])
+        cache.set_many({"c": 3})
+        self.assertEqual(cache.get_many(["a", "b", "c"]), ({"a": 1, "c": 3}, ["b"]))
+        expired = LRUCache(2, -1)
+        expired.set_many({"a": 1})
+        self.assertEqual(expired.get_many(["a"]), ({}, ["a"]))
@@ -0,0 +1,71 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo.tests.common import TransactionCase
+
+
+class TestPartnerStats(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        Partner = self.env["res.partner"]
+        self.author = Partner.create({"name": "Author", "is_author": True})
+        self.coauthor = Partner.create({"name": "Coauthor", "is_author": True})
+        self.publisher = Partner.create(
+            {"name": "Publisher", "is_publisher": True, "company_type": "company"}
+        )
+        self.books = self.env["product.template"].create(
+            [
+                {
+                    "name": "First",
+                    "is_book": True,
+                    "copies": 2,
+                    "rating": "4",
+                    "publication_date": "1990-05-01",
+                    "author_ids": [(6, 0, self.author.ids)],
+                    "publisher_id": self.publisher.id,
+                },
+                {
+                    "name": "Second",
+                    "is_book": True,
+                    "copies": 1,
+                    "rating": "0",
+                    "publication_date": "2001-01-01",
+                    "author_ids": [(6, 0, (self.author | self.coauthor).ids)],
+                },
+            ]
+        )
+
+    def test_create(self):
+        "Statistics are computed when books are created"
+        self.assertEqual(self.author.library_book_count, 2)
+        self.assertEqual(self.author.library_copy_count, 3)
+        # Unrated books are left out of the average
+        self.assertEqual(self.author.library_rating_avg, 4)
+        self.assertEqual(self.author.library_last_publication_year, 2001)
+        self.assertEqual(self.coauthor.library_book_count, 1)
+        self.assertEqual(self.publisher.library_book_count, 1)
+
+    def test_write(self):
+        "Changing the links or the aggregated fields updates both sides"
+        self.books[1].write({"author_ids": [(6, 0, self.coauthor.ids)], "copies": 5})
+        self.assertEqual(self.author.library_book_count, 1)
+        self.assertEqual(self.author.library_copy_count, 2)
+        self.assertEqual(self.coauthor.library_copy_count, 5)
+        self.books[0].publisher_id = False
+        self.assertEqual(self.publisher.library_book_count, 0)
+        self.books[0].active = False
+        self.assertEqual(self.author.library_book_count, 0)
+        self.assertEqual(self.author.library_last_publication_year, 0)
+
+    def test_unlink(self):
+        self.books[1].unlink()
+        self.assertEqual(self.author.library_book_count, 1)
+        self.assertEqual(self.coauthor.library_book_count, 0)
+
+    def test_search(self):
+        "Statistics are stored and can be searched on"
+        partners = self.env["res.partner"].search(
+            [("library_book_count", ">=", 2)], order="library_copy_count desc"
+        )
+        self.assertIn(self.author, partners)
+        self.assertNotIn(self.coauthor, partners)
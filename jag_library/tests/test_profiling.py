@@ -0,0 +1,54 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo.exceptions import AccessError
+from odoo.tests.common import TransactionCase, new_test_user
+
+from ..tools import profiling
+
+
+class TestProfiling(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        profiling.clear()
+        self.Profiler = self.env["library.profiler"]
+        self.books = self.env["product.template"].create(
+            [
+                {"name": f"Book {i}", "is_book": True, "isbn": isbn}
+                for i, isbn in enumerate(
+                    ["9780306406102", "9780306406119", "9780306406126"]
+                )
+            ]
+        )
+
+    def test_disabled(self):
+        "Nothing is recorded unless profiling is enabled"
+        self.books.button_check_isbn()
+        self.assertFalse(profiling.get_records())
+
+    def test_context(self):
+        "The context key records the calls with their batch size"
+        self.books.with_context(library_profiling=True).button_check_isbn()
+        stats = self.Profiler.get_stats()
+        self.assertEqual(len(stats["recent"]), 1)
+        self.assertEqual(stats["recent"][0]["name"], "button_check_isbn")
+        self.assertEqual(stats["summary"][0]["records"], 3)
+        self.Profiler.reset()
+        self.assertFalse(self.Profiler.get_stats()["recent"])
+
+    def test_parameter(self):
+        "The system parameter enables profiling for every call"
+        self.env["ir.config_parameter"].set_param("jag_library.profiling", "True")
+        self.books.button_check_isbn()
+        self.assertEqual(len(profiling.get_records()), 1)
+        self.env["ir.config_parameter"].set_param("jag_library.profiling", "False")
+        self.books.button_check_isbn()
+        self.assertEqual(len(profiling.get_records()), 1)
+
+    def test_access(self):
+        "Only managers read the profiling data"
+        user = new_test_user(
+            self.env, login="library_user", groups="jag_library.library_group_user"
+        )
+        with self.assertRaises(AccessError):
+            self.Profiler.with_user(user).get_stats()
@@ -0,0 +1,79 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo.tests.common import TransactionCase
+
+from ..models.product_template import SEQUENCE_GAP
+from ..tools import sequencing
+
+
+class TestResequence(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.Book = self.env["product.template"]
+        self.Book.search([("is_book", "=", True)]).write({"is_book": False})
+        self.books = self.Book.create(
+            [
+                {"name": f"Book {i}", "is_book": True, "sequence": 1000 + 10 * i}
+                for i in range(5)
+            ]
+        )
+
+    def _order(self):
+        return self.Book.search([("is_book", "=", True)], order="sequence, id")
+
+    def test_stable_positions(self):
+        self.assertEqual(sequencing.stable_positions([1, 5, 2, 3, 4]), {0, 2, 3, 4})
+        self.assertEqual(sequencing.stable_positions([]), set())
+        self.assertEqual(sequencing.spread(10, 20, 1, SEQUENCE_GAP), [15])
+        self.assertIsNone(sequencing.spread(10, 11, 1, SEQUENCE_GAP))
+
+    def test_move_one(self):
+        "Moving a book only changes its own sequence"
+        b0, b1, b2, b3, b4 = self.books
+        sequences = self.books.mapped("sequence")
+        (b0 | b3 | b1 | b2)._library_resequence()
+        self.assertEqual(self._order(), b0 | b3 | b1 | b2 | b4)
+        self.assertEqual(b3.sequence, 1005)
+        self.assertEqual(
+            (b0 | b1 | b2 | b4).mapped("sequence"), sequences[:3] + sequences[4:]
+        )
+
+    def test_web_resequence(self):
+        "The views reorder the books through web_resequence"
+        b0, b1, b2, b3, b4 = self.books
+        result = (b0 | b3 | b1 | b2).web_resequence({"sequence": {}})
+        self.assertEqual(self._order(), b0 | b3 | b1 | b2 | b4)
+        self.assertEqual([book["id"] for book in result], (b0 | b3 | b1 | b2).ids)
+        self.assertEqual(b1.sequence, 1010)
+
+    def test_move_last(self):
+        "A book moved past the end of the range stays before the next books"
+        b0, b1, b2, b3, b4 = self.books
+        (b1 | b2 | b0)._library_resequence()
+        self.assertEqual(self._order(), b1 | b2 | b0 | b3 | b4)
+
+    def test_renumber(self):
+        "Books without room between them are renumbered in one statement"
+        b0, b1, b2, b3, b4 = self.books
+        self.books.write({"sequence": 10})
+        (b0 | b1 | b4 | b2)._library_resequence()
+        self.assertEqual(self._order(), b0 | b1 | b4 | b2 | b3)
+        self.assertEqual(b1.sequence - b0.sequence, SEQUENCE_GAP)
+
+    def test_sort_wizard(self):
+        b0, b1, b2, b3, b4 = self.books
+        (b0 | b1).write({"name": "Zebra"})
+        b3.author_ids = self.env["res.partner"].create({"name": "Aaron Author"})
+        wizard = (
+            self.env["library.book.sort"]
+            .with_context(active_model="product.template", active_ids=(b0 | b3).ids)
+            .create({"sort_by": "title"})
+        )
+        self.assertEqual(wizard.book_ids, b0 | b3)
+        wizard.book_ids = self.books
+        wizard.action_apply()
+        self.assertEqual(self._order(), b2 | b3 | b4 | b0 | b1)
+        wizard.sort_by = "author"
+        wizard.action_apply()
+        self.assertEqual(self._order()[0], b3)
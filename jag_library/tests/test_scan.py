@@ -0,0 +1,85 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo.exceptions import AccessError
+from odoo.tests.common import TransactionCase, new_test_user
+
+
+class TestIsbnScan(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        stock = self.env.ref("stock.stock_location_stock")
+        self.shelf = self.env["stock.location"].create(
+            {"name": "Scan Shelf", "location_id": stock.id}
+        )
+        self.book, self.other = self.env["product.template"].create(
+            [
+                {
+                    "name": "Dune",
+                    "is_book": True,
+                    "is_storable": True,
+                    "isbn": "978-0-441-17271-9",
+                },
+                {
+                    "name": "Foundation",
+                    "is_book": True,
+                    "is_storable": True,
+                    "isbn": "9780553293357",
+                },
+            ]
+        )
+        self.Book = self.env["product.template"]
+
+    def quantity(self, book):
+        return sum(
+            self.env["stock.quant"]
+            .search(
+                [
+                    ("product_id", "=", book.product_variant_id.id),
+                    ("location_id", "=", self.shelf.id),
+                ]
+            )
+            .mapped("quantity")
+        )
+
+    def test_shelving(self):
+        "Scans in any spelling are counted and added to the location"
+        result = self.Book.library_scan_isbns(
+            ["9780441172719", "0441172717", "978-0-553-29335-7", "9780000000001"],
+            self.shelf.id,
+        )
+        self.assertEqual(self.quantity(self.book), 2)
+        self.assertEqual(self.quantity(self.other), 1)
+        self.assertEqual(self.book.location, self.shelf.display_name)
+        self.assertEqual(result["invalid"], ["9780000000001"])
+        self.assertFalse(result["unknown"])
+        self.Book.library_scan_isbns(["9780441172719"], self.shelf.id)
+        self.assertEqual(self.quantity(self.book), 3)
+
+    def test_stock_taking(self):
+        "Stock-taking replaces the quantities and can reset the missing books"
+        self.Book.library_scan_isbns(
+            ["9780441172719"] * 3 + ["9780553293357"], self.shelf.id
+        )
+        result = self.Book.library_scan_isbns(
+            ["9780441172719", "9781234567897"], self.shelf.id, mode="set"
+        )
+        self.assertEqual(self.quantity(self.book), 1)
+        self.assertEqual(self.quantity(self.other), 1)
+        self.assertEqual(result["unknown"], ["9781234567897"])
+        self.Book.library_scan_isbns(
+            ["9780441172719"], self.shelf.id, mode="set", complete=True
+        )
+        self.assertEqual(self.quantity(self.other), 0)
+        self.assertFalse(self.other.location)
+
+    def test_access(self):
+        "Only stock managers apply scans"
+        user = new_test_user(
+            self.env, login="library_scanner", groups="jag_library.library_group_user"
+        )
+        with self.assertRaises(AccessError):
+            self.Book.with_user(user).library_scan_isbns(
+                ["9780441172719"], self.shelf.id
+            )
+        self.assertEqual(self.quantity(self.book), 0)
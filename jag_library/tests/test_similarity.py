@@ -0,0 +1,100 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo.tests.common import TransactionCase
+
+
+class TestBookSimilarity(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.Similarity = self.env["library.book.similarity"]
+        Partner = self.env["res.partner"]
+        self.tolkien = Partner.create({"name": "J. R. R. Tolkien", "is_author": True})
+        self.lewis = Partner.create({"name": "C. S. Lewis", "is_author": True})
+        Genre = self.env["product.book.genre"]
+        fantasy = Genre.create({"name": "Fantasy"})
+        self.epic = Genre.create({"name": "Epic", "parent_id": fantasy.id})
+        self.portal = Genre.create({"name": "Portal", "parent_id": fantasy.id})
+        self.cooking = Genre.create({"name": "Cooking"})
+        Book = self.env["product.template"]
+        self.hobbit, self.rings, self.narnia, self.recipes = Book.create(
+            [
+                {
+                    "name": "The Hobbit",
+                    "is_book": True,
+                    "author_ids": [(6, 0, self.tolkien.ids)],
+                    "genre_ids": [(6, 0, self.epic.ids)],
+                },
+                {
+                    "name": "The Lord of the Rings",
+                    "is_book": True,
+                    "author_ids": [(6, 0, self.tolkien.ids)],
+                    "genre_ids": [(6, 0, self.epic.ids)],
+                },
+                {
+                    "name": "The Chronicles of Narnia",
+                    "is_book": True,
+                    "author_ids": [(6, 0, self.lewis.ids)],
+                    "genre_ids": [(6, 0, (self.epic | self.portal).ids)],
+                },
+                {
+                    "name": "Recipes",
+                    "is_book": True,
+                    "genre_ids": [(6, 0, self.cooking.ids)],
+                },
+            ]
+        )
+        self.books = self.hobbit | self.rings | self.narnia | self.recipes
+
+    def _dirty_ids(self):
+        return set(self.Similarity._get_dirty_book_ids()) & set(self.books.ids)
+
+    def test_ranking(self):
+        "Books sharing more weighted features rank first"
+        self.Similarity._refresh(self.books.ids)
+        self.assertEqual(self.hobbit.similar_book_ids, self.rings | self.narnia)
+        self.assertEqual(self.hobbit.similar_book_ids[0], self.rings)
+        self.assertFalse(self.recipes.similar_book_ids)
+        scores = self.Similarity.search([("book_id", "=", self.hobbit.id)])
+        self.assertEqual(scores[0].score, 1.0)
+        self.assertLess(scores[1].score, 1.0)
+
+    def test_incremental(self):
+        "Changes flag the book and the books listing it, and only them"
+        self.assertEqual(self._dirty_ids(), set(self.books.ids))
+        self.Similarity._refresh(self.books.ids)
+        self.assertFalse(self._dirty_ids())
+
+        self.rings.author_ids = self.lewis
+        self.assertEqual(
+            self._dirty_ids(), {self.rings.id, self.hobbit.id, self.narnia.id}
+        )
+        self.Similarity._refresh(list(self._dirty_ids()))
+        self.assertFalse(self._dirty_ids())
+        self.assertEqual(self.rings.similar_book_ids[0], self.narnia)
+
+    def test_archived(self):
+        "Archived books leave the lists of the others"
+        self.Similarity._refresh(self.books.ids)
+        self.rings.active = False
+        self.Similarity._refresh(list(self._dirty_ids()))
+        self.assertEqual(self.hobbit.similar_book_ids, self.narnia)
+        self.assertFalse(self.rings.similar_book_ids)
+
+    def test_catalogue_data(self):
+        self.Similarity._refresh(self.books.ids)
+        data = self.hobbit._get_library_catalogue_data()[0]
+        self.assertEqual(
+            data["similar_books"][0], {"id": self.rings.id, "name": self.rings.name}
+        )
+
+    def test_trigger_once(self):
+        "Flagging books triggers the scheduler once per transaction"
+        cron = self.env.ref("jag_library.ir_cron_library_book_similarity")
+        Trigger = self.env["ir.cron.trigger"]
+        self.env.cr.precommit.run()
+        count = Trigger.search_count([("cron_id", "=", cron.id)])
+        for book in self.books:
+            book.genre_ids = self.cooking
+        self.env.cr.precommit.run()
+        self.assertEqual(Trigger.search_count([("cron_id", "=", cron.id)]), count + 1)
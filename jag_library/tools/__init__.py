@@ -0,0 +1,5 @@
+from . import isbn
+from . import profiling
+from . import titles
+from . import lru
+from . import sequencing
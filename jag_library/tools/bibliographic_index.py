@@ -0,0 +1,231 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+"""On-disk index of bibliographic records by ISBN.
+
+A bibliographic dump (CSV, MARC 21 or ONIX files read by
+``catalogue_parsers``, or an Open Library dump) is loaded once into a
+SQLite file keyed by ISBN-13. Lookups then read the file memory-mapped,
+a batch of ISBNs per query, without loading the dump in memory.
+
+Records are stored as the dicts yielded by the catalogue parsers. Open
+Library editions only refer to their authors by key: the author names
+are stored in their own table and resolved at lookup time.
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+
+from odoo.tools import split_every
+
+from . import catalogue_parsers
+from . import isbn as isbn_tools
+
+INSERT_CHUNK_SIZE = 10000
+# Below the default limit of host parameters of SQLite (999)
+LOOKUP_CHUNK_SIZE = 500
+MMAP_SIZE = 1 << 30
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS edition (
+        isbn TEXT PRIMARY KEY,
+        record TEXT NOT NULL
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS author (
+        key TEXT PRIMARY KEY,
+        name TEXT NOT NULL
+    ) WITHOUT ROWID;
+"""
+
+
+def _record_rows(records):
+    for record in records:
+        isbns = record.pop("isbns", None) or [record.get("isbn")]
+        data = json.dumps(record)
+        for value in isbns:
+            if value and isbn_tools.is_valid(value):
+                yield isbn_tools.to_isbn13(value), data
+
+
+def build(path, records, authors=()):
+    """Write the records to the index file at ``path``.
+
+    Records whose ISBN is already indexed replace the previous one, so an
+    index can be updated with a newer dump.
+
+    :param records: iterable of catalogue record dicts; an ``isbns`` list
+        indexes a record under several numbers
+    :param authors: iterable of ``(key, name)`` for the ``author_keys`` of
+        the records
+    :return: the number of ISBNs indexed
+    """
+    count = 0
+    connection = sqlite3.connect(path)
+    try:
+        # The file is rebuilt from the dump if the load is interrupted
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.executescript(_SCHEMA)
+        for chunk in split_every(INSERT_CHUNK_SIZE, authors):
+            connection.executemany(
+                "INSERT OR REPLACE INTO author (key, name) VALUES (?, ?)", chunk
+            )
+        for chunk in split_every(INSERT_CHUNK_SIZE, _record_rows(records)):
+            connection.executemany(
+                "INSERT OR REPLACE INTO edition (isbn, record) VALUES (?, ?)", chunk
+            )
+            count += len(chunk)
+        connection.commit()
+    finally:
+        connection.close()
+    return count
+
+
+def build_from_file(path, source_path, file_format):
+    """Index a dump file.
+
+    :param file_format: ``openlibrary``, or a format of
+        ``catalogue_parsers.PARSERS``
+    :return: the number of ISBNs indexed
+    """
+    if file_format == "openlibrary":
+        # Editions and authors are mixed in the dump: read it twice, the
+        # authors being inserted before the editions are read
+        with (
+            open(source_path, "rb") as author_file,
+            open(source_path, "rb") as edition_file,
+        ):
+            return build(
+                path,
+                iter_openlibrary_editions(edition_file),
+                iter_openlibrary_authors(author_file),
+            )
+    with open(source_path, "rb") as fileobj:
+        return build(path, catalogue_parsers.PARSERS[file_format](fileobj))
+
+
+# Open Library dumps ---------------------------------------------------------
+
+
+def _iter_openlibrary(fileobj, record_type):
+    """Yield the JSON documents of a type from an Open Library dump.
+
+    Every line holds the type, key, revision, modification date and JSON
+    document of a record, separated by tabs.
+    """
+    prefix = record_type.encode()
+    for line in fileobj:
+        if line.startswith(prefix):
+            yield json.loads(line.rsplit(b"\t", 1)[-1])
+
+
+def iter_openlibrary_authors(fileobj):
+    for author in _iter_openlibrary(fileobj, "/type/author\t"):
+        if author.get("name"):
+            yield author["key"], author["name"]
+
+
+def iter_openlibrary_editions(fileobj):
+    """Yield catalogue records from the editions of an Open Library dump."""
+    for edition in _iter_openlibrary(fileobj, "/type/edition\t"):
+        isbns = edition.get("isbn_13", []) + edition.get("isbn_10", [])
+        if not isbns:
+            continue
+        title = edition.get("title", "")
+        if edition.get("subtitle"):
+            title = f"{title}: {edition['subtitle']}"
+        description = edition.get("description")
+        if isinstance(description, dict):
+            description = description.get("value")
+        languages = edition.get("languages") or [{}]
+        record = {
+            "isbns": isbns,
+            "name": title,
+            "author_keys": [
+                author["key"]
+                for author in edition.get("authors", [])
+                if "key" in author
+            ],
+            "publisher": (edition.get("publishers") or [None])[0],
+            "publication_date": catalogue_parsers.normalize_date(
+                edition.get("publish_date")
+            ),
+            "number_of_pages": edition.get("number_of_pages"),
+            "language": catalogue_parsers.normalize_language(
+                languages[0].get("key", "").rsplit("/", 1)[-1]
+            ),
+            "synopsis": description,
+        }
+        yield {
+            key: value
+            for key, value in record.items()
+            if value not in (None, "", [], False)
+        }
+
+
+# Lookups ---------------------------------------------------------------------
+
+
+class BibliographicIndex:
+    """Read-only access to an index file, usable as a context manager."""
+
+    def __init__(self, path):
+        uri = Path(path).resolve().as_uri() + "?mode=ro"
+        self.connection = sqlite3.connect(uri, uri=True)
+        self.connection.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def lookup(self, isbns):
+        """Return the records of the given ISBNs, in any spelling.
+
+        :return: dict mapping the ISBNs found, as given, to their records
+        """
+        wanted = {}
+        for value in isbns:
+            if value and isbn_tools.is_valid(value):
+                wanted.setdefault(isbn_tools.to_isbn13(value), []).append(value)
+        result = {}
+        for chunk in split_every(LOOKUP_CHUNK_SIZE, wanted):
+            placeholders = ", ".join("?" * len(chunk))
+            rows = self.connection.execute(
+                f"SELECT isbn, record FROM edition WHERE isbn IN ({placeholders})",
+                chunk,
+            ).fetchall()
+            records = {isbn: json.loads(data) for isbn, data in rows}
+            self._resolve_authors(records.values())
+            for isbn, record in records.items():
+                for value in wanted[isbn]:
+                    result[value] = record
+        return result
+
+    def _resolve_authors(self, records):
+        keys = {
+            key
+            for record in records
+            if not record.get("authors")
+            for key in record.get("author_keys", [])
+        }
+        if not keys:
+            return
+        names = {}
+        for chunk in split_every(LOOKUP_CHUNK_SIZE, keys):
+            placeholders = ", ".join("?" * len(chunk))
+            names.update(
+                self.connection.execute(
+                    f"SELECT key, name FROM author WHERE key IN ({placeholders})",
+                    chunk,
+                )
+            )
+        for record in records:
+            if not record.get("authors"):
+                record["authors"] = [
+                    names[key] for key in record.get("author_keys", []) if key in names
+                ]
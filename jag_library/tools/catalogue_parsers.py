@@ -0,0 +1,367 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+"""Streaming parsers for book catalogue files.
+
+Every parser is a generator that reads its file object incrementally and
+yields one plain ``dict`` per book, so files of any size can be imported
+with bounded memory. The keys of the yielded dicts are:
+
+``name``, ``isbn``, ``authors`` (list), ``publisher``, ``publication_date``
+(``YYYY-MM-DD``), ``number_of_pages``, ``language`` (ISO code), ``genres``
+(list of ``"Parent / Child"`` paths), ``synopsis``, ``edition``,
+``binding`` and ``copies``. Keys whose value is unknown are left out.
+
+A record that cannot be read is yielded as ``{"error": message}`` instead,
+so that the importer reports it and goes on with the rest of the file.
+"""
+
+import csv
+import io
+import re
+from xml.etree import ElementTree
+
+LIST_SEPARATOR = ";"
+
+# MARC 21 and ONIX use ISO 639-2/B language codes, Odoo uses ISO 639-1.
+LANGUAGE_CODES = {
+    "ara": "ar",
+    "cat": "ca",
+    "chi": "zh",
+    "dut": "nl",
+    "eng": "en",
+    "eus": "eu",
+    "baq": "eu",
+    "fre": "fr",
+    "fra": "fr",
+    "ger": "de",
+    "deu": "de",
+    "glg": "gl",
+    "gre": "el",
+    "ita": "it",
+    "jpn": "ja",
+    "lat": "la",
+    "pol": "pl",
+    "por": "pt",
+    "rus": "ru",
+    "spa": "es",
+    "swe": "sv",
+}
+
+_DATE_RE = re.compile(r"^\s*(\d{4})(?:(-?)(0[1-9]|1[0-2])(?:\2([0-2]\d|3[01]))?)?\s*$")
+_YEAR_RE = re.compile(r"\d{4}")
+_PAGES_RE = re.compile(r"(\d+)\s*(?:p\b|pages|páginas|pp)", re.I)
+_TRAILING_PUNCTUATION = " /:;,.="
+# Undecodable bytes, kept by the "surrogateescape" error handler
+_UNDECODABLE_RE = re.compile("[\udc80-\udcff]")
+
+
+def _split_list(value):
+    return [
+        item.strip() for item in (value or "").split(LIST_SEPARATOR) if item.strip()
+    ]
+
+
+def normalize_date(value):
+    """Return an ISO date from ``YYYY``, ``YYYYMM``, ``YYYYMMDD`` or ISO input.
+
+    Free text such as ``"c2005."`` falls back to the first year it holds.
+    """
+    match = _DATE_RE.match(value or "")
+    if match:
+        year, __, month, day = match.groups()
+        return f"{year}-{month or '01'}-{day or '01'}"
+    match = _YEAR_RE.search(value or "")
+    return f"{match.group()}-01-01" if match else False
+
+
+def normalize_language(code):
+    code = (code or "").strip().lower()
+    return LANGUAGE_CODES.get(code, code if len(code) == 2 else False)
+
+
+def _clean(record):
+    return {
+        key: value
+        for key, value in record.items()
+        if value not in (None, "", [], False)
+    }
+
+
+def _error(message):
+    return {"error": message}
+
+
+def iter_csv(fileobj, encoding="utf-8"):
+    """Yield books from a CSV file whose header uses the record keys.
+
+    ``authors`` and ``genres`` hold several values separated by ``;``.
+    Numbers are yielded as text and converted by the importer, so that a
+    malformed row is reported instead of stopping the whole file. So are
+    the rows that are not valid CSV or not valid in ``encoding``.
+    """
+    if isinstance(fileobj, (io.BufferedIOBase, io.RawIOBase)):
+        fileobj = io.TextIOWrapper(
+            fileobj, encoding=encoding, errors="surrogateescape", newline=""
+        )
+    reader = csv.DictReader(fileobj)
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as error:
+            yield _error(f"Malformed CSV row: {error}")
+            continue
+        record = {
+            key.strip(): (value or "").strip() for key, value in row.items() if key
+        }
+        if any(_UNDECODABLE_RE.search(value) for value in record.values()):
+            yield _error(f"The row is not valid {encoding} text")
+            continue
+        record["authors"] = _split_list(record.get("authors"))
+        record["genres"] = _split_list(record.get("genres"))
+        if record.get("publication_date"):
+            record["publication_date"] = normalize_date(record["publication_date"])
+        if record.get("language"):
+            record["language"] = normalize_language(record["language"])
+        yield _clean(record)
+
+
+# MARC 21 (ISO 2709) -------------------------------------------------------
+
+_FIELD_TERMINATOR = b"\x1e"
+_RECORD_TERMINATOR = b"\x1d"
+_LEADER_LENGTH = 24
+_SUBFIELD_DELIMITER = b"\x1f"
+
+
+def _marc_text(value):
+    return value.strip().rstrip(_TRAILING_PUNCTUATION).strip()
+
+
+def _marc_person(name):
+    """Turn ``"Cervantes Saavedra, Miguel de,"`` into a direct order name."""
+    name = _marc_text(name)
+    if name.count(",") == 1:
+        surname, forename = (part.strip() for part in name.split(","))
+        name = f"{forename} {surname}"
+    return name
+
+
+def _iter_marc_fields(data, encoding):
+    """Yield ``(tag, value)`` for every field of one ISO 2709 record.
+
+    Control fields yield a string, data fields a list of
+    ``(code, value)`` subfields.
+    """
+    base_address = int(data[12:17])
+    directory = data[24 : base_address - 1]
+    for pos in range(0, len(directory) - 11, 12):
+        tag = directory[pos : pos + 3].decode("ascii")
+        length = int(directory[pos + 3 : pos + 7])
+        start = base_address + int(directory[pos + 7 : pos + 12])
+        raw = data[start : start + length].rstrip(_FIELD_TERMINATOR)
+        if tag < "010":
+            yield tag, raw.decode(encoding, "replace")
+            continue
+        subfields = [
+            (
+                chunk[:1].decode("ascii", "replace"),
+                chunk[1:].decode(encoding, "replace"),
+            )
+            for chunk in raw.split(_SUBFIELD_DELIMITER)[1:]
+        ]
+        yield tag, subfields
+
+
+def _read_marc_records(fileobj):
+    """Yield the raw records, or ``None`` for a record without a valid length.
+
+    Such a record is skipped up to the next record terminator.
+    """
+    pending = b""
+    while True:
+        length = pending + fileobj.read(5 - len(pending))
+        pending = b""
+        if not length or not length.strip():
+            return
+        if length.isdigit() and int(length) > _LEADER_LENGTH:
+            yield length + fileobj.read(int(length) - 5)
+            continue
+        if _RECORD_TERMINATOR in length:
+            pending = length.split(_RECORD_TERMINATOR, 1)[1]
+        else:
+            while fileobj.read(1) not in (_RECORD_TERMINATOR, b""):
+                pass
+        yield None
+
+
+def _marc_record(data):
+    # Leader position 9 is "a" for UCS/Unicode, blank for MARC-8
+    encoding = "utf-8" if data[9:10] == b"a" else "latin-1"
+    record = {"authors": [], "genres": []}
+    for tag, value in _iter_marc_fields(data, encoding):
+        if tag == "008" and len(value) >= 38:
+            record.setdefault("language", normalize_language(value[35:38]))
+            continue
+        if isinstance(value, str):
+            continue
+        subfields = {}
+        for code, text in value:
+            subfields.setdefault(code, text)
+        if tag == "020" and "a" in subfields and "isbn" not in record:
+            record["isbn"] = subfields["a"].split()[0]
+        elif tag == "041" and "a" in subfields:
+            record["language"] = normalize_language(subfields["a"][:3])
+        elif tag in ("100", "700") and "a" in subfields:
+            record["authors"].append(_marc_person(subfields["a"]))
+        elif tag == "245":
+            title = _marc_text(subfields.get("a", ""))
+            if subfields.get("b"):
+                title = f"{title}: {_marc_text(subfields['b'])}"
+            record["name"] = title
+        elif tag == "250" and "a" in subfields:
+            record["edition"] = _marc_text(subfields["a"])
+        elif tag in ("260", "264"):
+            if "b" in subfields and "publisher" not in record:
+                record["publisher"] = _marc_text(subfields["b"])
+            if "c" in subfields and "publication_date" not in record:
+                record["publication_date"] = normalize_date(subfields["c"])
+        elif tag == "300" and "a" in subfields:
+            match = _PAGES_RE.search(subfields["a"])
+            if match:
+                record["number_of_pages"] = int(match.group(1))
+        elif tag == "520" and "a" in subfields:
+            record["synopsis"] = subfields["a"].strip()
+        elif tag == "655" and "a" in subfields:
+            record["genres"].append(_marc_text(subfields["a"]))
+    return _clean(record)
+
+
+def iter_marc(fileobj):
+    """Yield books from a binary MARC 21 (ISO 2709) file."""
+    for data in _read_marc_records(fileobj):
+        if data is None:
+            yield _error("Malformed MARC record leader")
+            continue
+        try:
+            record = _marc_record(data)
+        except (ValueError, IndexError) as error:
+            # Bad numbers in the directory, a tag that is not ASCII or an
+            # empty subfield
+            record = _error(f"Malformed MARC record: {error}")
+        yield record
+
+
+# ONIX for Books (2.1 and 3.0 reference tags) ------------------------------
+
+_ONIX_ISBN_TYPES = ("15", "03", "02")
+_ONIX_AUTHOR_ROLES = ("A01", "A02")
+_ONIX_PAGES_TYPES = ("00", "05", "07", "08")
+_ONIX_MAIN_DESCRIPTION = ("01", "02", "03")
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(element, name):
+    for child in element.iter():
+        if _local(child.tag) == name and child.text:
+            return child.text.strip()
+    return ""
+
+
+def _iter_with_parent(root):
+    for parent in root.iter():
+        for element in parent:
+            yield parent, element
+
+
+def _onix_product(product):
+    record = {"authors": [], "genres": []}
+    for parent, element in _iter_with_parent(product):
+        tag = _local(element.tag)
+        if tag == "ProductIdentifier":
+            if _child_text(element, "ProductIDType") in _ONIX_ISBN_TYPES:
+                record.setdefault("isbn", _child_text(element, "IDValue"))
+        elif (
+            tag in ("TitleDetail", "Title")
+            and _local(parent.tag) in ("DescriptiveDetail", "Product")
+            and "name" not in record
+        ):
+            title = _child_text(element, "TitleText")
+            subtitle = _child_text(element, "Subtitle")
+            record["name"] = f"{title}: {subtitle}" if subtitle else title
+        elif tag == "Contributor":
+            if _child_text(element, "ContributorRole") in _ONIX_AUTHOR_ROLES:
+                name = _child_text(element, "PersonName") or _marc_person(
+                    _child_text(element, "PersonNameInverted")
+                )
+                if name:
+                    record["authors"].append(name)
+        elif tag == "PublisherName":
+            record.setdefault("publisher", (element.text or "").strip())
+        elif tag in ("PublishingDate", "PublicationDate"):
+            value = (
+                _child_text(element, "Date")
+                if tag == "PublishingDate"
+                else element.text
+            )
+            record.setdefault("publication_date", normalize_date(value))
+        elif tag == "Extent":
+            if _child_text(element, "ExtentType") in _ONIX_PAGES_TYPES:
+                pages = _child_text(element, "ExtentValue")
+                if pages.isdigit():
+                    record.setdefault("number_of_pages", int(pages))
+        elif tag == "NumberOfPages" and (element.text or "").strip().isdigit():
+            record.setdefault("number_of_pages", int(element.text))
+        elif tag == "Language":
+            record.setdefault(
+                "language", normalize_language(_child_text(element, "LanguageCode"))
+            )
+        elif tag == "EditionStatement":
+            record.setdefault("edition", (element.text or "").strip())
+        elif tag in ("TextContent", "OtherText"):
+            text_type = _child_text(element, "TextType") or _child_text(
+                element, "TextTypeCode"
+            )
+            if text_type in _ONIX_MAIN_DESCRIPTION:
+                record.setdefault("synopsis", _child_text(element, "Text"))
+        elif tag == "SubjectHeadingText" and element.text:
+            record["genres"].append(element.text.strip())
+    return _clean(record)
+
+
+def iter_onix(fileobj):
+    """Yield books from an ONIX for Books message.
+
+    ``Product`` elements are parsed as soon as they are complete and then
+    cleared, so the XML tree never holds more than one product. A message
+    that is not well-formed ends with an error record.
+    """
+    context = ElementTree.iterparse(fileobj, events=("start", "end"))
+    root = None
+    while True:
+        try:
+            event, element = next(context)
+        except StopIteration:
+            return
+        except ElementTree.ParseError as error:
+            # The parser cannot resume after a syntax error: the products
+            # read so far are kept and the rest of the message is reported
+            yield _error(f"Malformed ONIX message: {error}")
+            return
+        if root is None:
+            root = element
+        if event == "end" and _local(element.tag) == "Product":
+            yield _onix_product(element)
+            # Drop the products already parsed from the message root
+            root.clear()
+
+
+PARSERS = {
+    "csv": iter_csv,
+    "marc": iter_marc,
+    "onix": iter_onix,
+}
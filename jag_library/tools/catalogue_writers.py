@@ -0,0 +1,83 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+"""Streaming writers for book catalogue files.
+
+Every writer consumes an iterable of plain ``dict`` rows and writes them
+one by one to a file, so catalogues of any size are exported with bounded
+memory. Lists (authors, genres) are joined with ``;`` in CSV and XLSX,
+the way :mod:`.catalogue_parsers` reads them back.
+"""
+
+import csv
+import json
+
+import xlsxwriter
+
+from .catalogue_parsers import LIST_SEPARATOR
+
+XLSX_MAX_ROWS = 1048576
+
+
+def _flatten(value):
+    if isinstance(value, list):
+        return f"{LIST_SEPARATOR} ".join(str(item) for item in value)
+    return "" if value is None else value
+
+
+def write_csv(rows, path, columns):
+    """Write ``rows`` to the CSV file at ``path``, returning the row count."""
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as fileobj:
+        writer = csv.writer(fileobj)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([_flatten(row.get(column)) for column in columns])
+            count += 1
+    return count
+
+
+def write_jsonl(rows, path, columns):
+    """Write ``rows`` as JSON Lines, keeping lists as JSON arrays."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as fileobj:
+        for row in rows:
+            fileobj.write(json.dumps({column: row.get(column) for column in columns}))
+            fileobj.write("\n")
+            count += 1
+    return count
+
+
+def write_xlsx(rows, path, columns):
+    """Write ``rows`` to an XLSX file, one row at a time.
+
+    The workbook is written in constant memory mode: each row is flushed to
+    disk as soon as the next one starts.
+
+    :raise ValueError: when the rows do not fit in a worksheet
+    """
+    count = 0
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+    try:
+        sheet = workbook.add_worksheet("Books")
+        sheet.write_row(0, 0, columns, workbook.add_format({"bold": True}))
+        for count, row in enumerate(rows, start=1):
+            if count >= XLSX_MAX_ROWS:
+                raise ValueError(
+                    f"XLSX files hold at most {XLSX_MAX_ROWS - 1} books, "
+                    "use CSV or JSON Lines instead"
+                )
+            sheet.write_row(count, 0, [_flatten(row.get(column)) for column in columns])
+    finally:
+        workbook.close()
+    return count
+
+
+WRITERS = {
+    "csv": (write_csv, "text/csv", "csv"),
+    "xlsx": (
+        write_xlsx,
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "xlsx",
+    ),
+    "jsonl": (write_jsonl, "application/x-ndjson", "jsonl"),
+}
@@ -0,0 +1,118 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+"""Pure functions to validate, normalize and convert ISBNs.
+
+Nothing in this module touches the ORM, so whole lists of ISBNs can be
+checked in a single pass (e.g. while importing a catalogue) before any
+record is created.
+"""
+
+import re
+
+# Optional "ISBN", "ISBN-10:", "ISBN-13:", "ISN" or "EAN" label in front of
+# the number, as it is printed on books and in bibliographic records.
+_LABEL_RE = re.compile(r"^\s*(?:ISBN|ISN|EAN)(?:-?1[03](?=[\s:]))?\s*:?\s*", re.I)
+_SEPARATORS_RE = re.compile(r"[\s\-‐‑‒–—.]")
+_ISBN10_RE = re.compile(r"^\d{9}[\dX]$")
+_ISBN13_RE = re.compile(r"^\d{13}$")
+# ISBN-13 numbers live in the "Bookland" EAN prefixes.
+BOOKLAND_PREFIXES = ("978", "979")
+
+
+def compact(value):
+    """Strip labels and separators from an ISBN, upper-casing the X digit.
+
+    ``compact("ISBN 978-1784392796")`` returns ``"9781784392796"``.
+    """
+    if not value:
+        return ""
+    value = _LABEL_RE.sub("", str(value))
+    return _SEPARATORS_RE.sub("", value).upper()
+
+
+def isbn10_check_digit(digits):
+    """Return the check digit ("0"-"9" or "X") for the first 9 digits."""
+    total = sum((10 - i) * int(d) for i, d in enumerate(digits[:9]))
+    check = (11 - total % 11) % 11
+    return "X" if check == 10 else str(check)
+
+
+def isbn13_check_digit(digits):
+    """Return the check digit for the first 12 digits of an EAN-13."""
+    total = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(digits[:12]))
+    return str((10 - total % 10) % 10)
+
+
+def is_valid_isbn10(value):
+    number = compact(value)
+    return bool(_ISBN10_RE.match(number)) and (number[-1] == isbn10_check_digit(number))
+
+
+def is_valid_isbn13(value):
+    number = compact(value)
+    return (
+        bool(_ISBN13_RE.match(number))
+        and number.startswith(BOOKLAND_PREFIXES)
+        and number[-1] == isbn13_check_digit(number)
+    )
+
+
+def is_valid(value):
+    """Return whether ``value`` is a valid ISBN-10 or ISBN-13."""
+    number = compact(value)
+    if len(number) == 10:
+        return is_valid_isbn10(number)
+    if len(number) == 13:
+        return is_valid_isbn13(number)
+    return False
+
+
+def to_isbn13(value):
+    """Convert an ISBN-10 to its ISBN-13 form; ISBN-13 are returned compact."""
+    number = compact(value)
+    if len(number) == 10:
+        number = "978" + number[:9]
+        return number + isbn13_check_digit(number)
+    return number
+
+
+def to_isbn10(value):
+    """Convert a valid ISBN-13 to ISBN-10.
+
+    Only ``978`` numbers have an ISBN-10 equivalent; ``False`` is returned
+    for the others.
+    """
+    number = compact(value)
+    if len(number) == 13:
+        if not number.startswith("978"):
+            return False
+        number = number[3:12]
+        return number + isbn10_check_digit(number)
+    return number
+
+
+def normalize(value):
+    """Return the canonical form of an ISBN: its compact ISBN-13.
+
+    Invalid numbers are only compacted, so two spellings of the same wrong
+    number still collide.
+    """
+    number = compact(value)
+    if not number:
+        return False
+    if is_valid(number):
+        return to_isbn13(number)
+    return number
+
+
+def validate_many(values):
+    """Check a sequence of ISBNs in a single pass.
+
+    :return: list of booleans, in the same order as ``values``
+    """
+    return [is_valid(value) for value in values]
+
+
+def invalid_isbns(values):
+    """Return the non-empty values of ``values`` that are not valid ISBNs."""
+    return [value for value in values if value and not is_valid(value)]
@@ -0,0 +1,61 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+"""Bounded in-memory cache with least-recently-used eviction and expiry.
+
+The cache lives in the memory of the worker process. Entries expire after
+``ttl`` seconds, so that changes made by other workers are seen at the
+latest after that delay, and the least recently used entries are evicted
+beyond ``maxsize``.
+"""
+
+import collections
+import threading
+import time
+
+
+class LRUCache:
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get_many(self, keys):
+        """Return the fresh cached values of ``keys``.
+
+        :return: tuple ``(found, missing)`` with a dict of the cached
+            values and the list of keys to compute
+        """
+        found = {}
+        missing = []
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None or entry[0] < now:
+                    missing.append(key)
+                    continue
+                self._data.move_to_end(key)
+                found[key] = entry[1]
+        return found, missing
+
+    def set_many(self, values):
+        expiry = time.monotonic() + self.ttl
+        with self._lock:
+            for key, value in values.items():
+                self._data[key] = (expiry, value)
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def discard_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
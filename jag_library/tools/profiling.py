@@ -0,0 +1,121 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+"""Opt-in timing and query counting of the library hot paths.
+
+Methods decorated with :func:`profiled` record, for every call, their
+duration, the size of the recordset they ran on and the number of SQL
+queries they issued. Records are kept in a bounded in-memory ring buffer
+of the current worker process, and a summary is logged periodically.
+
+Profiling is enabled by the ``jag_library.profiling`` system parameter or
+the ``library_profiling`` context key. When it is disabled, the overhead
+is a context lookup and a cached parameter lookup per call.
+"""
+
+import collections
+import functools
+import logging
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+RING_SIZE = 10000
+LOG_INTERVAL = 300
+
+CallRecord = collections.namedtuple(
+    "CallRecord", ["name", "model", "batch_size", "duration", "queries", "timestamp"]
+)
+
+_records = collections.deque(maxlen=RING_SIZE)
+_lock = threading.Lock()
+_last_log = [time.monotonic()]
+
+
+def profiled(method):
+    """Record the calls of ``method`` when library profiling is enabled."""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not (
+            self.env.context.get("library_profiling")
+            or self.env["library.profiler"]._is_enabled()
+        ):
+            return method(self, *args, **kwargs)
+        cr = self.env.cr
+        queries = cr.sql_log_count
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            _records.append(
+                CallRecord(
+                    name,
+                    self._name,
+                    len(self),
+                    time.perf_counter() - start,
+                    cr.sql_log_count - queries,
+                    time.time(),
+                )
+            )
+            _log_summary_if_due()
+
+    return wrapper
+
+
+def get_records():
+    return list(_records)
+
+
+def clear():
+    _records.clear()
+
+
+def summarize(records):
+    """Aggregate call records per model and method.
+
+    :return: list of dicts sorted by total duration, the slowest first
+    """
+    stats = {}
+    for record in records:
+        key = (record.model, record.name)
+        entry = stats.setdefault(
+            key,
+            {
+                "model": record.model,
+                "method": record.name,
+                "calls": 0,
+                "records": 0,
+                "queries": 0,
+                "total_duration": 0.0,
+                "max_duration": 0.0,
+            },
+        )
+        entry["calls"] += 1
+        entry["records"] += record.batch_size
+        entry["queries"] += record.queries
+        entry["total_duration"] += record.duration
+        entry["max_duration"] = max(entry["max_duration"], record.duration)
+    for entry in stats.values():
+        entry["avg_duration"] = entry["total_duration"] / entry["calls"]
+        entry["avg_batch_size"] = entry["records"] / entry["calls"]
+    return sorted(stats.values(), key=lambda entry: -entry["total_duration"])
+
+
+def _log_summary_if_due():
+    now = time.monotonic()
+    if now - _last_log[0] < LOG_INTERVAL or not _lock.acquire(blocking=False):
+        return
+    try:
+        _last_log[0] = now
+        # A copy: other threads keep appending to the deque meanwhile
+        for entry in summarize(get_records()):
+            _logger.info(
+                "%(model)s.%(method)s: %(calls)d calls, %(avg_batch_size).1f records "
+                "per call, %(queries)d queries, %(total_duration).3fs total, "
+                "%(max_duration).3fs max",
+                entry,
+            )
+    finally:
+        _lock.release()
@@ -0,0 +1,54 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+"""Pure functions to reorder records with as few sequence changes as possible.
+
+Records are kept in place when they already follow each other in the new
+order (the longest increasing subsequence of their sort keys), and the
+others are given sequences in the gaps left between their neighbours.
+"""
+
+import bisect
+
+
+def stable_positions(keys):
+    """Return the positions of the longest increasing subsequence of ``keys``.
+
+    ``stable_positions([(10, 1), (30, 3), (20, 2)])`` returns ``{0, 2}``:
+    only the record moved to the second position needs a new sequence.
+    """
+    tails = []  # key of the last item of the best subsequence of each length
+    tail_positions = []
+    previous = [None] * len(keys)
+    for position, key in enumerate(keys):
+        length = bisect.bisect_left(tails, key)
+        if length == len(tails):
+            tails.append(key)
+            tail_positions.append(position)
+        else:
+            tails[length] = key
+            tail_positions[length] = position
+        previous[position] = tail_positions[length - 1] if length else None
+    positions = set()
+    position = tail_positions[-1] if tail_positions else None
+    while position is not None:
+        positions.add(position)
+        position = previous[position]
+    return positions
+
+
+def spread(low, high, count, gap):
+    """Return ``count`` increasing integers strictly between ``low`` and ``high``.
+
+    An unknown bound (``None``) is replaced by ``gap`` steps from the other
+    one. ``None`` is returned when the gap is too narrow.
+    """
+    if low is None and high is None:
+        low = 0
+    if low is None:
+        low = high - (count + 1) * gap
+    elif high is None:
+        high = low + (count + 1) * gap
+    step = min((high - low) // (count + 1), gap)
+    if step < 1:
+        return None
+    return [low + step * (index + 1) for index in range(count)]
@@ -0,0 +1,56 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+"""Pure functions to normalize and compare book titles.
+
+Titles are reduced to a key of significant tokens (lower case, without
+accents, punctuation or articles), so that spelling variants of the same
+title share the key and can be compared cheaply.
+"""
+
+import re
+import unicodedata
+from difflib import SequenceMatcher
+
+_TOKEN_RE = re.compile(r"\w+")
+# Articles, prepositions and conjunctions of the usual catalogue languages
+STOPWORDS = frozenset("""
+    a an and the of in on
+    el la lo los las un una unos unas de del y e en al
+    le les l d des du et un une au aux
+    els i amb
+    der die das den dem des ein eine und
+    il gli di e
+    """.split())
+
+
+def title_tokens(title):
+    """Return the significant tokens of ``title``.
+
+    ``title_tokens("Don Quijote de la Mancha")`` returns
+    ``["don", "quijote", "mancha"]``. Titles made only of stopwords keep
+    them all.
+    """
+    if not title:
+        return []
+    title = unicodedata.normalize("NFKD", title)
+    title = "".join(char for char in title if not unicodedata.combining(char))
+    tokens = _TOKEN_RE.findall(title.lower())
+    return [token for token in tokens if token not in STOPWORDS] or tokens
+
+
+def title_key(title):
+    """Return the normalized key of ``title``, ``""`` for an empty title."""
+    return " ".join(title_tokens(title))
+
+
+def key_similarity(key1, key2):
+    """Return the similarity of two title keys, between 0 and 1.
+
+    Average of the Jaccard index of the token sets, which ignores word
+    order, and of the character similarity, which tolerates typos.
+    """
+    if not key1 or not key2:
+        return 0.0
+    tokens1, tokens2 = set(key1.split()), set(key2.split())
+    jaccard = len(tokens1 & tokens2) / len(tokens1 | tokens2)
+    return (jaccard + SequenceMatcher(None, key1, key2).ratio()) / 2
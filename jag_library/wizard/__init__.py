@@ -0,0 +1,5 @@
+from . import library_book_import
+from . import library_isbn_scan
+from . import library_book_dedup
+from . import library_circulation_desk
+from . import library_book_sort
@@ -0,0 +1,78 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo import _, fields, models
+from odoo.exceptions import UserError
+
+from ..models.library_book_deduplicator import DEFAULT_THRESHOLD
+
+MAX_SUGGESTIONS = 500
+
+
+class LibraryBookDedup(models.TransientModel):
+    _name = "library.book.dedup"
+    _description = "Find Duplicate Books"
+
+    threshold = fields.Float(
+        "Minimum Similarity",
+        digits=(3, 2),
+        default=DEFAULT_THRESHOLD,
+        help="Between 0 and 1: the higher, the more similar the books must be.",
+    )
+    state = fields.Selection([("draft", "Draft"), ("done", "Done")], default="draft")
+    line_ids = fields.One2many("library.book.dedup.line", "wizard_id")
+    merged_count = fields.Integer("Merged Books", readonly=True)
+
+    def _reopen(self):
+        return {
+            "type": "ir.actions.act_window",
+            "res_model": self._name,
+            "res_id": self.id,
+            "view_mode": "form",
+            "target": "new",
+        }
+
+    def action_find(self):
+        self.ensure_one()
+        if not 0 < self.threshold <= 1:
+            raise UserError(_("The minimum similarity must be between 0 and 1."))
+        suggestions = self.env["library.book.deduplicator"]._find_duplicates(
+            threshold=self.threshold, limit=MAX_SUGGESTIONS
+        )
+        self.line_ids.unlink()
+        self.write(
+            {
+                "state": "done",
+                "line_ids": [
+                    fields.Command.create(suggestion) for suggestion in suggestions
+                ],
+            }
+        )
+        return self._reopen()
+
+    def action_merge(self):
+        self.ensure_one()
+        lines = self.line_ids.filtered("to_merge")
+        if not lines:
+            raise UserError(_("Select the duplicates to merge."))
+        self.merged_count = self.env["library.book.deduplicator"]._merge(
+            [(line.book_id.id, line.duplicate_id.id) for line in lines]
+        )
+        lines.unlink()
+        return self._reopen()
+
+
+class LibraryBookDedupLine(models.TransientModel):
+    _name = "library.book.dedup.line"
+    _description = "Duplicate Book Suggestion"
+    _order = "score desc, id"
+
+    wizard_id = fields.Many2one("library.book.dedup", required=True, ondelete="cascade")
+    book_id = fields.Many2one(
+        "product.template", "Book to Keep", required=True, ondelete="cascade"
+    )
+    duplicate_id = fields.Many2one(
+        "product.template", "Duplicate", required=True, ondelete="cascade"
+    )
+    score = fields.Float("Similarity", digits=(3, 2))
+    to_merge = fields.Boolean("Merge", default=True)
@@ -0,0 +1,70 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+import base64
+import io
+
+from odoo import _, fields, models
+from odoo.exceptions import UserError
+
+from ..models.library_book_importer import DEFAULT_BATCH_SIZE
+from ..tools import catalogue_parsers
+
+
+class LibraryBookImport(models.TransientModel):
+    _name = "library.book.import"
+    _description = "Import Books"
+
+    data_file = fields.Binary("File", required=True)
+    filename = fields.Char()
+    file_format = fields.Selection(
+        [
+            ("csv", "CSV"),
+            ("marc", "MARC 21 (ISO 2709)"),
+            ("onix", "ONIX for Books"),
+        ],
+        required=True,
+        default="csv",
+    )
+    batch_size = fields.Integer(
+        default=DEFAULT_BATCH_SIZE,
+        help="Number of books created at once.",
+    )
+    state = fields.Selection([("draft", "Draft"), ("done", "Done")], default="draft")
+    processed_count = fields.Integer("Processed Rows", readonly=True)
+    created_count = fields.Integer("Created Books", readonly=True)
+    failed_count = fields.Integer("Failed Rows", readonly=True)
+    duration = fields.Float("Duration (s)", readonly=True)
+    rate = fields.Float("Rows per Second", readonly=True)
+    error_log = fields.Text(readonly=True)
+
+    def action_import(self):
+        self.ensure_one()
+        if self.batch_size < 1:
+            raise UserError(_("The batch size must be a positive number."))
+        fileobj = io.BytesIO(base64.b64decode(self.data_file))
+        records = catalogue_parsers.PARSERS[self.file_format](fileobj)
+        stats = self.env["library.book.importer"].import_records(
+            records, batch_size=self.batch_size
+        )
+        self.write(
+            {
+                "state": "done",
+                "processed_count": stats["processed"],
+                "created_count": stats["created"],
+                "failed_count": stats["failed"],
+                "duration": stats["duration"],
+                "rate": stats["rate"],
+                "error_log": "\n".join(
+                    _("Row %(row)s: %(error)s", row=row, error=error)
+                    for row, error in stats["errors"]
+                ),
+            }
+        )
+        return {
+            "type": "ir.actions.act_window",
+            "res_model": self._name,
+            "res_id": self.id,
+            "view_mode": "form",
+            "target": "new",
+        }
@@ -0,0 +1,61 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo import api, fields, models
+
+# Books without author go last
+LAST = "\uffff"
+
+
+class LibraryBookSort(models.TransientModel):
+    _name = "library.book.sort"
+    _description = "Sort Books"
+
+    book_ids = fields.Many2many(
+        "product.template", string="Books", domain=[("is_book", "=", True)]
+    )
+    sort_by = fields.Selection(
+        [
+            ("author", "Author"),
+            ("title", "Title"),
+            ("publication_year", "Publication Year"),
+        ],
+        required=True,
+        default="author",
+    )
+
+    @api.model
+    def default_get(self, fields_list):
+        res = super().default_get(fields_list)
+        if (
+            "book_ids" in fields_list
+            and self.env.context.get("active_model") == "product.template"
+        ):
+            books = self.env["product.template"].browse(
+                self.env.context.get("active_ids", [])
+            )
+            res["book_ids"] = [(6, 0, books.filtered("is_book").ids)]
+        return res
+
+    def _sort_key(self, book):
+        title = (book.name or "").lower()
+        if self.sort_by == "author":
+            return (
+                min(book.author_ids.mapped("name"), default=LAST).lower(),
+                title,
+                book.id,
+            )
+        if self.sort_by == "publication_year":
+            return (book.publication_year or 9999, title, book.id)
+        return (title, book.id)
+
+    def action_apply(self):
+        """Renumber the selected books in the chosen order in one statement."""
+        self.ensure_one()
+        books = self.book_ids
+        books.fetch(["name", "author_ids", "publication_year"])
+        books.author_ids.fetch(["name"])
+        books.browse(
+            [book.id for book in sorted(books, key=self._sort_key)]
+        )._library_renumber()
+        return {"type": "ir.actions.act_window_close"}
@@ -0,0 +1,63 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo import _, fields, models
+from odoo.exceptions import UserError
+
+from ..models.library_circulation import LOAN_DAYS
+
+
+class LibraryCirculationDesk(models.TransientModel):
+    _name = "library.circulation.desk"
+    _description = "Circulation Desk"
+
+    operation = fields.Selection(
+        [("checkout", "Checkout"), ("checkin", "Return")],
+        required=True,
+        default="checkout",
+    )
+    partner_id = fields.Many2one("res.partner", "Borrower")
+    days = fields.Integer("Loan Days", default=LOAN_DAYS)
+    barcodes = fields.Text(help="One copy barcode per line.")
+    state = fields.Selection([("draft", "Draft"), ("done", "Done")], default="draft")
+    processed_count = fields.Integer("Processed Copies", readonly=True)
+    error_log = fields.Text(readonly=True)
+
+    def action_apply(self):
+        self.ensure_one()
+        barcodes = (self.barcodes or "").splitlines()
+        Loan = self.env["library.loan"]
+        if self.operation == "checkout":
+            if not self.partner_id:
+                raise UserError(_("Select the borrower."))
+            result = Loan.checkout(barcodes, self.partner_id.id, days=self.days)
+            processed = len(result["loan_ids"])
+            errors = [
+                _("Copy %s is not available", barcode)
+                for barcode in result["unavailable"]
+            ]
+        else:
+            result = Loan.checkin(barcodes)
+            processed = len(result["returned"])
+            errors = [
+                _("Copy %s was not on loan", barcode)
+                for barcode in result["not_on_loan"]
+            ] + [
+                _("Copy %s is held for a reservation", barcode)
+                for barcode in result["reserved"]
+            ]
+        errors += [_("Unknown barcode %s", barcode) for barcode in result["unknown"]]
+        self.write(
+            {
+                "state": "done",
+                "processed_count": processed,
+                "error_log": "\n".join(errors),
+            }
+        )
+        return {
+            "type": "ir.actions.act_window",
+            "res_model": self._name,
+            "res_id": self.id,
+            "view_mode": "form",
+            "target": "new",
+        }
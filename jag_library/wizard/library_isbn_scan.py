@@ -0,0 +1,66 @@
+# Copyright 2025 Javier Antó Garcia <hola@javieranto.com>
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl-3).
+
+from odoo import _, fields, models
+
+
+class LibraryIsbnScan(models.TransientModel):
+    _name = "library.isbn.scan"
+    _description = "Scan Books"
+
+    location_id = fields.Many2one(
+        "stock.location",
+        required=True,
+        domain=[("usage", "=", "internal")],
+    )
+    mode = fields.Selection(
+        [
+            ("add", "Shelving"),
+            ("set", "Stock-taking"),
+        ],
+        required=True,
+        default="add",
+        help="Shelving adds the scanned copies to the location; stock-taking "
+        "replaces the quantities of the location with the scanned ones.",
+    )
+    complete = fields.Boolean(
+        "Whole Location",
+        help="Set to zero the books of the location that were not scanned.",
+    )
+    scans = fields.Text(
+        help="One ISBN per line, a book scanned several times counting as "
+        "several copies."
+    )
+    state = fields.Selection([("draft", "Draft"), ("done", "Done")], default="draft")
+    book_count = fields.Integer("Books", readonly=True)
+    copy_count = fields.Integer("Copies", readonly=True)
+    error_log = fields.Text(readonly=True)
+
+    def action_apply(self):
+        self.ensure_one()
+        result = self.env["product.template"].library_scan_isbns(
+            (self.scans or "").splitlines(),
+            self.location_id.id,
+            mode=self.mode,
+            complete=self.complete,
+        )
+        errors = [_("Invalid ISBN: %s", isbn) for isbn in result["invalid"]]
+        errors += [_("Unknown ISBN: %s", isbn) for isbn in result["unknown"]]
+        errors += [
+            _("Book without tracked stock: %s", isbn) for isbn in result["not_storable"]
+        ]
+        self.write(
+            {
+                "state": "done",
+                "book_count": len(result["books"]),
+                "copy_count": sum(book["quantity"] for book in result["books"]),
+                "error_log": "\n".join(errors),
+            }
+        )
+        return {
+            "type": "ir.actions.act_window",
+            "res_model": self._name,
+            "res_id": self.id,
+            "view_mode": "form",
+            "target": "new",
+        }